@@ -0,0 +1,92 @@
+"""
+게임 엔진 마이크로벤치마크 (요청 사이클 없이 engine.Game 직접 구동)
+
+    python -m benchmarks.bench_engine
+    python -m benchmarks.bench_engine --repeat 20
+"""
+import argparse
+import time
+
+from minesweeper.codec import MINE
+from minesweeper.engine import Game
+
+CASES = [
+    ('easy', 8, 8, 10),
+    ('hard', 16, 16, 40),
+    ('200x200', 200, 200, 6000),
+    ('1000x1000', 1000, 1000, 150000),
+]
+
+
+def timed(repeat, setup, op):
+    """setup()이 만든 새 인자마다 op(*args)를 한 번씩 실행해 최솟값(ms) 반환"""
+    best = float('inf')
+    for _ in range(repeat):
+        args = setup()
+        start = time.perf_counter()
+        op(*args)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def started_game(rows, cols, mines, seed):
+    """가운데를 첫 클릭으로 연 게임"""
+    game = Game(rows, cols, mines, seed=seed)
+    game.reveal(rows // 2, cols // 2)
+    return game
+
+
+def numbered_cell(game):
+    """주변 지뢰에 깃발을 꽂은 뒤 chord할 열린 숫자 칸 (chord 측정용)"""
+    for index in range(game.size):
+        value = game.board[index]
+        if game.revealed[index] and 0 < value < MINE:
+            return divmod(index, game.cols)
+    raise RuntimeError('열린 숫자 칸이 없습니다.')
+
+
+def flag_around(game, row, col):
+    """(row, col) 주변 지뢰에 모두 깃발을 꽂는다"""
+    for r in range(max(row - 1, 0), min(row + 2, game.rows)):
+        for c in range(max(col - 1, 0), min(col + 2, game.cols)):
+            if game.board[r * game.cols + c] == MINE and not game.flagged[r * game.cols + c]:
+                game.toggle_flag(r, c)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f'{"case":<12}{"first":>10}{"flag":>10}{"chord":>10}{"hint":>10}'
+          f'{"serialize":>11}{"deserialize":>13}   (ms)')
+    for name, rows, cols, mines in CASES:
+        seeds = iter(range(10 ** 6))
+
+        def fresh():
+            return (Game(rows, cols, mines),)
+
+        def started():
+            return (started_game(rows, cols, mines, next(seeds)),)
+
+        def chord_ready():
+            game = started_game(rows, cols, mines, next(seeds))
+            row, col = numbered_cell(game)
+            flag_around(game, row, col)
+            return game, row, col
+
+        token = started()[0].serialize()
+        results = [
+            timed(args.repeat, fresh, lambda g: g.reveal(rows // 2, cols // 2)),
+            timed(args.repeat, started, lambda g: g.toggle_flag(0, 0)),
+            timed(args.repeat, chord_ready, Game.chord),
+            timed(args.repeat, started, lambda g: g.hint()),
+            timed(args.repeat, started, lambda g: g.serialize()),
+            timed(args.repeat, started, lambda g: Game.deserialize(token)),
+        ]
+        print(f'{name:<12}' + ''.join(f'{value:>10.3f}' for value in results[:4])
+              + f'{results[4]:>11.3f}{results[5]:>13.3f}')
+
+
+if __name__ == '__main__':
+    main()
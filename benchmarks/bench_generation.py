@@ -0,0 +1,85 @@
+"""
+보드 생성 벤치마크
+
+기존 방식(randint 재시도 + 지뢰별 3중 루프)과 generation 모듈을 비교한다.
+기존 방식은 큰 보드에서 수 분이 걸리므로 --legacy-limit 칸 이하에서만 잰다.
+
+    python -m benchmarks.bench_generation
+    python -m benchmarks.bench_generation --repeat 5 --legacy-limit 100000
+"""
+import argparse
+import random
+import time
+
+from minesweeper import generation
+from minesweeper.codec import MINE
+
+CASES = [
+    ('easy', 8, 8, 10),
+    ('medium', 12, 12, 30),
+    ('hard', 16, 16, 40),
+    ('custom-dense', 30, 30, 899),
+    ('200x200', 200, 200, 8000),
+    ('200x200-dense', 200, 200, 36000),
+    ('1000x1000', 1000, 1000, 150000),
+    ('2000x2000', 2000, 2000, 600000),
+    ('2000x2000-dense', 2000, 2000, 3600000),
+]
+
+
+def legacy_generate(rows, cols, mines):
+    """기존 new_game의 생성 방식: randint로 좌표를 뽑아 겹치면 다시 뽑고, 숫자는 지뢰마다 주변 칸에 더한다"""
+    board = bytearray(rows * cols)
+    mine_positions = set()
+    while len(mine_positions) < mines:
+        mine_positions.add((random.randint(0, rows - 1), random.randint(0, cols - 1)))
+    for r, c in mine_positions:
+        board[r * cols + c] = MINE
+        for dr in (-1, 0, 1):
+            for dc in (-1, 0, 1):
+                nr, nc = r + dr, c + dc
+                if 0 <= nr < rows and 0 <= nc < cols and board[nr * cols + nc] != MINE:
+                    board[nr * cols + nc] += 1
+    return board
+
+
+def best_of(repeat, func, *args):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--legacy-limit', type=int, default=40000,
+                        help='기존 방식을 잴 최대 칸 수')
+    args = parser.parse_args()
+
+    def fmt(seconds):
+        return '-' if seconds is None else f'{seconds * 1000:10.2f}'
+
+    print(f'{"case":<18}{"legacy ms":>12}{"place ms":>12}{"pure ms":>12}{"numpy ms":>12}')
+    for name, rows, cols, mines in CASES:
+        size = rows * cols
+        legacy = None
+        if size <= args.legacy_limit:
+            legacy = best_of(args.repeat, legacy_generate, rows, cols, mines)
+
+        exclude = generation.safe_zone(size // 2, rows, cols)
+        mines = min(mines, size - len(exclude))
+        place = best_of(args.repeat, generation.place_mines, rows, cols, mines, exclude)
+        mask = generation.place_mines(rows, cols, mines, exclude)
+        pure = best_of(args.repeat, generation.count_neighbors_pure, mask, rows, cols)
+        numpy_time = None
+        if generation.np is not None:
+            numpy_time = best_of(args.repeat, generation.count_neighbors_numpy, mask, rows, cols)
+
+        print(f'{name:<18}{fmt(legacy):>12}{fmt(place):>12}{fmt(pure):>12}{fmt(numpy_time):>12}')
+
+
+if __name__ == '__main__':
+    main()
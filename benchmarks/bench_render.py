@@ -0,0 +1,119 @@
+"""
+보드 HTML 렌더링 벤치마크
+
+기존 방식(칸마다 dict를 만들어 board.html 템플릿 루프로 렌더링)과
+render.render_board(칸 코드에서 직접 생성 + 행 조각 캐시)를 비교한다.
+캐시는 비운 상태(cold)와, 한 수를 둔 뒤 다시 그리는 상태(warm)를 따로 잰다.
+
+    DEBUG=True python -m benchmarks.bench_render
+    DEBUG=True python -m benchmarks.bench_render --repeat 20
+"""
+import argparse
+import os
+import random
+import time
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.template import Template, Context  # noqa: E402
+
+from minesweeper import render  # noqa: E402
+from minesweeper.engine import Game  # noqa: E402
+from minesweeper.protocol import cell_data  # noqa: E402
+
+CASES = [
+    ('hard', 16, 16, 40),
+    ('200x200', 200, 200, 6000),
+]
+
+# 칸마다 dict를 만들어 템플릿 태그로 한 칸씩 그리던 기존 board.html의 칸 루프
+LEGACY_TEMPLATE = Template('''{% for row in board_data %}
+    {% for cell in row %}
+        {% if cell.is_revealed %}
+            <div class="cell revealed {% if cell.is_mine %}mine{% endif %} {% if cell.value %}color-{{ cell.value }}{% endif %}"
+                 data-row="{{ cell.row }}"
+                 data-col="{{ cell.col }}">
+                {% if cell.is_mine %}💣{% else %}{{ cell.value }}{% endif %}
+            </div>
+        {% else %}
+            <div class="cell {% if cell.is_flagged %}flagged{% endif %}"
+                 data-row="{{ cell.row }}"
+                 data-col="{{ cell.col }}">
+                {% if cell.is_flagged %}🚩{% endif %}
+            </div>
+        {% endif %}
+    {% endfor %}
+{% endfor %}''')
+
+
+def legacy_render(game):
+    """기존 get_game_context + 템플릿 루프"""
+    board_data = [
+        [cell_data(game, r * game.cols + c) for c in range(game.cols)]
+        for r in range(game.rows)
+    ]
+    return LEGACY_TEMPLATE.render(Context({'board_data': board_data}))
+
+
+def cold_render(game):
+    render.clear_cache()
+    return render.render_board(game)
+
+
+def timed(repeat, fn, *args):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def played_game(rows, cols, mines, seed):
+    """가운데를 열고 깃발 몇 개를 꽂은 진행 중 게임"""
+    rng = random.Random(seed)
+    game = Game(rows, cols, mines, seed=seed)
+    game.reveal(rows // 2, cols // 2)
+    for _ in range(max(rows, cols)):
+        game.set_flag(rng.randrange(rows), rng.randrange(cols))
+    return game
+
+
+def next_move(game, rng):
+    """닫힌 칸 하나에 깃발을 꽂아 한 행만 바꾼다 (warm 측정용)"""
+    while True:
+        index = rng.randrange(game.size)
+        if not game.revealed[index] and not game.flagged[index]:
+            game.flagged[index] = 1
+            return
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f'{"case":<10}{"template":>12}{"cold":>10}{"warm":>10}   (ms)')
+    for name, rows, cols, mines in CASES:
+        game = played_game(rows, cols, mines, seed=1)
+        rng = random.Random(2)
+
+        def warm_render():
+            next_move(game, rng)
+            return render.render_board(game)
+
+        render.render_board(game)
+        print(
+            f'{name:<10}'
+            f'{timed(args.repeat, legacy_render, game):>12.3f}'
+            f'{timed(args.repeat, cold_render, game):>10.3f}'
+            f'{timed(args.repeat, warm_render):>10.3f}'
+        )
+
+
+if __name__ == '__main__':
+    main()
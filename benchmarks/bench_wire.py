@@ -0,0 +1,55 @@
+"""
+/api/game-state/ 응답 형식 벤치마크
+
+기존 형식(칸마다 dict)과 압축 형식(칸당 한 글자)의 응답 크기(원본/gzip)와
+서버 생성 + JSON 인코딩, 클라이언트 측 JSON 파싱 시간을 비교한다.
+
+    python -m benchmarks.bench_wire
+    python -m benchmarks.bench_wire --repeat 10
+"""
+import argparse
+import gzip
+import json
+import time
+
+from minesweeper.engine import Game
+from minesweeper.protocol import compact_state, verbose_state
+
+CASES = [
+    ('hard', 16, 16, 40),
+    ('200x200', 200, 200, 6000),
+    ('500x500', 500, 500, 37500),
+]
+
+
+def best_of(repeat, fn):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+
+def measure(repeat, build, game):
+    encode_ms, body = best_of(repeat, lambda: json.dumps(build(game)).encode('utf-8'))
+    parse_ms, _ = best_of(repeat, lambda: json.loads(body))
+    return len(body), len(gzip.compress(body)), encode_ms, parse_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f'{"case":<10}{"format":<9}{"bytes":>12}{"gzip":>10}{"encode":>10}{"parse":>10}   (ms)')
+    for name, rows, cols, mines in CASES:
+        game = Game(rows, cols, mines, seed=1)
+        game.reveal(rows // 2, cols // 2)
+        for fmt, build in (('verbose', verbose_state), ('compact', compact_state)):
+            size, gzipped, encode_ms, parse_ms = measure(args.repeat, build, game)
+            print(f'{name:<10}{fmt:<9}{size:>12,}{gzipped:>10,}{encode_ms:>10.3f}{parse_ms:>10.3f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,347 @@
+"""
+요청 경로 부하 시뮬레이션 벤치마크
+
+스크립트 플레이어 여러 명이 Django 테스트 클라이언트로 new_game/click/flag/hint/
+game_state 뷰를 실제 요청 경로(미들웨어, 세션, 저장소)째로 호출한다. 플레이어는
+스레드 풀이나 프로세스 풀에 나눠 돌리고, 케이스(난이도/큰 커스텀 보드)마다
+엔드포인트별 p50/p95/p99 지연 시간, 세션 쿠키 크기, 초당 요청 수를 보고한다.
+
+결과는 기준값(baselines/loadsim.json)으로 저장해 두고, --check로 다시 돌려
+기준값보다 threshold 넘게 나빠진 항목이 있으면 종료 코드 1로 실패한다.
+기준값은 같은 머신/옵션에서 만든 것끼리만 비교한다.
+
+    DEBUG=True python -m benchmarks.loadsim
+    DEBUG=True python -m benchmarks.loadsim --players 16 --threads 8
+    DEBUG=True python -m benchmarks.loadsim --processes 4 --store memory
+    DEBUG=True python -m benchmarks.loadsim --save-baseline
+    DEBUG=True python -m benchmarks.loadsim --check --threshold 0.25
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.core.management import call_command  # noqa: E402
+from django.db import connections  # noqa: E402
+from django.test import Client  # noqa: E402
+from django.test.utils import override_settings, setup_test_environment  # noqa: E402
+
+from minesweeper.store import STORE_BACKENDS  # noqa: E402
+
+BASELINE_PATH = Path(__file__).resolve().parent / 'baselines' / 'loadsim.json'
+# 기준값과 함께 남기는 옵션 (--check 때 다르면 경고)
+BASELINE_OPTIONS = ('players', 'games', 'max_moves', 'state_every', 'threads', 'processes', 'store', 'seed')
+
+# (이름, new_game 경로, 커스텀 설정 POST 데이터). 저장소가 담을 수 없는 크기는 건너뛴다
+CASES = [
+    ('easy', '/new_game/easy/', None),
+    ('medium', '/new_game/medium/', None),
+    ('hard', '/new_game/hard/', None),
+    ('30x30', '/new_game/', {'rows': 30, 'cols': 30, 'mines': 180}),
+    ('50x50', '/new_game/', {'rows': 50, 'cols': 50, 'mines': 400}),
+    ('100x100', '/new_game/', {'rows': 100, 'cols': 100, 'mines': 1600}),
+]
+STRATEGIES = ('random', 'solver', 'flag')
+ENDPOINTS = ('new_game', 'click', 'flag', 'hint', 'game_state')
+PERCENTILES = (50, 95, 99)
+# 지연 시간 비교에서 무시할 절대 차이 (ms). 1ms 미만 요청의 흔들림으로 실패하지 않도록
+NOISE_FLOOR_MS = 1.0
+# 백분위를 비교할 최소 표본 수 (이보다 적으면 p99는 사실상 최댓값 하나라 흔들림이 크다)
+MIN_SAMPLES = {95: 100, 99: 500}
+
+
+def percentile(values, p):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+
+class Player:
+    """테스트 클라이언트 하나로 게임을 진행하는 스크립트 플레이어"""
+
+    def __init__(self, case, strategy, seed, state_every):
+        self.name, self.new_game_path, self.custom = case
+        self.strategy = strategy
+        self.rng = random.Random(seed)
+        self.state_every = state_every
+        self.client = Client()
+        self.latency = {endpoint: [] for endpoint in ENDPOINTS}
+        self.cookie_bytes = []
+        self.outcomes = {'won': 0, 'lost': 0, 'unfinished': 0}
+
+    def request(self, endpoint, path, data=None):
+        started = time.perf_counter()
+        if data is None:
+            response = self.client.get(path)
+        else:
+            response = self.client.post(path, data)
+        self.latency[endpoint].append((time.perf_counter() - started) * 1000)
+        cookie = self.client.cookies.get(settings.SESSION_COOKIE_NAME)
+        if cookie is not None and cookie.value:
+            self.cookie_bytes.append(len(cookie.value))
+        return response
+
+    def sync(self):
+        """game_state(압축 형식)로 보드 크기와 닫힌 칸을 다시 맞춘다"""
+        state = self.request('game_state', '/api/game-state/?format=compact').json()
+        self.rows, self.cols = state['rows'], state['cols']
+        self.hidden = bytearray(1 if code in '?F' else 0 for code in state['cells'])
+        self.flagged = bytearray(1 if code == 'F' else 0 for code in state['cells'])
+        return state
+
+    def apply(self, payload):
+        if payload.get('resync'):
+            return self.sync()
+        for cell in payload.get('cells', ()):
+            index = cell['row'] * self.cols + cell['col']
+            self.hidden[index] = not cell['is_revealed']
+            self.flagged[index] = cell['is_flagged']
+        return payload
+
+    def random_hidden(self, flagged=False):
+        """닫힌 칸 하나 (flagged=False면 깃발 없는 칸). 재시도 추출 후 실패하면 전체 스캔"""
+        size = len(self.hidden)
+        for _ in range(64):
+            index = self.rng.randrange(size)
+            if self.hidden[index] and (flagged or not self.flagged[index]):
+                return divmod(index, self.cols)
+        candidates = [
+            i for i in range(size) if self.hidden[i] and (flagged or not self.flagged[i])
+        ]
+        return divmod(self.rng.choice(candidates), self.cols) if candidates else None
+
+    def next_move(self, guess):
+        """(엔드포인트, 경로). 전략별로 고른다"""
+        if self.strategy == 'solver' and not guess:
+            return 'hint', '/hint/'
+        if self.strategy == 'flag' and self.rng.random() < 0.5:
+            cell = self.random_hidden(flagged=True)
+            return ('flag', '/flag/%d/%d/' % cell) if cell else (None, None)
+        cell = self.random_hidden()
+        return ('click', '/click/%d/%d/' % cell) if cell else (None, None)
+
+    def play(self, max_moves):
+        self.request('new_game', self.new_game_path, self.custom)
+        state = self.sync()
+        guess = False
+        for move in range(max_moves):
+            if state.get('won') or state.get('game_over'):
+                break
+            if move and move % self.state_every == 0:
+                state = self.sync()
+                continue
+            endpoint, path = self.next_move(guess)
+            if endpoint is None:
+                break
+            response = self.request(endpoint, path)
+            if endpoint == 'hint':
+                if response.status_code != 200:
+                    guess = True
+                    continue
+                # 증명되지 않은 힌트는 서버가 대신 찍어 준 것: 다음 수는 직접 찍는다
+                guess = not response.json().get('proven')
+            else:
+                guess = False
+            state = self.apply(response.json())
+        if state.get('won'):
+            self.outcomes['won'] += 1
+        elif state.get('game_over'):
+            self.outcomes['lost'] += 1
+        else:
+            self.outcomes['unfinished'] += 1
+
+
+def run_player(case_index, strategy, seed, games, max_moves, state_every):
+    """플레이어 하나가 games판을 두고 측정값을 돌려준다 (스레드/프로세스 작업 단위)"""
+    player = Player(CASES[case_index], strategy, seed, state_every)
+    for _ in range(games):
+        player.play(max_moves)
+    return player.latency, player.cookie_bytes, player.outcomes
+
+
+def configure(overrides, db_path):
+    """테스트 클라이언트용 설정. DB는 첫 연결 전에 바꿔야 해서 설정 dict를 직접 고친다"""
+    settings.DATABASES['default']['NAME'] = db_path
+    try:
+        setup_test_environment()
+    except RuntimeError:
+        # fork로 만든 워커는 부모의 설정을 이미 물려받았다
+        return
+    override_settings(**overrides).enable()
+
+
+def run_case(case_index, args, executor):
+    jobs = [
+        (case_index, STRATEGIES[k % len(STRATEGIES)], args.seed * 1000 + k,
+         args.games, args.max_moves, args.state_every)
+        for k in range(args.players)
+    ]
+    started = time.perf_counter()
+    results = list(executor.map(run_player, *zip(*jobs)))
+    elapsed = time.perf_counter() - started
+
+    latency = {endpoint: [] for endpoint in ENDPOINTS}
+    cookie_bytes = []
+    outcomes = {'won': 0, 'lost': 0, 'unfinished': 0}
+    for player_latency, player_cookies, player_outcomes in results:
+        for endpoint, values in player_latency.items():
+            latency[endpoint].extend(values)
+        cookie_bytes.extend(player_cookies)
+        for key, value in player_outcomes.items():
+            outcomes[key] += value
+
+    requests = sum(len(values) for values in latency.values())
+    return {
+        'requests': requests,
+        'throughput': requests / elapsed,
+        'endpoints': {
+            endpoint: {
+                'count': len(values),
+                **{f'p{p}_ms': percentile(values, p) for p in PERCENTILES},
+            }
+            for endpoint, values in latency.items() if values
+        },
+        'cookie_bytes': {
+            'p50': percentile(cookie_bytes, 50),
+            'max': max(cookie_bytes) if cookie_bytes else None,
+        },
+        'outcomes': outcomes,
+    }
+
+
+def print_case(name, result):
+    cookies = result['cookie_bytes']
+    print(f'\n[{name}] {result["requests"]} req, {result["throughput"]:.1f} req/s, '
+          f'cookie p50 {cookies["p50"]}B max {cookies["max"]}B, {result["outcomes"]}')
+    print(f'  {"endpoint":<12}{"count":>8}' + ''.join(f'{f"p{p}":>10}' for p in PERCENTILES) + '   (ms)')
+    for endpoint, stats in result['endpoints'].items():
+        print(f'  {endpoint:<12}{stats["count"]:>8}'
+              + ''.join(f'{stats[f"p{p}_ms"]:>10.3f}' for p in PERCENTILES))
+
+
+def regressions(baseline, current, threshold):
+    """기준값 대비 threshold 넘게 나빠진 항목 설명 목록"""
+    found = []
+    for name, result in current.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if result['throughput'] < base['throughput'] * (1 - threshold):
+            found.append(f'{name}: throughput {base["throughput"]:.1f} -> {result["throughput"]:.1f} req/s')
+        for endpoint, stats in result['endpoints'].items():
+            base_stats = base['endpoints'].get(endpoint)
+            if base_stats is None:
+                continue
+            for p in (95, 99):
+                if min(stats['count'], base_stats['count']) < MIN_SAMPLES[p]:
+                    continue
+                key = f'p{p}_ms'
+                old, new = base_stats[key], stats[key]
+                if new > old * (1 + threshold) and new - old > NOISE_FLOOR_MS:
+                    found.append(f'{name} {endpoint} {key}: {old:.3f} -> {new:.3f}')
+        base_cookie, cookie = base['cookie_bytes']['max'], result['cookie_bytes']['max']
+        if base_cookie and cookie and cookie > base_cookie * (1 + threshold):
+            found.append(f'{name}: cookie max {base_cookie} -> {cookie} bytes')
+    return found
+
+
+def machine_info():
+    """기준값을 만든 머신 (비교할 때 같은 머신인지 확인용)"""
+    return {
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+        'python': platform.python_version(),
+        'django': django.get_version(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--players', type=int, default=6, help='케이스별 플레이어 수 (전략을 돌아가며 배정)')
+    parser.add_argument('--games', type=int, default=3, help='플레이어별 게임 수')
+    parser.add_argument('--max-moves', type=int, default=150, help='게임당 최대 수')
+    parser.add_argument('--state-every', type=int, default=10, help='몇 수마다 game-state로 동기화할지')
+    parser.add_argument('--threads', type=int, default=1)
+    parser.add_argument('--processes', type=int, default=0, help='0보다 크면 스레드 대신 프로세스 풀')
+    parser.add_argument('--store', default=settings.MINESWEEPER_GAME_STORE,
+                        choices=('cookie', 'memory', 'database', 'cache'))
+    parser.add_argument('--cases', default=','.join(name for name, _, _ in CASES))
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--baseline', type=Path, default=BASELINE_PATH)
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--check', action='store_true', help='기준값 대비 회귀가 있으면 종료 코드 1')
+    parser.add_argument('--threshold', type=float, default=0.25)
+    args = parser.parse_args()
+
+    # 게임 결과 기록(DB)과 database 저장소가 실제 DB를 건드리지 않도록 임시 SQLite를 쓴다
+    db_path = os.path.join(tempfile.mkdtemp(prefix='loadsim-'), 'db.sqlite3')
+    overrides = {'ALLOWED_HOSTS': ['*'], 'MINESWEEPER_GAME_STORE': args.store}
+    configure(overrides, db_path)
+    call_command('migrate', verbosity=0)
+    # 워커 프로세스가 부모의 SQLite 연결을 물려받지 않도록 닫아 둔다
+    connections.close_all()
+
+    wanted = set(args.cases.split(','))
+    if args.processes:
+        executor = ProcessPoolExecutor(args.processes, initializer=configure, initargs=(overrides, db_path))
+    else:
+        executor = ThreadPoolExecutor(args.threads)
+    print(f'store={args.store} players={args.players} games={args.games} '
+          f'{"processes=%d" % args.processes if args.processes else "threads=%d" % args.threads}')
+
+    max_cells = STORE_BACKENDS[args.store].max_cells
+
+    current = {}
+    with executor:
+        for index, (name, _, custom) in enumerate(CASES):
+            if custom and custom['rows'] * custom['cols'] > max_cells:
+                if name in wanted:
+                    print(f'\n[{name}] 건너뜀: {args.store} 저장소는 {max_cells}칸까지만 담습니다 (--store memory)')
+                continue
+            if name in wanted:
+                current[name] = run_case(index, args, executor)
+                print_case(name, current[name])
+
+    options = {name: getattr(args, name) for name in BASELINE_OPTIONS}
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        baseline = {'machine': machine_info(), 'options': options, 'cases': current}
+        args.baseline.write_text(json.dumps(baseline, indent=2, sort_keys=True) + '\n')
+        print(f'\n기준값을 저장했습니다: {args.baseline}')
+    if args.check:
+        if not args.baseline.exists():
+            print(f'\n기준값이 없습니다: {args.baseline} (--save-baseline으로 먼저 만드세요)')
+            sys.exit(1)
+        baseline = json.loads(args.baseline.read_text())
+        if baseline['options'] != options or baseline['machine'] != machine_info():
+            # 다른 머신/옵션의 기준값과는 숫자를 그대로 비교할 수 없다
+            print(f'\n주의: 기준값과 머신 또는 옵션이 다릅니다 '
+                  f'(기준값: {baseline["machine"]["platform"]}, cpu {baseline["machine"]["cpu_count"]}, '
+                  f'{baseline["options"]}). 이 머신에서 --save-baseline으로 다시 만드는 것을 권장합니다.')
+        found = regressions(baseline['cases'], current, args.threshold)
+        if found:
+            print(f'\n회귀 {len(found)}건 (threshold {args.threshold:.0%}):')
+            for line in found:
+                print(f'  {line}')
+            sys.exit(1)
+        print(f'\n회귀 없음 (threshold {args.threshold:.0%})')
+
+
+if __name__ == '__main__':
+    main()
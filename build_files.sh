@@ -0,0 +1,5 @@
+#!/bin/bash
+# Vercel 빌드: 의존성 설치 후 정적 파일을 해시된 이름 + .gz/.br로 모은다
+set -e
+pip install -r requirements.txt
+python3 manage.py collectstatic --noinput --clear
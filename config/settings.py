@@ -78,7 +78,11 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # MINESWEEPER_METRICS가 꺼져 있으면 스스로 빠진다 (맨 앞: 다른 미들웨어 시간까지 포함)
+    'minesweeper.metrics.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    # 정적 파일: 해시된 이름에는 1년 immutable 캐시, .br/.gz가 있으면 Accept-Encoding에 맞춰 전송
+    'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -153,6 +157,55 @@ USE_TZ = True
 # https://docs.djangoproject.com/en/6.0/howto/static-files/
 
 STATIC_URL = 'static/'
+# collectstatic 결과 (build_files.sh가 Vercel 빌드에서 실행)
+STATIC_ROOT = BASE_DIR / 'staticfiles_build' / 'static'
+
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    # 파일 이름에 내용 해시를 붙이고(manifest) gzip/Brotli로 미리 압축해 둔다.
+    # manifest가 없으면 해시 없는 이름으로 링크한다 (minesweeper/storage.py)
+    'staticfiles': {
+        'BACKEND': 'minesweeper.storage.FallbackManifestStaticFilesStorage',
+    },
+}
 
 # Vercel 같은 서버리스 환경에서 DB 없이 세션을 쓰기 위한 설정
 SESSION_ENGINE = 'django.contrib.sessions.backends.signed_cookies'
+
+# 게임 카운터(공개 칸/깃발 수) 증분값을 저장할 때마다 전체 재계산과 비교 (테스트용)
+MINESWEEPER_CHECK_COUNTERS = os.environ.get('MINESWEEPER_CHECK_COUNTERS', 'False') == 'True'
+
+# 게임 상태 저장소: cookie(기본, 서버리스용) / memory / database / cache
+# cookie 이외에는 세션 쿠키에 game_id만 담기고 상태는 서버에 저장된다 (minesweeper/store.py)
+MINESWEEPER_GAME_STORE = os.environ.get('MINESWEEPER_GAME_STORE', 'cookie')
+MINESWEEPER_GAME_STORE_OPTIONS = {
+    'ttl': int(os.environ.get('MINESWEEPER_GAME_TTL', 60 * 60 * 24)),
+}
+
+# ASGI(config/asgi.py)로 실행할 때 WebSocket 게임 채널(/ws/game/<game_id>/) 사용
+# cookie 이외의 게임 상태 저장소가 필요하다 (minesweeper/realtime.py)
+MINESWEEPER_REALTIME = os.environ.get('MINESWEEPER_REALTIME', 'False') == 'True'
+
+# 노게스 보드 팩토리: 프로세스 풀이 프리셋 크기별로 미리 검증해 둘 보드 수와
+# 워커 수, 커스텀 크기의 최대 칸 수, 프로세스 종료 시 남은 보드를 내려 둘 경로 (minesweeper/factory.py)
+MINESWEEPER_BOARD_FACTORY = {
+    'depth': int(os.environ.get('MINESWEEPER_NO_GUESS_DEPTH', 4)),
+    'workers': int(os.environ.get('MINESWEEPER_NO_GUESS_WORKERS', 1)),
+    'max_cells': int(os.environ.get('MINESWEEPER_NO_GUESS_MAX_CELLS', 100 * 100)),
+}
+if os.environ.get('MINESWEEPER_NO_GUESS_SPILL_DIR'):
+    MINESWEEPER_BOARD_FACTORY['spill_dir'] = os.environ['MINESWEEPER_NO_GUESS_SPILL_DIR']
+
+# 프리셋(easy/medium/hard) 보드 풀: 프리셋별로 미리 생성해 둘 보드 수, 0이면 사용 안 함 (minesweeper/pool.py)
+MINESWEEPER_PRESET_POOL = {
+    'size': int(os.environ.get('MINESWEEPER_PRESET_POOL_SIZE', 8)),
+}
+
+# 칸 수가 이보다 많은 보드는 타일 모드로 그린다 (화면에 보이는 타일만 /api/tiles/로 받음)
+MINESWEEPER_TILED_THRESHOLD = int(os.environ.get('MINESWEEPER_TILED_THRESHOLD', 200 * 200))
+
+# 뷰별 지연 시간/응답·세션 쿠키 크기/엔진 카운터 계측과 /metrics(Prometheus 텍스트) 노출
+# 값은 프로세스별로 모인다 (minesweeper/metrics.py)
+MINESWEEPER_METRICS = os.environ.get('MINESWEEPER_METRICS', 'False') == 'True'
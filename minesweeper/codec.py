@@ -0,0 +1,202 @@
+"""
+세션 저장용 게임 상태 코덱
+
+보드/공개/깃발 그리드를 중첩 리스트 JSON 대신 바이트 배열로 다룬다.
+- 보드: 칸당 4비트 (0~8 = 주변 지뢰 수, 9 = 지뢰)
+- 공개/깃발: 칸당 1비트 비트셋
+- 상태 버전과 타일별 버전: 32비트 정수
+- 보드 시드, 첫 클릭 칸, 이동 기록(가변 길이 정수 바이트열)
+보드는 첫 클릭 때 생성되므로, 그 전에는 보드/공개 그리드를 싣지 않는다.
+직렬화 결과는 zlib 압축 후 URL-safe base64 문자열로, 세션 키 하나에 담긴다.
+"""
+import base64
+import math
+import struct
+import uuid
+import zlib
+from array import array
+
+CODEC_VERSION = 5
+
+# 보드 바이트 배열에서 지뢰를 나타내는 값 (숫자 0~8과 겹치지 않음)
+MINE = 9
+
+_FLAG_GAME_OVER = 1
+_FLAG_WON = 2
+_FLAG_HAS_BOARD = 4
+_FLAG_NO_GUESS = 8
+
+# version, rows, cols, mines, flags, revealed_count, flag_count, 상태 버전,
+# start_time, end_time, game_id, seed, first_click(-1 = 아직 없음), len(move_log), len(difficulty)
+_HEADER = struct.Struct('<BHHIBIIIdd16sQiIB')
+
+_BITS_TO_ASCII = bytes.maketrans(b'\x00\x01', b'01')
+_ASCII_TO_BITS = bytes.maketrans(b'01', b'\x00\x01')
+_HIGH_NIBBLE = bytes(b >> 4 for b in range(256))
+_LOW_NIBBLE = bytes(b & 0x0F for b in range(256))
+
+
+def pack_bits(cells):
+    """0/1 바이트 배열을 비트셋으로 압축 (칸 8개당 1바이트)"""
+    if not cells:
+        return b''
+    value = int(bytes(cells).translate(_BITS_TO_ASCII), 2)
+    return value.to_bytes((len(cells) + 7) // 8, 'big')
+
+
+def unpack_bits(data, size):
+    """pack_bits의 역변환"""
+    if not size:
+        return bytearray()
+    bits = format(int.from_bytes(data, 'big'), f'0{size}b')
+    if len(bits) != size:
+        raise ValueError('비트셋 길이가 맞지 않습니다.')
+    return bytearray(bits.encode('ascii').translate(_ASCII_TO_BITS))
+
+
+def pack_nibbles(values):
+    """0~15 값 바이트 배열을 4비트씩 묶어 압축 (칸 2개당 1바이트)"""
+    values = bytes(values)
+    if len(values) % 2:
+        values += b'\x00'
+    size = len(values) // 2
+    if not size:
+        return b''
+    # 각 바이트가 15 이하이므로 정수 연산에서 자리올림이 생기지 않는다
+    high = int.from_bytes(values[0::2], 'big') << 4
+    low = int.from_bytes(values[1::2], 'big')
+    return (high | low).to_bytes(size, 'big')
+
+
+def unpack_nibbles(data, size):
+    """pack_nibbles의 역변환"""
+    if len(data) != (size + 1) // 2:
+        raise ValueError('보드 데이터 길이가 맞지 않습니다.')
+    values = bytearray(len(data) * 2)
+    values[0::2] = data.translate(_HIGH_NIBBLE)
+    values[1::2] = data.translate(_LOW_NIBBLE)
+    del values[size:]
+    return values
+
+
+def append_varint(buf, value):
+    """0 이상 정수를 7비트씩 끊어 buf 뒤에 붙인다 (LEB128)"""
+    while value > 0x7F:
+        buf.append(value & 0x7F | 0x80)
+        value >>= 7
+    buf.append(value)
+
+
+def iter_varints(data):
+    """append_varint로 붙인 정수를 차례로 꺼낸다. 끝이 잘렸으면 ValueError"""
+    value = shift = 0
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+            continue
+        yield value
+        value = shift = 0
+    if shift:
+        raise ValueError('이동 기록이 잘렸습니다.')
+
+
+def _encode_time(value):
+    return math.nan if value is None else float(value)
+
+
+def _decode_time(value):
+    return None if math.isnan(value) else value
+
+
+def encode_game(game):
+    """engine.Game을 세션에 저장할 문자열로 인코딩"""
+    flags = 0
+    if game.game_over:
+        flags |= _FLAG_GAME_OVER
+    if game.won:
+        flags |= _FLAG_WON
+    if game.board is not None:
+        flags |= _FLAG_HAS_BOARD
+    if game.no_guess:
+        flags |= _FLAG_NO_GUESS
+    difficulty = game.difficulty.encode('utf-8')[:255]
+
+    parts = [
+        _HEADER.pack(
+            CODEC_VERSION, game.rows, game.cols, game.mines, flags,
+            game.revealed_count, game.flag_count, game.version,
+            _encode_time(game.start_time), _encode_time(game.end_time),
+            uuid.UUID(game.game_id).bytes, game.seed,
+            -1 if game.first_click is None else game.first_click,
+            len(game.move_log), len(difficulty),
+        ),
+        difficulty,
+        bytes(game.move_log),
+    ]
+    if game.board is not None:
+        parts.append(pack_nibbles(game.board))
+        parts.append(pack_bits(game.revealed))
+    parts.append(pack_bits(game.flagged))
+    parts.append(struct.pack(f'<{len(game.tile_versions)}I', *game.tile_versions))
+    payload = b''.join(parts)
+    return base64.urlsafe_b64encode(zlib.compress(payload)).rstrip(b'=').decode('ascii')
+
+
+def decode_game(token):
+    """encode_game의 역변환. Game 속성 dict를 반환하고, 손상되었거나 버전이 다르면 ValueError"""
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        payload = zlib.decompress(raw)
+        (version, rows, cols, mines, flags, revealed_count, flag_count, state_version,
+         start_time, end_time, game_id, seed, first_click, log_len,
+         difficulty_len) = _HEADER.unpack_from(payload)
+    except (TypeError, ValueError, zlib.error, struct.error) as e:
+        raise ValueError('게임 상태를 해석할 수 없습니다.') from e
+    if version != CODEC_VERSION:
+        raise ValueError(f'지원하지 않는 게임 상태 버전입니다: {version}')
+
+    size = rows * cols
+    offset = _HEADER.size
+    difficulty = payload[offset:offset + difficulty_len].decode('utf-8')
+    offset += difficulty_len
+    move_log = bytearray(payload[offset:offset + log_len])
+    offset += log_len
+    board_len = (size + 1) // 2
+    bits_len = (size + 7) // 8
+    board = None
+    revealed = bytearray(size)
+    if flags & _FLAG_HAS_BOARD:
+        board = unpack_nibbles(payload[offset:offset + board_len], size)
+        offset += board_len
+        revealed = unpack_bits(payload[offset:offset + bits_len], size)
+        offset += bits_len
+    flagged = unpack_bits(payload[offset:offset + bits_len], size)
+    offset += bits_len
+    tile_count, rest = divmod(len(payload) - offset, 4)
+    if rest:
+        raise ValueError('타일 버전 데이터 길이가 맞지 않습니다.')
+    tile_versions = array('I', struct.unpack_from(f'<{tile_count}I', payload, offset))
+
+    return {
+        'rows': rows,
+        'cols': cols,
+        'mines': mines,
+        'board': board,
+        'revealed': revealed,
+        'flagged': flagged,
+        'revealed_count': revealed_count,
+        'flag_count': flag_count,
+        'version': state_version,
+        'tile_versions': tile_versions,
+        'game_over': bool(flags & _FLAG_GAME_OVER),
+        'won': bool(flags & _FLAG_WON),
+        'no_guess': bool(flags & _FLAG_NO_GUESS),
+        'difficulty': difficulty,
+        'start_time': _decode_time(start_time),
+        'end_time': _decode_time(end_time),
+        'game_id': str(uuid.UUID(bytes=game_id)),
+        'seed': seed,
+        'first_click': None if first_click < 0 else first_click,
+        'move_log': move_log,
+    }
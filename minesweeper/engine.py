@@ -0,0 +1,405 @@
+"""
+지뢰찾기 게임 엔진 (Django 비의존)
+
+Game 하나가 보드/공개/깃발 그리드를 1차원 bytearray(인덱스 = row * cols + col)로
+들고 있고, 조작 메서드는 모두 바뀐 칸 인덱스 목록을 반환한다. 뷰는 얇은
+어댑터로 이 엔진을 호출하고, 시뮬레이터/벤치마크는 요청 없이 직접 구동한다.
+
+보드는 게임 시드와 첫 클릭 칸으로 정해지고(generation.seeded_board), 상태를 바꾼
+수는 이동 기록(move_log)에 덧붙는다. 둘만 있으면 어느 시점이든 다시 만들 수 있다.
+"""
+import random
+import time
+import uuid
+from array import array
+
+from .codec import MINE, append_varint, decode_game, encode_game, iter_varints
+from .generation import base_board, clear_start, mine_indices, neighbor_indices, new_seed
+from .reveal import ZeroRegions
+from .solver import FrontierSolver
+
+# 타일 API(/api/tiles/)와 타일별 버전의 단위 (TILE_SIZE x TILE_SIZE 칸)
+TILE_SIZE = 32
+
+# 보드 크기 상한: 한 변(코덱 헤더는 uint16)과 전체 칸 수(게임당 메모리/직렬화 크기)
+MAX_SIDE = 2000
+MAX_CELLS = 1000 * 1000
+
+# 이동 기록 항목 종류. 항목 하나 = varint(칸 인덱스 << 3 | 종류)
+LOG_REVEAL, LOG_FLAG, LOG_UNFLAG, LOG_CHORD, LOG_OPEN = range(5)
+LOG_ACTIONS = ('reveal', 'flag', 'unflag', 'chord', 'open')
+
+# 계측 훅: observe(이름, 값)을 가진 객체 (metrics.py가 켜져 있을 때만 설치, 평소에는 None)
+hooks = None
+
+
+def tile_grid(rows, cols):
+    """(타일 행 수, 타일 열 수)"""
+    return -(-rows // TILE_SIZE), -(-cols // TILE_SIZE)
+
+
+class Game:
+    __slots__ = (
+        'rows', 'cols', 'mines', 'difficulty', 'game_id', 'no_guess',
+        'seed', 'first_click', 'move_log',
+        'board', 'revealed', 'flagged',
+        'revealed_count', 'flag_count', 'version', 'tile_versions',
+        'game_over', 'won', 'start_time', 'end_time',
+        '_regions', '_solver',
+    )
+
+    def __init__(self, rows, cols, mines, difficulty='custom', game_id=None, no_guess=False, seed=None):
+        if rows < 1 or cols < 1:
+            raise ValueError('보드 크기는 1 이상이어야 합니다.')
+        if rows > MAX_SIDE or cols > MAX_SIDE or rows * cols > MAX_CELLS:
+            raise ValueError(f'보드는 한 변 최대 {MAX_SIDE}칸, 전체 최대 {MAX_CELLS}칸까지 만들 수 있습니다.')
+        if not 0 <= mines <= rows * cols - 1:
+            raise ValueError(f'폭탄 수는 최대 {rows * cols - 1}개까지 설정할 수 있습니다.')
+        size = rows * cols
+        self.rows = rows
+        self.cols = cols
+        self.mines = mines
+        self.difficulty = difficulty
+        self.game_id = game_id or str(uuid.uuid4())
+        # 노게스 게임: 추측 없이 풀리는 것이 검증된 보드를 시작 칸이 열린 상태로 받는다
+        self.no_guess = no_guess
+        # 보드를 정하는 시드와 첫 클릭 칸, 상태를 바꾼 수의 기록 (리플레이/검증용)
+        self.seed = new_seed() if seed is None else seed
+        self.first_click = None
+        self.move_log = bytearray()
+        # 보드는 첫 클릭 때 안전 영역을 피해 생성 (그 전에는 None)
+        self.board = None
+        self.revealed = bytearray(size)
+        self.flagged = bytearray(size)
+        self.revealed_count = 0
+        self.flag_count = 0
+        # 상태가 바뀔 때마다 증가하는 버전과, 타일마다 마지막으로 바뀐 때의 버전
+        self.version = 0
+        tile_rows, tile_cols = tile_grid(rows, cols)
+        self.tile_versions = array('I', bytes(4 * tile_rows * tile_cols))
+        self.game_over = False
+        self.won = False
+        self.start_time = None
+        self.end_time = None
+        self._regions = None
+        self._solver = None
+
+    # ----- 직렬화 -----
+
+    def serialize(self):
+        """세션/저장소에 넣을 압축 문자열"""
+        return encode_game(self)
+
+    @classmethod
+    def deserialize(cls, token):
+        """serialize의 역변환. 해석할 수 없으면 ValueError"""
+        game = cls.__new__(cls)
+        for name, value in decode_game(token).items():
+            setattr(game, name, value)
+        game._regions = None
+        # 솔버 프런티어는 직렬화하지 않는다: 복원한 게임은 첫 힌트 때 열린 칸 전체로 다시 만든다
+        game._solver = None
+        return game
+
+    # ----- 상태 조회 -----
+
+    @property
+    def size(self):
+        return self.rows * self.cols
+
+    @property
+    def finished(self):
+        return self.game_over or self.won
+
+    @property
+    def safe_remaining(self):
+        """아직 열지 않은 안전한 칸 수 (0이면 승리)"""
+        return self.size - self.mines - self.revealed_count
+
+    @property
+    def remaining_flags(self):
+        return self.mines - self.flag_count
+
+    def index(self, row, col):
+        if not (0 <= row < self.rows and 0 <= col < self.cols):
+            raise ValueError(f'보드 밖의 칸입니다: ({row}, {col})')
+        return row * self.cols + col
+
+    def value(self, index):
+        """칸의 보드 값 (보드 생성 전에는 0)"""
+        return self.board[index] if self.board is not None else 0
+
+    def check_counters(self):
+        """증분 카운터가 그리드 전체를 다시 센 값과 같은지 검사 (테스트/디버그용)"""
+        revealed_count = 0
+        if self.board is not None:
+            revealed_count = sum(1 for r, v in zip(self.revealed, self.board) if r and v != MINE)
+        flag_count = self.flagged.count(1)
+        if (self.revealed_count, self.flag_count) != (revealed_count, flag_count):
+            raise AssertionError(
+                f'카운터 불일치: revealed {self.revealed_count} != {revealed_count}, '
+                f'flags {self.flag_count} != {flag_count}'
+            )
+
+    # ----- 내부 공통 경로 -----
+
+    def _touch(self, changed):
+        """버전을 올리고 바뀐 칸이 속한 타일에 새 버전을 기록"""
+        self.version += 1
+        version = self.version
+        cols = self.cols
+        tile_cols = tile_grid(self.rows, cols)[1]
+        tile_versions = self.tile_versions
+        for i in changed:
+            row, col = divmod(i, cols)
+            tile_versions[(row // TILE_SIZE) * tile_cols + col // TILE_SIZE] = version
+
+    def _log(self, kind, index):
+        append_varint(self.move_log, index << 3 | kind)
+
+    def _start_clock(self):
+        if self.start_time is None:
+            self.start_time = time.time()
+            self.end_time = None
+            self.version += 1
+
+    def _stop_clock_if_finished(self):
+        if self.finished and not self.end_time:
+            self.end_time = time.time()
+
+    def ensure_board(self, index):
+        """
+        첫 클릭 안전 보장: 시드로 만든 보드에서 index와 주변 3x3 영역의 지뢰를 옮긴다.
+        첫 클릭 때 한 번만 하고, 미리 만든 기본 보드(프리셋 풀)가 있으면 그것을 쓴다.
+        """
+        if self.first_click is not None:
+            return
+        if self.board is None:
+            started = time.perf_counter()
+            self.board = base_board(self.rows, self.cols, self.mines, self.seed)
+            self._regions = None
+            if hooks is not None:
+                hooks.observe('minesweeper_generation_seconds', time.perf_counter() - started)
+        if clear_start(self.board, self.rows, self.cols, self.mines, self.seed, index):
+            self._regions = None
+        self.first_click = index
+
+    def place_board(self, board, start=None, regions=None):
+        """
+        미리 만든 보드를 넣는다. 재현하려면 이 게임 시드의 base_board여야 한다.
+        regions는 같은 보드로 만든 ZeroRegions(있으면 재사용).
+        start가 있으면 그 칸을 열어 둔다 (시계는 첫 조작 때 시작).
+        """
+        self.board = bytearray(board)
+        self._regions = regions
+        if start is None:
+            return []
+        return self.open_safe(start)
+
+    def open_safe(self, index):
+        """
+        안전한 칸 하나를 연다 (시작 칸 공개/힌트/리플레이 공용, 시계는 건드리지 않음).
+        첫 수이면 그 칸을 첫 클릭으로 보드를 확정한다
+        """
+        self.ensure_board(index)
+        changed = self._open(index)
+        self._log(LOG_OPEN, index)
+        return changed
+
+    def _open(self, index):
+        """reveal/hint 공통 공개 경로 (안전한 칸 전제)"""
+        return self._open_many([index])
+
+    def _open_many(self, indices):
+        """
+        안전한 칸들을 0 영역 인덱스로 차례로 열고, 카운터/버전/솔버 갱신과 승리 판정은
+        끝에 한 번만 한다. 앞선 칸의 0 영역 공개로 이미 열린 칸은 건너뛴다
+        """
+        if self._regions is None:
+            # 0 영역 라벨링은 보드당 한 번만
+            self._regions = ZeroRegions(self.board, self.rows, self.cols)
+        regions, board, revealed, flagged, cols = self._regions, self.board, self.revealed, self.flagged, self.cols
+        changed = []
+        for index in indices:
+            if not revealed[index]:
+                changed.extend(regions.reveal(board, revealed, flagged, *divmod(index, cols)))
+        self.revealed_count += len(changed)
+        self._touch(changed)
+        if hooks is not None:
+            hooks.observe('minesweeper_flood_cells', len(changed))
+        if self._solver is not None:
+            self._solver.update(self.board, self.revealed, changed)
+        if self.safe_remaining == 0:
+            self.won = True
+        return changed
+
+    def _explode(self):
+        """지뢰를 연 경우: 게임 오버 후 모든 지뢰 공개"""
+        self.game_over = True
+        changed = []
+        for i in mine_indices(self.board):
+            if not self.revealed[i]:
+                self.revealed[i] = 1
+                changed.append(i)
+        self._touch(changed)
+        return changed
+
+    # ----- 조작 -----
+
+    def reveal(self, row, col):
+        """칸 열기"""
+        index = self.index(row, col)
+        if self.finished:
+            return []
+        self._start_clock()
+        self.ensure_board(index)
+        if self.revealed[index]:
+            return []
+
+        if self.flagged[index]:
+            # 깃발 칸을 열면 깃발을 걷고 연다 (바뀐 칸 목록에는 공개로 한 번만 포함)
+            self.flagged[index] = 0
+            self.flag_count -= 1
+
+        if self.board[index] == MINE:
+            changed = self._explode()
+        else:
+            changed = self._open(index)
+        self._log(LOG_REVEAL, index)
+        if hooks is not None:
+            hooks.observe('minesweeper_reveal_cells', len(changed))
+        self._stop_clock_if_finished()
+        return changed
+
+    def toggle_flag(self, row, col):
+        """깃발 설치/해제 (깃발 수는 지뢰 수까지)"""
+        index = self.index(row, col)
+        return self.set_flag(row, col, not self.flagged[index])
+
+    def set_flag(self, row, col, flagged=True):
+        """깃발을 지정한 상태로 맞춘다. 이미 그 상태이거나 깃발 한도에 닿으면 변화 없음"""
+        index = self.index(row, col)
+        if self.finished:
+            return []
+        self._start_clock()
+        if self.revealed[index] or bool(self.flagged[index]) == flagged:
+            return []
+        if not flagged:
+            self.flagged[index] = 0
+            self.flag_count -= 1
+        elif self.flag_count < self.mines:
+            self.flagged[index] = 1
+            self.flag_count += 1
+        else:
+            return []
+        self._touch([index])
+        self._log(LOG_FLAG if flagged else LOG_UNFLAG, index)
+        return [index]
+
+    def chord(self, row, col):
+        """
+        열린 숫자 칸 주변의 깃발 수가 숫자와 같으면 깃발 없는 주변 칸을 모두 연다.
+        주변 8칸은 한 번만 훑어 깃발 수와 열 칸을 함께 모으고, 공개는 한 번에 처리해
+        버전/승리 판정도 한 번만 한다.
+        """
+        index = self.index(row, col)
+        if self.finished or not self.revealed[index]:
+            return []
+        value = self.board[index]
+        if value == 0 or value == MINE:
+            return []
+
+        flags = 0
+        targets = []
+        for i in neighbor_indices(index, self.rows, self.cols):
+            if self.flagged[i]:
+                flags += 1
+            elif not self.revealed[i]:
+                targets.append(i)
+        if flags != value or not targets:
+            return []
+
+        self._start_clock()
+        changed = []
+        if any(self.board[i] == MINE for i in targets):
+            # 깃발을 잘못 꽂은 경우: 지뢰가 열리며 게임 오버
+            changed.extend(self._explode())
+        else:
+            changed.extend(self._open_many(targets))
+        self._log(LOG_CHORD, index)
+        self._stop_clock_if_finished()
+        return changed
+
+    def safe_cell(self):
+        """보이는 숫자만으로 안전이 증명되는 깃발 없는 칸 하나 (없으면 None)"""
+        if self.board is None or not self.revealed_count:
+            return None
+        if self._solver is None:
+            # 처음 한 번만 프런티어 전체를 만들고, 이후에는 _open에서 증분 갱신
+            self._solver = FrontierSolver(self.board, self.revealed, self.rows, self.cols)
+        found = self._solver.solve(self.flagged)
+        return min(found) if found else None
+
+    def hint(self, rng=random):
+        """
+        공개되지 않은 안전한 칸 1개를 연다. (열린 칸 인덱스, 바뀐 칸 목록, 증명 여부)를
+        반환하고 열 칸이 없으면 None. 보이는 숫자로 증명되는 칸을 먼저 고르고,
+        추론할 수 없을 때만 숨겨진 보드에서 임의의 안전한 칸을 고른다.
+        """
+        if self.finished:
+            return None
+        if self.first_click is None:
+            # 첫 수가 힌트이면 깃발이 없는 임의의 칸을 첫 클릭 위치로 삼아 보드 생성
+            candidates = [i for i, f in enumerate(self.flagged) if not f]
+            if not candidates:
+                return None
+            self.ensure_board(rng.choice(candidates))
+
+        index = self.safe_cell()
+        proven = index is not None
+        if not proven:
+            board, revealed, flagged = self.board, self.revealed, self.flagged
+            safe_cells = [
+                i for i in range(self.size)
+                if not revealed[i] and not flagged[i] and board[i] != MINE
+            ]
+            if not safe_cells:
+                return None
+            index = rng.choice(safe_cells)
+
+        # 열 칸이 정해진 뒤에만 시계를 시작한다 (None을 반환할 때는 상태를 바꾸지 않음)
+        self._start_clock()
+        changed = self.open_safe(index)
+        self._stop_clock_if_finished()
+        return index, changed, proven
+
+    # ----- 이동 기록 재생 -----
+
+    def logged_moves(self):
+        """이동 기록을 [(종류, 칸 인덱스)]로"""
+        return [(value & 7, value >> 3) for value in iter_varints(self.move_log)]
+
+    def initial_position(self):
+        """같은 설정과 시드로 첫 수 전 상태의 새 게임 (보드는 첫 클릭 칸으로 확정)"""
+        game = Game(self.rows, self.cols, self.mines, self.difficulty, self.game_id,
+                    self.no_guess, self.seed)
+        if self.first_click is not None:
+            game.ensure_board(self.first_click)
+        return game
+
+    def replay_move(self, kind, index):
+        """이동 기록 항목 하나를 다시 적용하고 바뀐 칸 목록을 반환"""
+        row, col = divmod(index, self.cols)
+        if kind == LOG_REVEAL:
+            return self.reveal(row, col)
+        if kind == LOG_FLAG or kind == LOG_UNFLAG:
+            return self.set_flag(row, col, kind == LOG_FLAG)
+        if kind == LOG_CHORD:
+            return self.chord(row, col)
+        if kind == LOG_OPEN:
+            if self.finished or self.revealed[index]:
+                return []
+            changed = self.open_safe(index)
+            self._stop_clock_if_finished()
+            return changed
+        raise ValueError(f'알 수 없는 이동 기록 항목입니다: {kind}')
@@ -0,0 +1,248 @@
+"""
+노게스(no-guess) 보드 팩토리
+
+노게스 보드는 시작 칸을 연 뒤 보이는 숫자만으로(solver.FrontierSolver) 끝까지
+풀리는 것이 검증된 보드다. 검증은 보드를 여러 장 만들어 풀어 보는 CPU 작업이라
+요청 안에서 하지 않고, 프로세스 풀 워커가 프리셋 크기의 (rows, cols, mines, 시작 칸)
+조합별로 depth장까지 미리 만들어 둔다. new_game은 준비된 보드를 deque에서 꺼내기만 하고,
+없으면 워커에 만들기를 맡긴 뒤 바로 None을 돌려준다 (뷰는 503).
+커스텀 크기는 조합이 끝없이 늘 수 있으므로 max_cells칸까지만 받고, 최근에 요청된
+MAX_CUSTOM_SIZES개 조합만 요청이 올 때 한 장씩 만든다 (디스크에는 내리지 않는다).
+보드는 (시드, 시작 칸)으로 다시 만들 수 있으므로 워커는 검증을 통과한 시드만
+돌려주고, 대기열과 디스크에도 보드당 8바이트 시드만 둔다.
+
+준비된 시드는 프로세스 종료 시 spill_dir에 파일로 내려 두고, 다음에 같은 조합을
+처음 요청할 때 다시 읽어 들인다 (다른 프로세스가 먼저 가져가면 그쪽이 쓴다).
+"""
+import atexit
+import os
+import random
+import tempfile
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+from .engine import Game
+from .generation import seeded_board
+
+DEFAULT_OPTIONS = {
+    'depth': 4,              # 조합별로 미리 준비해 둘 보드 수
+    'workers': 1,            # 프로세스 풀 워커 수 (0이면 프로세스 안의 스레드 하나에서 생성)
+    'attempts': 200,         # 워커 작업 하나가 검증을 시도할 보드 수
+    'max_cells': 100 * 100,  # 커스텀 크기 노게스 보드의 최대 칸 수
+    'spill_dir': os.path.join(tempfile.gettempdir(), 'minesweeper-boards'),
+}
+
+# 준비해 두는 커스텀 크기 조합 수 (초과하면 오래 요청되지 않은 조합부터 버린다)
+MAX_CUSTOM_SIZES = 16
+
+
+def start_index(rows, cols):
+    """노게스 게임의 시작 칸 (보드 중앙)"""
+    return (rows // 2) * cols + cols // 2
+
+
+def is_no_guess(board, rows, cols, mines, start):
+    """start를 연 뒤 증명된 안전 칸만 열어서 이길 수 있는지"""
+    game = Game(rows, cols, mines)
+    game.place_board(board, start)
+    while not game.won:
+        index = game.safe_cell()
+        if index is None:
+            return False
+        game.reveal(*divmod(index, cols))
+    return True
+
+
+def generate_no_guess(rows, cols, mines, start, attempts, seed=None):
+    """
+    검증을 통과한 보드의 시드를 반환. attempts장 안에 찾지 못하면 None.
+    seed는 후보 시드를 뽑는 난수열의 시드 (None이면 예측할 수 없는 난수원)
+    """
+    rng = random.Random(seed) if seed is not None else random.SystemRandom()
+    for _ in range(attempts):
+        board_seed = rng.getrandbits(63)
+        board = seeded_board(rows, cols, mines, board_seed, start)
+        if is_no_guess(board, rows, cols, mines, start):
+            return board_seed
+    return None
+
+
+class BoardFactory:
+    def __init__(self, presets, depth=DEFAULT_OPTIONS['depth'], workers=DEFAULT_OPTIONS['workers'],
+                 attempts=DEFAULT_OPTIONS['attempts'], max_cells=DEFAULT_OPTIONS['max_cells'],
+                 spill_dir=DEFAULT_OPTIONS['spill_dir']):
+        # 미리 만들어 두는 크기 (프리셋만)
+        self.sizes = {(p['rows'], p['cols'], p['mines']) for p in presets.values()}
+        self.depth = depth
+        self.workers = workers
+        self.attempts = attempts
+        self.max_cells = max_cells
+        self.spill_dir = Path(spill_dir) if spill_dir else None
+        self._ready = {}      # (rows, cols, mines, start) -> deque[시드]
+        self._pending = {}    # (rows, cols, mines, start) -> 진행 중인 워커 작업 수
+        self._custom = OrderedDict()   # 준비 중인 커스텀 조합, 오래 요청되지 않은 순
+        self._lock = threading.Lock()
+        self._executor = None
+        atexit.register(self.shutdown)
+
+    # ----- 조회 -----
+
+    def pop(self, rows, cols, mines):
+        """
+        준비된 노게스 보드의 시드와 시작 칸을 반환. 준비된 보드가 없으면 (None, start)를
+        바로 반환한다 (검증은 요청 안에서 하지 않음). 꺼낸 조합은 백그라운드에서 다시 채운다.
+        max_cells칸보다 큰 커스텀 크기는 ValueError
+        """
+        start = start_index(rows, cols)
+        key = (rows, cols, mines, start)
+        if not self.is_preset(key):
+            if rows * cols > self.max_cells:
+                raise ValueError(f'노게스 보드는 {self.max_cells}칸까지 만들 수 있습니다.')
+            self._remember_custom(key)
+        with self._lock:
+            ready = self._ready.get(key)
+            if ready is None:
+                ready = self._ready[key] = self._load_spill(key)
+            seed = ready.popleft() if ready else None
+        self.refill(key)
+        return seed, start
+
+    def is_preset(self, key):
+        return key[:3] in self.sizes
+
+    def _remember_custom(self, key):
+        with self._lock:
+            self._custom[key] = None
+            self._custom.move_to_end(key)
+            while len(self._custom) > MAX_CUSTOM_SIZES:
+                old, _ = self._custom.popitem(last=False)
+                self._ready.pop(old, None)
+
+    def ready_count(self, rows, cols, mines):
+        ready = self._ready.get((rows, cols, mines, start_index(rows, cols)))
+        return len(ready) if ready else 0
+
+    # ----- 채우기 -----
+
+    def _get_executor(self):
+        if self._executor is None:
+            try:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers) if self.workers else None
+            except (OSError, NotImplementedError):
+                self._executor = None
+            if self._executor is None:
+                # 프로세스를 만들 수 없는 환경(서버리스 등): 스레드 하나에서 만든다 (요청은 기다리지 않음)
+                self._executor = ThreadPoolExecutor(max_workers=1)
+        return self._executor
+
+    def refill(self, key):
+        """key 조합의 준비 보드 + 진행 중 작업이 depth(커스텀 크기는 1)가 되도록 워커 작업을 넣는다"""
+        executor = self._get_executor()
+        depth = self.depth if self.is_preset(key) else 1
+        with self._lock:
+            ready = self._ready.setdefault(key, deque())
+            missing = depth - len(ready) - self._pending.get(key, 0)
+            if missing <= 0:
+                return
+            self._pending[key] = self._pending.get(key, 0) + missing
+        for _ in range(missing):
+            try:
+                future = executor.submit(generate_no_guess, *key, self.attempts)
+            except RuntimeError:
+                # 종료 중인 풀
+                with self._lock:
+                    self._pending[key] -= 1
+                continue
+            future.add_done_callback(partial(self._done, key))
+
+    def _done(self, key, future):
+        seed = None
+        if not future.cancelled() and future.exception() is None:
+            seed = future.result()
+        with self._lock:
+            self._pending[key] -= 1
+            if not self.is_preset(key) and key not in self._custom:
+                # 그 사이 밀려난 커스텀 조합
+                if not self._pending[key]:
+                    del self._pending[key]
+                return
+            ready = self._ready.setdefault(key, deque())
+            if seed is None:
+                # 시도 횟수 안에 찾지 못한 조합: 다음 pop 때 다시 채운다
+                return
+            if len(ready) < (self.depth if self.is_preset(key) else 1):
+                ready.append(seed)
+                return
+        self._spill(key, [seed])
+
+    # ----- 디스크 보관 -----
+
+    def _spill_path(self, key):
+        rows, cols, mines, start = key
+        return self.spill_dir / f'{rows}x{cols}x{mines}@{start}.seeds'
+
+    def _spill(self, key, seeds):
+        if self.spill_dir is None or not seeds or not self.is_preset(key):
+            return
+        try:
+            self.spill_dir.mkdir(parents=True, exist_ok=True)
+            with open(self._spill_path(key), 'ab') as f:
+                f.write(b''.join(seed.to_bytes(8, 'little') for seed in seeds))
+        except OSError:
+            pass
+
+    def _load_spill(self, key):
+        """디스크에 내려 둔 시드를 가져온다. 파일 이름을 바꿔 선점하므로 한 프로세스만 읽는다"""
+        ready = deque()
+        if self.spill_dir is None or not self.is_preset(key):
+            return ready
+        path = self._spill_path(key)
+        claimed = path.with_name(f'{path.name}.{os.getpid()}')
+        try:
+            os.replace(path, claimed)
+            data = claimed.read_bytes()
+            claimed.unlink()
+        except OSError:
+            return ready
+        seeds = [int.from_bytes(data[i:i + 8], 'little') for i in range(0, len(data) - 7, 8)]
+        ready.extend(seeds[:self.depth])
+        self._spill(key, seeds[self.depth:])
+        return ready
+
+    def shutdown(self):
+        """준비된 시드를 디스크에 내리고 워커를 정리"""
+        with self._lock:
+            ready, self._ready = self._ready, {}
+        for key, seeds in ready.items():
+            self._spill(key, list(seeds))
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        self._executor = None
+
+
+_factory = None
+
+
+def get_factory(presets):
+    """설정된 노게스 보드 팩토리 (프로세스당 하나)"""
+    global _factory
+    if _factory is None:
+        options = {**DEFAULT_OPTIONS, **settings.MINESWEEPER_BOARD_FACTORY}
+        _factory = BoardFactory(presets, **options)
+    return _factory
+
+
+@receiver(setting_changed)
+def _reset_factory(setting, **kwargs):
+    global _factory
+    if setting == 'MINESWEEPER_BOARD_FACTORY':
+        if _factory is not None:
+            _factory.shutdown()
+        _factory = None
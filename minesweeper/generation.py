@@ -0,0 +1,205 @@
+"""
+보드 생성: 지뢰 배치(비복원 추출)와 주변 지뢰 수 계산
+
+지뢰는 random.sample로 한 번에 뽑고, 밀도가 절반을 넘으면 안전 칸을 대신 뽑는다.
+주변 지뢰 수는 NumPy가 있으면 배열 이동 합으로, 없으면 보드 전체를 큰 정수
+하나로 보고 바이트 단위 시프트 합으로 계산한다. 두 경로 모두 칸 단위 파이썬
+루프가 없다.
+
+게임 보드는 시드 하나로 정해진다: 시드로 지뢰를 배치한 기본 보드에서, 첫 클릭
+안전 영역의 지뢰를 (시드, 첫 클릭 칸)으로 정해지는 난수열로 옮긴다(seeded_board).
+같은 시드와 첫 클릭이면 어디서 다시 만들어도 같은 보드가 된다.
+"""
+import random
+from itertools import compress
+
+from .codec import MINE
+
+try:
+    import numpy as np
+except ImportError:
+    # NumPy 미설치 환경(Vercel 등)에서는 순수 파이썬 경로 사용
+    np = None
+
+# 시프트 합 결과(주변 수 + 지뢰면 16)를 보드 값으로 바꾸는 변환표
+_SHIFTED_TO_BOARD = bytes(v if v < 16 else MINE for v in range(256))
+_IS_MINE = bytes(1 if v == MINE else 0 for v in range(256))
+_IS_EMPTY = bytes(0 if v == MINE else 1 for v in range(256))
+
+
+def neighbor_indices(index, rows, cols):
+    """index 칸의 주변 8칸 인덱스 목록"""
+    r, c = divmod(index, cols)
+    result = []
+    for nr in range(r - 1 if r > 0 else 0, min(r + 2, rows)):
+        for nc in range(c - 1 if c > 0 else 0, min(c + 2, cols)):
+            if nr != r or nc != c:
+                result.append(nr * cols + nc)
+    return result
+
+
+def safe_zone(index, rows, cols):
+    """첫 클릭 칸과 주변 3x3 영역 인덱스 목록"""
+    return [index] + neighbor_indices(index, rows, cols)
+
+
+def start_zone(index, rows, cols, mines):
+    """첫 클릭 때 비워 둘 칸. 지뢰가 너무 많으면 클릭한 칸만 비운다"""
+    zone = safe_zone(index, rows, cols)
+    if mines > rows * cols - len(zone):
+        zone = [index]
+    return zone
+
+
+def place_mines(rows, cols, mines, exclude=(), rng=random):
+    """exclude를 제외한 칸에서 지뢰 mines개를 비복원 추출한 0/1 마스크"""
+    size = rows * cols
+    excluded = sorted(set(exclude))
+    free = size - len(excluded)
+    if not 0 <= mines <= free:
+        raise ValueError(f'지뢰 {mines}개를 {free}칸에 배치할 수 없습니다.')
+
+    if mines * 2 <= free:
+        mask = bytearray(free)
+        for k in rng.sample(range(free), mines):
+            mask[k] = 1
+    else:
+        # 고밀도: 뽑는 개수가 적은 안전 칸 쪽을 추출
+        mask = bytearray(b'\x01') * free
+        for k in rng.sample(range(free), free - mines):
+            mask[k] = 0
+
+    # 제외 칸을 0으로 끼워 넣어 보드 좌표에 맞춘다 (오름차순이라 위치가 밀리지 않음)
+    for index in excluded:
+        mask.insert(index, 0)
+    return mask
+
+
+def count_neighbors_numpy(mask, rows, cols):
+    grid = np.frombuffer(bytes(mask), dtype=np.uint8).reshape(rows, cols)
+    padded = np.pad(grid, 1)
+    counts = np.zeros((rows, cols), dtype=np.uint8)
+    for dr in range(3):
+        for dc in range(3):
+            counts += padded[dr:dr + rows, dc:dc + cols]
+    counts[grid == 1] = MINE
+    return bytearray(counts.tobytes())
+
+
+def count_neighbors_pure(mask, rows, cols):
+    # 테두리 0 한 줄씩을 두른 보드를 빅엔디언 정수로 보면, 바이트 한 칸 시프트는
+    # 좌우 이동, width 바이트 시프트는 위아래 이동이 된다. 칸 값이 최대 25라
+    # 덧셈에서 자리올림이 생기지 않는다.
+    width = cols + 2
+    blank = bytes(width)
+    padded = b''.join(
+        [blank]
+        + [b'\x00' + mask[r * cols:(r + 1) * cols] + b'\x00' for r in range(rows)]
+        + [blank]
+    )
+    m = int.from_bytes(padded, 'big')
+    h = m + (m << 8) + (m >> 8)
+    v = h + (h << (8 * width)) + (h >> (8 * width)) + (m << 4)
+    raw = v.to_bytes(len(padded), 'big')
+
+    board = bytearray(b''.join(
+        raw[r * width + 1:r * width + 1 + cols] for r in range(1, rows + 1)
+    ))
+    return bytearray(board.translate(_SHIFTED_TO_BOARD))
+
+
+def count_neighbors(mask, rows, cols):
+    """지뢰 마스크로 보드(0~8 = 주변 지뢰 수, MINE = 지뢰) 계산"""
+    if np is not None:
+        return count_neighbors_numpy(mask, rows, cols)
+    return count_neighbors_pure(mask, rows, cols)
+
+
+def generate_board(rows, cols, mines, exclude=(), rng=random):
+    return count_neighbors(place_mines(rows, cols, mines, exclude, rng), rows, cols)
+
+
+def new_seed():
+    """새 게임 시드 (63비트). 끝난 게임의 시드가 공개되므로 예측할 수 없는 난수원을 쓴다"""
+    return random.SystemRandom().getrandbits(63)
+
+
+def base_board(rows, cols, mines, seed):
+    """시드로 지뢰를 배치한 보드 (첫 클릭 전, 프리셋 풀에 미리 만들어 두는 형태)"""
+    return generate_board(rows, cols, mines, rng=random.Random(seed))
+
+
+def clear_start(board, rows, cols, mines, seed, start):
+    """base_board의 첫 클릭 안전 영역을 비운다. (시드, 첫 클릭)으로 정해지는 난수열 사용"""
+    zone = start_zone(start, rows, cols, mines)
+    return relocate_mines(board, rows, cols, zone, random.Random(f'{seed}:{start}'))
+
+
+def seeded_board(rows, cols, mines, seed, start):
+    """시드와 첫 클릭 칸으로 정해지는 게임 보드"""
+    board = base_board(rows, cols, mines, seed)
+    clear_start(board, rows, cols, mines, seed, start)
+    return board
+
+
+def mine_indices(board):
+    """보드의 지뢰 칸 인덱스 목록"""
+    return list(compress(range(len(board)), board.translate(_IS_MINE)))
+
+
+def _remove_mine(board, index, rows, cols):
+    around = neighbor_indices(index, rows, cols)
+    count = 0
+    for i in around:
+        if board[i] == MINE:
+            count += 1
+        else:
+            board[i] -= 1
+    board[index] = count
+
+
+def _add_mine(board, index, rows, cols):
+    for i in neighbor_indices(index, rows, cols):
+        if board[i] != MINE:
+            board[i] += 1
+    board[index] = MINE
+
+
+def relocate_mines(board, rows, cols, safe, rng=random):
+    """
+    safe 칸의 지뢰를 safe 밖의 빈 칸으로 옮긴다. 주변 수는 옮긴 칸 주위만 갱신.
+    safe[0](클릭한 칸)을 가장 먼저 비우고, 밖에 빈 칸이 없으면 safe 안의 빈 칸으로라도 옮긴다.
+    """
+    safe_set = set(safe)
+    to_move = [i for i in safe if board[i] == MINE]
+    if not to_move:
+        return []
+
+    size = rows * cols
+    outside_free = size - board.count(MINE) - sum(1 for i in safe_set if board[i] != MINE)
+    if outside_free >= len(to_move) and outside_free * 4 >= size:
+        # 빈 칸이 충분하면 재시도 추출이 전체 스캔보다 빠르다
+        targets = []
+        chosen = set()
+        while len(targets) < len(to_move):
+            i = rng.randrange(size)
+            if board[i] != MINE and i not in safe_set and i not in chosen:
+                chosen.add(i)
+                targets.append(i)
+    else:
+        candidates = [
+            i for i in compress(range(size), board.translate(_IS_EMPTY))
+            if i not in safe_set
+        ]
+        targets = rng.sample(candidates, min(len(candidates), len(to_move)))
+        if not targets and to_move[0] == safe[0]:
+            # 밖에 빈 칸이 없으면 클릭한 칸만이라도 safe 안쪽 빈 칸과 바꾼다
+            inner = [i for i in safe[1:] if board[i] != MINE]
+            targets = inner[:1]
+
+    moved = []
+    for old, new in zip(to_move, targets):
+        _remove_mine(board, old, rows, cols)
+        _add_mine(board, new, rows, cols)
+        moved.append((old, new))
+    return moved
@@ -0,0 +1,211 @@
+"""
+대량 오프라인 게임 시뮬레이션
+
+뷰를 거치지 않고 엔진(engine.Game)으로 게임을 끝까지 둔다. 설정(프리셋/커스텀
+크기)별 게임을 chunk판씩 작업으로 나눠 프로세스 풀에 돌리고, 작업마다 집계
+한 줄만 돌려받아 CSV/JSON Lines로 바로 흘려 쓴다 (게임별 결과는 메모리에 두지 않음).
+작업 시드는 (기준 시드, 설정, 작업 번호)로 정해지므로 같은 옵션이면 결과가 같다.
+
+    python manage.py simulate --games 100000
+    python manage.py simulate --games 1000000 --workers 8 --output results.csv
+    python manage.py simulate --size 30x16x99 --strategy random --format json --output -
+"""
+import csv
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from django.core.management.base import BaseCommand, CommandError
+
+from minesweeper.engine import Game
+
+STRATEGIES = ('solver', 'random')
+FIELDS = (
+    'config', 'rows', 'cols', 'mines', 'density', 'chunk', 'games', 'wins',
+    'first_click_losses', 'proven_moves', 'guesses', 'no_guess_wins', 'seconds',
+)
+
+
+def random_hidden(game, rng):
+    """열리지 않은 칸 하나 (재시도 추출 후 실패하면 전체 스캔)"""
+    revealed, size = game.revealed, game.size
+    for _ in range(32):
+        index = rng.randrange(size)
+        if not revealed[index]:
+            return index
+    return rng.choice([i for i in range(size) if not revealed[i]])
+
+
+def play_game(rows, cols, mines, strategy, rng):
+    """
+    게임 한 판. (승리, 첫 클릭 패배, 증명된 수, 찍은 수)를 반환.
+    solver 전략은 보이는 숫자로 증명되는 칸(Game.safe_cell, 힌트와 같은 추론)이 있으면 열고,
+    없을 때만 임의의 칸을 찍는다. random 전략은 매번 찍는다
+    """
+    game = Game(rows, cols, mines, seed=rng.getrandbits(63))
+    game.reveal(*divmod(rng.randrange(game.size), cols))
+    if game.game_over:
+        return False, True, 0, 1
+    proven = guesses = 0
+    while not game.finished:
+        index = game.safe_cell() if strategy == 'solver' else None
+        if index is None:
+            index = random_hidden(game, rng)
+            guesses += 1
+        else:
+            proven += 1
+        game.reveal(*divmod(index, cols))
+    return game.won, False, proven, guesses
+
+
+def run_chunk(config, rows, cols, mines, strategy, seed, chunk, games):
+    """작업 하나: games판을 두고 집계 한 줄(dict)을 반환 (프로세스 풀 워커에서 실행)"""
+    rng = random.Random(f'{seed}:{config}:{chunk}')
+    started = time.perf_counter()
+    wins = first_click_losses = proven_moves = guesses = no_guess_wins = 0
+    for _ in range(games):
+        won, first_loss, proven, guessed = play_game(rows, cols, mines, strategy, rng)
+        wins += won
+        first_click_losses += first_loss
+        proven_moves += proven
+        guesses += guessed
+        no_guess_wins += won and guessed == 0
+    return {
+        'config': config,
+        'rows': rows,
+        'cols': cols,
+        'mines': mines,
+        'density': round(mines / (rows * cols), 4),
+        'chunk': chunk,
+        'games': games,
+        'wins': wins,
+        'first_click_losses': first_click_losses,
+        'proven_moves': proven_moves,
+        'guesses': guesses,
+        'no_guess_wins': no_guess_wins,
+        'seconds': round(time.perf_counter() - started, 4),
+    }
+
+
+def parse_size(value):
+    try:
+        rows, cols, mines = (int(part) for part in value.lower().split('x'))
+    except ValueError:
+        raise CommandError(f'크기는 ROWSxCOLSxMINES 형식이어야 합니다: {value}')
+    try:
+        Game(rows, cols, mines)
+    except ValueError as e:
+        raise CommandError(f'만들 수 없는 보드입니다: {value} ({e})')
+    return f'{rows}x{cols}x{mines}', rows, cols, mines
+
+
+class Command(BaseCommand):
+    help = '엔진으로 게임을 대량으로 두고 설정별 승률/첫 클릭 안전/힌트 효과를 집계합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--games', type=int, default=10000, help='설정별 게임 수')
+        parser.add_argument('--difficulty', action='append', default=[],
+                            help='프리셋 이름 (여러 번 지정 가능, 기본: --size가 없으면 모든 프리셋)')
+        parser.add_argument('--size', action='append', default=[],
+                            help='커스텀 크기 ROWSxCOLSxMINES (여러 번 지정 가능)')
+        parser.add_argument('--strategy', choices=STRATEGIES, default='solver')
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                            help='프로세스 풀 워커 수 (0이면 현재 프로세스에서 실행)')
+        parser.add_argument('--chunk', type=int, default=500, help='작업 하나가 두는 게임 수')
+        parser.add_argument('--seed', type=int, default=0, help='작업 시드의 기준값')
+        parser.add_argument('--output', help='작업별 집계를 쓸 파일 (- 는 표준 출력)')
+        parser.add_argument('--format', choices=('csv', 'json'), default=None,
+                            help='출력 형식 (기본: 확장자로 판단, 없으면 csv). json은 줄마다 객체 하나')
+
+    def handle(self, *args, **options):
+        from minesweeper.views import DIFFICULTY_SETTINGS
+
+        configs = [parse_size(value) for value in options['size']]
+        names = options['difficulty'] or ([] if configs else list(DIFFICULTY_SETTINGS))
+        for name in names:
+            if name not in DIFFICULTY_SETTINGS:
+                raise CommandError(f'알 수 없는 프리셋입니다: {name}')
+            preset = DIFFICULTY_SETTINGS[name]
+            configs.append((name, preset['rows'], preset['cols'], preset['mines']))
+        if options['games'] < 1 or options['chunk'] < 1:
+            raise CommandError('--games와 --chunk는 1 이상이어야 합니다.')
+
+        tasks = []
+        for config, rows, cols, mines in configs:
+            for chunk, start in enumerate(range(0, options['games'], options['chunk'])):
+                games = min(options['chunk'], options['games'] - start)
+                tasks.append((config, rows, cols, mines, options['strategy'], options['seed'], chunk, games))
+
+        writer, close = self.open_output(options['output'], options['format'])
+        totals = {}
+        started = time.perf_counter()
+        try:
+            for row in self.run(tasks, options['workers']):
+                writer(row)
+                self.merge(totals, row)
+        finally:
+            close()
+        elapsed = time.perf_counter() - started
+        self.report(totals, elapsed)
+
+    def run(self, tasks, workers):
+        """작업 집계를 끝나는 대로 내준다. 대기 중인 작업은 워커 수의 4배까지만 넣어 둔다"""
+        if not workers:
+            for task in tasks:
+                yield run_chunk(*task)
+            return
+        pending = set()
+        queue = iter(tasks)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for task in queue:
+                pending.add(executor.submit(run_chunk, *task))
+                if len(pending) >= workers * 4:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+            for future in pending:
+                yield future.result()
+
+    def open_output(self, path, fmt):
+        """(행 하나를 쓰는 함수, 닫는 함수)"""
+        if not path:
+            return (lambda row: None), (lambda: None)
+        fmt = fmt or ('json' if path.endswith(('.json', '.jsonl')) else 'csv')
+        stream = sys.stdout if path == '-' else open(path, 'w', newline='')
+        close = (lambda: stream.flush()) if path == '-' else stream.close
+        if fmt == 'json':
+            return (lambda row: stream.write(json.dumps(row) + '\n')), close
+        writer = csv.DictWriter(stream, fieldnames=FIELDS)
+        writer.writeheader()
+        return writer.writerow, close
+
+    @staticmethod
+    def merge(totals, row):
+        total = totals.setdefault(row['config'], dict.fromkeys(
+            ('games', 'wins', 'first_click_losses', 'proven_moves', 'guesses', 'no_guess_wins'), 0,
+        ))
+        for key in total:
+            total[key] += row[key]
+        total['density'] = row['density']
+
+    def report(self, totals, elapsed):
+        games = sum(total['games'] for total in totals.values())
+        self.stderr.write(
+            f'{"config":<14}{"density":>9}{"games":>10}{"win":>8}{"1st-loss":>10}'
+            f'{"guess/g":>9}{"proven":>8}{"no-guess":>10}'
+        )
+        for config, total in totals.items():
+            n = total['games']
+            moves = total['proven_moves'] + total['guesses']
+            self.stderr.write(
+                f'{config:<14}{total["density"]:>9.3f}{n:>10}'
+                f'{total["wins"] / n:>8.1%}{total["first_click_losses"] / n:>10.2%}'
+                f'{total["guesses"] / n:>9.2f}{(total["proven_moves"] / moves if moves else 0):>8.1%}'
+                f'{total["no_guess_wins"] / n:>10.1%}'
+            )
+        self.stderr.write(self.style.SUCCESS(
+            f'{games}판 / {elapsed:.2f}초 = {games / elapsed:,.0f} games/s'
+        ))
@@ -0,0 +1,158 @@
+"""
+요청/엔진 계측과 Prometheus 텍스트 노출
+
+MINESWEEPER_METRICS가 켜져 있을 때만 동작한다.
+- MetricsMiddleware: 뷰(url_name)별 지연 시간, 응답 본문 크기, 세션 쿠키 크기
+- 엔진 훅(engine.hooks): 한 번 열기로 공개된 칸 수, 0 영역 공개(flood fill) 크기,
+  보드 생성 시간
+- 프리셋 풀: 적중/실패 횟수와 준비된 보드 수 (노출할 때 pool.stats()를 읽는다)
+꺼져 있으면 미들웨어는 MiddlewareNotUsed로 빠지고 엔진은 None 검사 한 번만 한다.
+값은 프로세스별로 모이므로 워커가 여럿이면 Prometheus가 워커마다 수집해야 한다.
+"""
+import bisect
+import threading
+import time
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+from . import engine
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+BYTES_BUCKETS = tuple(64 * 4 ** k for k in range(10))        # 64B ~ 16MB
+CELLS_BUCKETS = tuple(2 ** k for k in range(0, 21, 2))       # 1 ~ 1M칸
+
+# 이름 -> (도움말, 구간 상한)
+HISTOGRAMS = {
+    'minesweeper_request_seconds': ('뷰별 요청 처리 시간', LATENCY_BUCKETS),
+    'minesweeper_response_bytes': ('뷰별 응답 본문 크기', BYTES_BUCKETS),
+    'minesweeper_session_cookie_bytes': ('응답에 실린 세션 쿠키 크기', BYTES_BUCKETS),
+    'minesweeper_reveal_cells': ('열기 한 번에 공개된 칸 수', CELLS_BUCKETS),
+    'minesweeper_flood_cells': ('0 영역 공개 한 번의 크기', CELLS_BUCKETS),
+    'minesweeper_generation_seconds': ('보드 생성 시간', LATENCY_BUCKETS),
+}
+
+
+# 프리셋 풀(pool.py) 상태: 이름 -> (종류, stats() 키, 도움말)
+POOL_METRICS = {
+    'minesweeper_pool_hits_total': ('counter', 'hits', '프리셋 풀에서 준비된 보드를 꺼낸 횟수'),
+    'minesweeper_pool_misses_total': ('counter', 'misses', '프리셋 풀이 비어 요청 안에서 보드를 만든 횟수'),
+    'minesweeper_pool_ready': ('gauge', 'ready', '프리셋 풀에 준비된 보드 수'),
+}
+
+
+class Histogram:
+    """누적 구간 없이 구간별 개수만 들고 있다가 노출할 때 누적한다"""
+
+    __slots__ = ('bounds', 'counts', 'total', 'count')
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.total += value
+        self.count += 1
+
+
+class Registry:
+    def __init__(self):
+        self._series = {}   # (이름, 라벨 튜플) -> Histogram
+        self._lock = threading.Lock()
+
+    def observe(self, name, value, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = Histogram(HISTOGRAMS[name][1])
+            series.observe(value)
+
+    def render(self):
+        """Prometheus 텍스트 형식 (0.0.4)"""
+        with self._lock:
+            items = sorted(
+                (key, list(h.counts), h.total, h.count) for key, h in self._series.items()
+            )
+        lines = []
+        for name, (help_text, bounds) in HISTOGRAMS.items():
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} histogram')
+            for (series_name, labels), counts, total, count in items:
+                if series_name != name:
+                    continue
+                label_text = ','.join(f'{k}="{v}"' for k, v in labels)
+                prefix = label_text + ',' if label_text else ''
+                cumulative = 0
+                for bound, n in zip(bounds, counts):
+                    cumulative += n
+                    lines.append(f'{name}_bucket{{{prefix}le="{bound}"}} {cumulative}')
+                lines.append(f'{name}_bucket{{{prefix}le="+Inf"}} {count}')
+                suffix = f'{{{label_text}}}' if label_text else ''
+                lines.append(f'{name}_sum{suffix} {total}')
+                lines.append(f'{name}_count{suffix} {count}')
+        return '\n'.join(lines) + '\n'
+
+
+def render_pool(stats):
+    """PresetPool.stats()를 Prometheus 텍스트로 (프리셋별 라벨)"""
+    lines = []
+    for name, (kind, key, help_text) in POOL_METRICS.items():
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+        for preset, values in stats.items():
+            lines.append(f'{name}{{preset="{preset}"}} {values[key]}')
+    return '\n'.join(lines) + '\n'
+
+
+_registry = None
+
+
+def get_registry():
+    """계측 레지스트리 (프로세스당 하나). 꺼져 있으면 None"""
+    global _registry
+    if _registry is None and settings.MINESWEEPER_METRICS:
+        _registry = Registry()
+        # 엔진은 Django를 모르므로 observe(이름, 값)만 호출한다
+        engine.hooks = _registry
+    return _registry
+
+
+@receiver(setting_changed)
+def _reset_registry(setting, **kwargs):
+    global _registry
+    if setting == 'MINESWEEPER_METRICS':
+        _registry = None
+        engine.hooks = None
+
+
+class MetricsMiddleware:
+    """뷰별 지연 시간/응답 크기/세션 쿠키 크기. MIDDLEWARE 맨 앞에 둔다"""
+
+    def __init__(self, get_response):
+        self.registry = get_registry()
+        if self.registry is None:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        started = time.perf_counter()
+        response = self.get_response(request)
+        elapsed = time.perf_counter() - started
+
+        match = request.resolver_match
+        view = match.url_name if match is not None and match.url_name else 'unmatched'
+        observe = self.registry.observe
+        observe('minesweeper_request_seconds', elapsed, view=view)
+        if not response.streaming:
+            observe('minesweeper_response_bytes', len(response.content), view=view)
+        cookie = response.cookies.get(settings.SESSION_COOKIE_NAME)
+        if cookie is not None and cookie.value:
+            observe('minesweeper_session_cookie_bytes', len(cookie.value), view=view)
+        return response
+
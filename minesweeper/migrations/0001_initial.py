@@ -0,0 +1,22 @@
+# Generated by Django 6.0.1 on 2026-10-18 01:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GameState',
+            fields=[
+                ('game_id', models.CharField(max_length=36, primary_key=True, serialize=False)),
+                ('data', models.TextField()),
+                ('updated_at', models.DateTimeField(auto_now=True, db_index=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 6.0.1 on 2026-10-18 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('minesweeper', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DifficultyStats',
+            fields=[
+                ('category', models.CharField(max_length=40, primary_key=True, serialize=False)),
+                ('games', models.PositiveIntegerField(default=0)),
+                ('wins', models.PositiveIntegerField(default=0)),
+                ('total_win_time', models.FloatField(default=0)),
+                ('best_time', models.FloatField(null=True)),
+                ('histogram', models.JSONField(default=list)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='GameResult',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('game_id', models.CharField(max_length=36, unique=True)),
+                ('player_id', models.CharField(max_length=36)),
+                ('difficulty', models.CharField(max_length=20)),
+                ('no_guess', models.BooleanField(default=False)),
+                ('rows', models.PositiveSmallIntegerField()),
+                ('cols', models.PositiveSmallIntegerField()),
+                ('mines', models.PositiveIntegerField()),
+                ('won', models.BooleanField()),
+                ('duration', models.FloatField()),
+                ('revealed_count', models.PositiveIntegerField()),
+                ('finished_at', models.DateTimeField()),
+            ],
+            options={
+                'indexes': [models.Index(fields=['difficulty', 'no_guess', 'won', 'duration'], name='result_leaderboard_idx'), models.Index(fields=['difficulty', 'no_guess', '-finished_at'], name='result_recent_idx'), models.Index(fields=['player_id', '-finished_at'], name='result_player_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 6.0.1 on 2026-10-18 11:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('minesweeper', '0002_results'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='gameresult',
+            name='first_click',
+            field=models.PositiveIntegerField(null=True),
+        ),
+        migrations.AddField(
+            model_name='gameresult',
+            name='move_log',
+            field=models.BinaryField(default=b''),
+        ),
+        migrations.AddField(
+            model_name='gameresult',
+            name='seed',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='gameresult',
+            index=models.Index(fields=['seed', 'won', 'duration'], name='result_seed_idx'),
+        ),
+    ]
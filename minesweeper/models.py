@@ -1,3 +1,67 @@
 from django.db import models
 
-# Create your models here.
+
+class GameState(models.Model):
+    """database 게임 저장소 백엔드용: 압축된 게임 상태 (store.DatabaseGameStore)"""
+
+    game_id = models.CharField(max_length=36, primary_key=True)
+    data = models.TextField()
+    # 만료(버려진 게임) 정리용 인덱스
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    def __str__(self):
+        return self.game_id
+
+
+class GameResult(models.Model):
+    """끝난 게임 한 판의 기록 (승/패). 리더보드와 최근 기록 조회용"""
+
+    game_id = models.CharField(max_length=36, unique=True)
+    # 세션마다 발급하는 익명 플레이어 id
+    player_id = models.CharField(max_length=36)
+    difficulty = models.CharField(max_length=20)
+    no_guess = models.BooleanField(default=False)
+    rows = models.PositiveSmallIntegerField()
+    cols = models.PositiveSmallIntegerField()
+    mines = models.PositiveIntegerField()
+    won = models.BooleanField()
+    duration = models.FloatField()   # 초
+    revealed_count = models.PositiveIntegerField()
+    finished_at = models.DateTimeField()
+    # 리플레이/검증용: 보드 시드, 첫 클릭 칸, 이동 기록 (engine.Game.move_log)
+    seed = models.BigIntegerField(default=0)
+    first_click = models.PositiveIntegerField(null=True)
+    move_log = models.BinaryField(default=b'')
+
+    class Meta:
+        indexes = [
+            # 리더보드: 난이도별 승리 기록을 시간순으로
+            models.Index(fields=['difficulty', 'no_guess', 'won', 'duration'], name='result_leaderboard_idx'),
+            # 난이도별 최근 기록
+            models.Index(fields=['difficulty', 'no_guess', '-finished_at'], name='result_recent_idx'),
+            # 플레이어별 최근 기록
+            models.Index(fields=['player_id', '-finished_at'], name='result_player_idx'),
+            # 같은 보드(일일 도전)의 승리 기록을 시간순으로
+            models.Index(fields=['seed', 'won', 'duration'], name='result_seed_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.difficulty} {"win" if self.won else "loss"} {self.duration:.1f}s'
+
+
+class DifficultyStats(models.Model):
+    """
+    난이도별 누적 집계. 기록을 저장할 때마다 증분으로 갱신해 통계 조회에 전체 스캔이 없다.
+    승리 시간은 고정 구간 히스토그램으로 두고 백분위는 히스토그램에서 근사한다.
+    """
+
+    category = models.CharField(max_length=40, primary_key=True)   # 'hard', 'hard:no-guess' 등
+    games = models.PositiveIntegerField(default=0)
+    wins = models.PositiveIntegerField(default=0)
+    total_win_time = models.FloatField(default=0)
+    best_time = models.FloatField(null=True)
+    histogram = models.JSONField(default=list)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return self.category
@@ -0,0 +1,102 @@
+"""
+프리셋(easy/medium/hard) 보드 풀
+
+프리셋마다 새 시드로 미리 생성하고 0 영역 인덱스(ZeroRegions)까지 만들어 둔 보드를
+size장씩 들고 있다가 new_game에 내준다. 꺼내 쓴 만큼은 백그라운드 스레드가 다시 채운다.
+보드는 첫 클릭 위치를 모르는 채로 만들어지므로(generation.base_board), 첫 공개 때
+엔진이 안전 영역의 지뢰만 옮긴다. 옮긴 지뢰가 없으면 인덱스를 그대로 쓴다.
+"""
+import threading
+from collections import deque
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+from .generation import base_board, new_seed
+from .reveal import ZeroRegions
+
+DEFAULT_OPTIONS = {
+    'size': 8,   # 프리셋별로 준비해 둘 보드 수 (0이면 풀 사용 안 함)
+}
+
+
+class PresetPool:
+    def __init__(self, presets, size=DEFAULT_OPTIONS['size']):
+        self.presets = {
+            name: (preset['rows'], preset['cols'], preset['mines'])
+            for name, preset in presets.items()
+        }
+        self.size = size
+        # 프리셋별 적중(준비된 보드를 꺼냄)/실패(요청 안에서 생성) 횟수 (/metrics로 노출)
+        self.hits = dict.fromkeys(self.presets, 0)
+        self.misses = dict.fromkeys(self.presets, 0)
+        self._ready = {name: deque() for name in self.presets}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+
+    def take(self, name):
+        """준비된 (보드, 0 영역 인덱스, 시드)를 꺼낸다. 없으면 None (요청 쪽에서 기존 방식으로 생성)"""
+        ready = self._ready.get(name)
+        if ready is None or not self.size:
+            return None
+        try:
+            entry = ready.popleft()
+        except IndexError:
+            entry = None
+        with self._lock:
+            if entry is None:
+                self.misses[name] += 1
+            else:
+                self.hits[name] += 1
+            self._start()
+        self._wakeup.set()
+        return entry
+
+    def stats(self):
+        """프리셋별 {'hits', 'misses', 'ready'} (ready = 지금 준비된 보드 수)"""
+        with self._lock:
+            return {
+                name: {'hits': self.hits[name], 'misses': self.misses[name], 'ready': len(ready)}
+                for name, ready in self._ready.items()
+            }
+
+    def fill(self):
+        """모든 프리셋을 size장까지 채운다 (백그라운드 스레드 본체, 직접 호출해 예열 가능)"""
+        for name, (rows, cols, mines) in self.presets.items():
+            ready = self._ready[name]
+            while len(ready) < self.size:
+                seed = new_seed()
+                board = base_board(rows, cols, mines, seed)
+                ready.append((board, ZeroRegions(board, rows, cols), seed))
+
+    def _start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='minesweeper-preset-pool', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait()
+            self._wakeup.clear()
+            self.fill()
+
+
+_pool = None
+
+
+def get_pool(presets):
+    """프리셋 보드 풀 (프로세스당 하나)"""
+    global _pool
+    if _pool is None:
+        options = {**DEFAULT_OPTIONS, **settings.MINESWEEPER_PRESET_POOL}
+        _pool = PresetPool(presets, **options)
+    return _pool
+
+
+@receiver(setting_changed)
+def _reset_pool(setting, **kwargs):
+    global _pool
+    if setting == 'MINESWEEPER_PRESET_POOL':
+        _pool = None
@@ -0,0 +1,194 @@
+"""
+클라이언트와 주고받는 게임 데이터 형식
+
+HTTP 뷰와 WebSocket 채널(realtime.py)이 같은 수(move) 검증과 같은 응답 형태를
+쓰도록 전송 방식과 무관한 부분을 모아 둔다.
+"""
+import time
+
+from .codec import MINE
+from .engine import TILE_SIZE, Game, tile_grid
+
+# 일괄 이동에서 허용하는 동작 -> 엔진 호출
+MOVE_ACTIONS = {
+    'reveal': Game.reveal,
+    'flag': lambda game, row, col: game.set_flag(row, col, True),
+    'unflag': lambda game, row, col: game.set_flag(row, col, False),
+    'chord': Game.chord,
+}
+MAX_BATCH_MOVES = 500
+# delta에 칸 목록 대신 resync를 싣는 기준 (큰 보드의 넓은 공개)
+MAX_DELTA_CELLS = 5000
+# 타일 요청 하나에서 받을 수 있는 타일 수
+MAX_TILES = 256
+
+
+def _state_to_code(state):
+    value, revealed, flagged = state & 0x0F, state >> 4 & 1, state >> 5 & 1
+    if revealed and value <= MINE:
+        return ord('*') if value == MINE else ord('0') + value
+    return ord('F') if flagged else ord('?')
+
+
+# (보드 값 | 공개 << 4 | 깃발 << 5) 바이트 -> 칸 코드 글자
+_STATE_TO_CODE = bytes(_state_to_code(state) for state in range(256))
+
+
+def cell_codes(game, start=0, stop=None):
+    """
+    보이는 상태를 칸당 한 글자로 나타낸 바이트열 (인덱스 = row * cols + col, [start, stop) 구간).
+    '?' 닫힌 칸, 'F' 깃발, '0'~'8' 열린 숫자 칸, '*' 열린 지뢰.
+    그리드 세 개를 큰 정수 하나로 합쳐 변환표 한 번으로 만든다 (칸 단위 루프 없음).
+    """
+    if stop is None:
+        stop = game.size
+    if stop <= start:
+        return b''
+    state = (
+        int.from_bytes(game.revealed[start:stop], 'big') << 4
+        | int.from_bytes(game.flagged[start:stop], 'big') << 5
+    )
+    if game.board is not None:
+        state |= int.from_bytes(game.board[start:stop], 'big')
+    return state.to_bytes(stop - start, 'big').translate(_STATE_TO_CODE)
+
+
+def tile_payload(game, tile):
+    """타일 하나의 위치, 버전, 칸 코드 문자열 (행 우선)"""
+    tile_cols = tile_grid(game.rows, game.cols)[1]
+    row, col = (tile // tile_cols) * TILE_SIZE, (tile % tile_cols) * TILE_SIZE
+    height, width = min(TILE_SIZE, game.rows - row), min(TILE_SIZE, game.cols - col)
+    cols = game.cols
+    codes = b''.join(
+        cell_codes(game, r * cols + col, r * cols + col + width) for r in range(row, row + height)
+    )
+    return {
+        'id': tile,
+        'row': row,
+        'col': col,
+        'rows': height,
+        'cols': width,
+        'version': game.tile_versions[tile],
+        'cells': codes.decode('ascii'),
+    }
+
+
+def parse_tiles(game, query):
+    """
+    '3:17,4,5:0' 형식(타일 번호[:클라이언트가 가진 버전])을 [(타일, 버전)]으로.
+    버전이 없으면 -1 (무조건 보냄). 잘못된 형식이면 ValueError
+    """
+    tile_count = len(game.tile_versions)
+    wanted = []
+    for part in filter(None, query.split(',')):
+        tile, _, seen = part.partition(':')
+        tile, seen = int(tile), int(seen) if seen else -1
+        if not 0 <= tile < tile_count:
+            raise ValueError(f'보드 밖의 타일입니다: {tile}')
+        wanted.append((tile, seen))
+    if len(wanted) > MAX_TILES:
+        raise ValueError(f'타일은 한 번에 {MAX_TILES}개까지 요청할 수 있습니다.')
+    return wanted
+
+
+def compact_state(game):
+    """game-state의 압축 형식: 보드 전체를 칸 코드 문자열 하나로 (행 우선)"""
+    payload = {
+        'format': 'compact',
+        'rows': game.rows,
+        'cols': game.cols,
+        'cells': cell_codes(game).decode('ascii'),
+    }
+    payload.update(game_status(game))
+    return payload
+
+
+def verbose_state(game):
+    """game-state의 기존 형식: 칸마다 dict (호환용)"""
+    payload = {
+        'board_data': [
+            [cell_data(game, r * game.cols + c) for c in range(game.cols)]
+            for r in range(game.rows)
+        ],
+    }
+    payload.update(game_status(game))
+    return payload
+
+
+def cell_data(game, index):
+    """
+    칸 하나의 클라이언트용 표현 (game-state board_data와 같은 형태).
+    닫힌 칸은 지뢰 여부와 숫자를 보내지 않는다 (응답만 보고 보드를 알 수 없게)
+    """
+    revealed = bool(game.revealed[index])
+    value = game.value(index) if revealed else 0
+    return {
+        'row': index // game.cols,
+        'col': index % game.cols,
+        'is_revealed': revealed,
+        'is_flagged': bool(game.flagged[index]),
+        'is_mine': value == MINE,
+        'value': value if 0 < value < MINE else '',
+    }
+
+
+def game_status(game):
+    """보드를 제외한 게임 상태 필드 (승패, 남은 깃발, 타이머)"""
+    elapsed_seconds = 0
+    if game.start_time is not None:
+        elapsed_seconds = int((game.end_time or time.time()) - game.start_time)
+
+    return {
+        'version': game.version,
+        'game_over': game.game_over,
+        'won': game.won,
+        'remaining_flags': game.remaining_flags,
+        'start_time': game.start_time,
+        'end_time': game.end_time,
+        'elapsed_seconds': elapsed_seconds,
+    }
+
+
+def delta_payload(game, changed, **extra):
+    """바뀐 칸과 상태 필드만 담은 응답 dict"""
+    payload = game_status(game)
+    changed = sorted(set(changed))
+    if len(changed) > MAX_DELTA_CELLS:
+        # 칸 목록이 너무 크면 보내지 않고 상태를 다시 받게 한다
+        payload['cells'] = []
+        payload['resync'] = True
+    else:
+        payload['cells'] = [cell_data(game, i) for i in changed]
+    payload.update(extra)
+    return payload
+
+
+def parse_moves(game, moves):
+    """일괄 이동 목록 검증. 하나라도 잘못되면 ValueError (아무 수도 적용하지 않음)"""
+    if not isinstance(moves, list) or not 0 < len(moves) <= MAX_BATCH_MOVES:
+        raise ValueError(f'moves는 1~{MAX_BATCH_MOVES}개의 목록이어야 합니다.')
+    parsed = []
+    for move in moves:
+        if not isinstance(move, dict) or move.get('action') not in MOVE_ACTIONS:
+            raise ValueError(f'알 수 없는 동작입니다: {move!r}')
+        row, col = move.get('row'), move.get('col')
+        if not isinstance(row, int) or not isinstance(col, int):
+            raise ValueError(f'좌표는 정수여야 합니다: {move!r}')
+        parsed.append((MOVE_ACTIONS[move['action']], row, col, game.index(row, col)))
+    return parsed
+
+
+def apply_moves(game, parsed):
+    """
+    검증된 수를 순서대로 적용. 게임이 끝나면 남은 수는 버린다.
+    (바뀐 칸, 적용한 수의 칸, 저장 필요 여부)를 반환
+    """
+    started = game.start_time
+    changed = []
+    touched = []
+    for move, row, col, index in parsed:
+        if game.finished:
+            break
+        changed.extend(move(game, row, col))
+        touched.append(index)
+    return changed, touched, bool(changed) or game.start_time != started
@@ -0,0 +1,298 @@
+"""
+ASGI WebSocket 게임 채널
+
+클라이언트는 게임당 연결 하나(/ws/game/<game_id>/)를 열어 두고 수를 보낸다.
+서버는 바뀐 칸과 상태를 같은 게임 그룹의 모든 연결에 푸시하므로 수마다 HTTP
+요청/세션 처리가 없다. 연결 하나는 코루틴 하나라서 asyncio 워커 하나가 많은
+연결을 동시에 들고 있을 수 있다.
+
+그룹 전달은 프로세스 내 채널 레이어(InMemoryChannelLayer)가 맡는다. 외부 브로커가
+필요 없어 runserver/uvicorn 한 프로세스에서 바로 테스트할 수 있다.
+
+메시지 형식 (JSON 텍스트)
+- 클라이언트 -> 서버: {"moves": [{"action", "row", "col"}, ...]} 또는 수 하나
+- 서버 -> 클라이언트:
+    {"type": "status", ...상태 필드}                   연결 직후
+    {"type": "delta", "cells": [...], "applied", ...}  수 적용 후 (그룹 전체)
+    {"type": "resync"}                                 푸시가 밀려 버려진 경우
+    {"type": "error", "error", "detail"}               보낸 연결에만
+
+공유 게임(/ws/shared/<game_id>/[?key=플레이 키], shared.py)도 같은 채널 레이어를 쓴다.
+- 클라이언트 -> 서버: {"version": 마지막으로 본 버전, "moves": [...]} (version은 생략 가능)
+- 서버 -> 클라이언트:
+    {"type": "joined", "role": "player"|"spectator"}   연결 직후
+    {"type": "state", "cells", ...상태 필드}            연결 직후 (압축 형식 전체 상태)
+    {"type": "delta", ...}                             상태가 바뀐 수 (그룹 전체)
+    {"type": "conflict", "cells", "base", ...}         버전 검사로 거절한 수 (보낸 연결에만)
+"""
+import asyncio
+import json
+import re
+import weakref
+from http.cookies import SimpleCookie
+from importlib import import_module
+from urllib.parse import parse_qs
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from .protocol import apply_moves, delta_payload, game_status, parse_moves
+from .results import record_result
+from .shared import get_shared_games
+from .store import GAME_ID_SESSION_KEY, PLAYER_SESSION_KEY, MemoryGameStore, ServerGameStore, get_store
+
+GAME_PATH = re.compile(r'^/ws/game/(?P<game_id>[0-9a-f-]{36})/$')
+SHARED_PATH = re.compile(r'^/ws/shared/(?P<game_id>[0-9a-f-]{36})/$')
+
+# 애플리케이션 정의 close 코드 (4000~4999)
+CLOSE_FORBIDDEN = 4403
+CLOSE_NOT_FOUND = 4404
+CLOSE_UNSUPPORTED = 4400
+
+SPECTATOR_ERROR = json.dumps({'type': 'error', 'error': 'spectator'})
+
+
+class Channel:
+    """연결 하나의 수신함. 가득 차면 메시지를 버리고 resync가 필요하다고 표시"""
+
+    __slots__ = ('queue', 'overflowed')
+
+    def __init__(self, capacity):
+        self.queue = asyncio.Queue(capacity)
+        self.overflowed = False
+
+    def put(self, text):
+        try:
+            self.queue.put_nowait(text)
+        except asyncio.QueueFull:
+            # 느린 클라이언트 때문에 그룹 전체가 기다리지 않도록 버린다
+            self.overflowed = True
+
+    async def get(self):
+        return await self.queue.get()
+
+
+class InMemoryChannelLayer:
+    """프로세스 내 그룹 pub/sub. 같은 이벤트 루프의 연결끼리만 전달된다"""
+
+    def __init__(self, capacity=100):
+        self.capacity = capacity
+        self.groups = {}
+
+    def new_channel(self):
+        return Channel(self.capacity)
+
+    def group_add(self, group, channel):
+        self.groups.setdefault(group, set()).add(channel)
+
+    def group_discard(self, group, channel):
+        members = self.groups.get(group)
+        if members is not None:
+            members.discard(channel)
+            if not members:
+                del self.groups[group]
+
+    def group_send(self, group, text):
+        """이미 직렬화된 메시지를 그룹의 모든 수신함에 넣는다 (직렬화는 보내는 쪽에서 한 번)"""
+        for channel in tuple(self.groups.get(group, ())):
+            channel.put(text)
+
+
+channel_layer = InMemoryChannelLayer()
+
+# 게임별 잠금: 같은 게임의 수는 연결이 여러 개여도 하나씩 적용
+_game_locks = weakref.WeakValueDictionary()
+
+
+def game_lock(game_id):
+    lock = _game_locks.get(game_id)
+    if lock is None:
+        lock = _game_locks[game_id] = asyncio.Lock()
+    return lock
+
+
+def group_name(game_id):
+    return f'game.{game_id}'
+
+
+async def call_store(store, method, *args):
+    """메모리 저장소는 바로 호출하고, DB/캐시처럼 블로킹되는 저장소는 스레드에서 호출"""
+    if isinstance(store, MemoryGameStore):
+        return method(*args)
+    return await sync_to_async(method)(*args)
+
+
+def load_session(scope):
+    """ASGI scope의 쿠키 헤더로 Django 세션을 연다"""
+    cookie = SimpleCookie()
+    for name, value in scope.get('headers', ()):
+        if name == b'cookie':
+            cookie.load(value.decode('latin-1'))
+    morsel = cookie.get(settings.SESSION_COOKIE_NAME)
+    engine = import_module(settings.SESSION_ENGINE)
+    return engine.SessionStore(morsel.value if morsel else None)
+
+
+def session_ids(scope):
+    """세션의 (game_id, player_id)"""
+    session = load_session(scope)
+    return session.get(GAME_ID_SESSION_KEY), session.get(PLAYER_SESSION_KEY)
+
+
+def apply_stored_moves(store, game_id, moves):
+    """
+    store.lock 안에서 게임을 읽고 수를 적용해 저장한다 (워커 스레드에서 실행).
+    (그룹에 보낼 payload, 보낸 연결에만 돌려줄 오류 문자열, 결과를 기록할 끝난 게임)을 반환
+    """
+    with store.lock(game_id):
+        game = store.get(game_id)
+        if game is None:
+            return None, json.dumps({'type': 'error', 'error': 'no_game'}), None
+        try:
+            parsed = parse_moves(game, moves)
+        except ValueError as e:
+            return None, json.dumps({'type': 'error', 'error': 'invalid_moves', 'detail': str(e)}), None
+
+        changed, touched, dirty = apply_moves(game, parsed)
+        if dirty:
+            if settings.MINESWEEPER_CHECK_COUNTERS:
+                game.check_counters()
+            store.set(game)
+        payload = delta_payload(game, changed + touched, type='delta', applied=len(touched))
+    return payload, None, game if dirty and game.finished else None
+
+
+async def handle_text(store, game_id, text, player_id=None):
+    """
+    수 메시지 하나를 적용하고 그룹에 delta를 보낸다.
+    보낸 연결에만 돌려줄 오류 메시지(문자열)를 반환하고, 정상이면 None
+    """
+    try:
+        data = json.loads(text or '')
+        moves = data['moves'] if 'moves' in data else [data]
+    except (ValueError, TypeError, KeyError) as e:
+        return json.dumps({'type': 'error', 'error': 'invalid_moves', 'detail': str(e)})
+
+    async with game_lock(game_id):
+        # store.lock은 같은 게임을 바꾸는 HTTP 요청(스레드)과 함께 쓰는 스레드 잠금이다 (memory 백엔드).
+        # 요청이 잡고 있는 동안 이벤트 루프가 멈추지 않도록 잠금부터 저장까지 워커 스레드에서 한다
+        payload, error, finished = await sync_to_async(apply_stored_moves, thread_sensitive=False)(
+            store, game_id, moves)
+        if finished is not None:
+            # 기록은 잠금 밖에서 (같은 스레드를 쓰는 HTTP 요청과 교착 방지)
+            await sync_to_async(record_result)(finished, player_id)
+    if error is not None:
+        return error
+    channel_layer.group_send(group_name(game_id), json.dumps(payload))
+    return None
+
+
+async def handle_shared_text(shared, text):
+    """
+    공유 게임의 수 메시지 하나. 상태가 바뀌었으면 그룹에 delta를 보낸다 (직렬화는 shared.apply에서 한 번).
+    보낸 연결에만 돌려줄 메시지(문자열)를 반환하고, 없으면 None
+    """
+    try:
+        data = json.loads(text or '')
+        moves = data['moves'] if 'moves' in data else [data]
+        base = data.get('version')
+        if base is not None and not isinstance(base, int):
+            raise ValueError(f'version은 정수여야 합니다: {base!r}')
+        broadcast, reply = shared.apply(moves, base)
+    except (ValueError, TypeError, KeyError, AttributeError) as e:
+        return json.dumps({'type': 'error', 'error': 'invalid_moves', 'detail': str(e)})
+
+    if broadcast is not None:
+        # 수가 적용될 때마다 만료 시각을 늦춘다 (진행 중인 게임은 TTL로 사라지지 않게)
+        get_shared_games().set(shared)
+        channel_layer.group_send(group_name(shared.game_id), broadcast)
+    return None if reply is None else json.dumps(reply)
+
+
+async def _pump(channel, send):
+    """수신함의 메시지를 소켓으로 보낸다. 소켓 send는 이 태스크만 호출"""
+    while True:
+        text = await channel.get()
+        if channel.overflowed:
+            channel.overflowed = False
+            await send({'type': 'websocket.send', 'text': json.dumps({'type': 'resync'})})
+        await send({'type': 'websocket.send', 'text': text})
+
+
+async def _close(send, code):
+    await send({'type': 'websocket.close', 'code': code})
+
+
+async def _serve(receive, send, group, greetings, handle):
+    """
+    연결을 받아 그룹에 넣고 첫 메시지(greetings)를 보낸 뒤, 끊길 때까지 받은 텍스트를
+    handle(text)로 처리한다. handle이 돌려준 문자열은 이 연결에만 보낸다
+    """
+    await send({'type': 'websocket.accept'})
+    channel = channel_layer.new_channel()
+    channel_layer.group_add(group, channel)
+    for text in greetings:
+        channel.put(text)
+    pump = asyncio.create_task(_pump(channel, send))
+    try:
+        while True:
+            message = await receive()
+            if message['type'] == 'websocket.disconnect':
+                break
+            if message['type'] != 'websocket.receive':
+                continue
+            error = await handle(message.get('text'))
+            if error is not None:
+                channel.put(error)
+    finally:
+        channel_layer.group_discard(group, channel)
+        pump.cancel()
+
+
+async def shared_application(game_id, scope, receive, send):
+    """공유 게임 연결: 플레이 키가 맞으면 플레이어, 아니면 관전자"""
+    shared = get_shared_games().get(game_id)
+    if shared is None:
+        return await _close(send, CLOSE_NOT_FOUND)
+    query = parse_qs(scope.get('query_string', b'').decode('latin-1'))
+    player = shared.can_play(query.get('key', [''])[0])
+
+    async def handle(text):
+        if not player:
+            return SPECTATOR_ERROR
+        return await handle_shared_text(shared, text)
+
+    joined = json.dumps({'type': 'joined', 'role': 'player' if player else 'spectator'})
+    await _serve(receive, send, group_name(game_id), (joined, shared.snapshot()), handle)
+
+
+async def websocket_application(scope, receive, send):
+    """config/asgi.py가 'websocket' scope를 넘기는 ASGI 애플리케이션"""
+    message = await receive()
+    if message['type'] != 'websocket.connect':
+        return
+
+    match = SHARED_PATH.match(scope['path'])
+    if match is not None:
+        return await shared_application(match['game_id'], scope, receive, send)
+    match = GAME_PATH.match(scope['path'])
+    if match is None:
+        return await _close(send, CLOSE_NOT_FOUND)
+    game_id = match['game_id']
+
+    store = get_store()
+    if not isinstance(store, ServerGameStore):
+        # 쿠키 저장소는 응답 쿠키로만 상태를 되쓸 수 있어 소켓에서 진행할 수 없다
+        return await _close(send, CLOSE_UNSUPPORTED)
+    session_game_id, player_id = await sync_to_async(session_ids)(scope)
+    if session_game_id != game_id:
+        return await _close(send, CLOSE_FORBIDDEN)
+    game = await call_store(store, store.get, game_id)
+    if game is None:
+        return await _close(send, CLOSE_NOT_FOUND)
+
+    async def handle(text):
+        return await handle_text(store, game_id, text, player_id)
+
+    status = json.dumps({'type': 'status', **game_status(game)})
+    await _serve(receive, send, group_name(game_id), (status,), handle)
@@ -0,0 +1,74 @@
+"""
+보드 HTML 직접 렌더링
+
+칸마다 dict를 만들어 템플릿 루프를 돌리는 대신, 보이는 상태(protocol.cell_codes)에서
+바로 HTML 문자열을 만든다. 행 조각은 (행 번호, 그 행의 칸 코드)를 버전 키로 캐시하므로
+다시 그릴 때는 바뀐 행만 새로 만든다. 키가 내용 자체라서 버전을 저장할 필요가 없고,
+같은 크기의 다른 게임(예: 아직 열지 않은 행)끼리도 조각을 공유한다.
+"""
+import threading
+from collections import OrderedDict
+
+from django.utils.safestring import mark_safe
+
+from .protocol import cell_codes
+
+# 캐시 상한 (조각 문자 수 합계). 넘으면 가장 오래 쓰지 않은 조각부터 버린다
+MAX_CACHED_CHARS = 8 * 1024 * 1024
+
+_CELL_TEMPLATES = {
+    ord('?'): '<div class="cell" data-row="{0}" data-col="{1}"></div>',
+    ord('F'): '<div class="cell flagged" data-row="{0}" data-col="{1}">🚩</div>',
+    ord('*'): '<div class="cell revealed mine" data-row="{0}" data-col="{1}">💣</div>',
+    ord('0'): '<div class="cell revealed" data-row="{0}" data-col="{1}"></div>',
+}
+for _value in range(1, 9):
+    _CELL_TEMPLATES[ord('0') + _value] = (
+        f'<div class="cell revealed color-{_value}" data-row="{{0}}" data-col="{{1}}">{_value}</div>'
+    )
+
+_row_cache = OrderedDict()   # (행 번호, 칸 코드) -> 행 HTML, 오래 안 쓴 순
+_row_cache_chars = 0
+_row_cache_lock = threading.Lock()
+
+
+def render_row(row, codes):
+    """칸 코드 한 행을 HTML로"""
+    templates = _CELL_TEMPLATES
+    return ''.join([templates[code].format(row, col) for col, code in enumerate(codes)])
+
+
+def cached_row(row, codes):
+    global _row_cache_chars
+    key = (row, codes)
+    with _row_cache_lock:
+        html = _row_cache.get(key)
+        if html is not None:
+            _row_cache.move_to_end(key)
+            return html
+
+    html = render_row(row, codes)
+    with _row_cache_lock:
+        if key not in _row_cache:
+            _row_cache[key] = html
+            _row_cache_chars += len(html)
+            while _row_cache_chars > MAX_CACHED_CHARS and len(_row_cache) > 1:
+                _, old = _row_cache.popitem(last=False)
+                _row_cache_chars -= len(old)
+    return html
+
+
+def render_board(game):
+    """보드 칸 전체의 HTML (board.html의 #game-board 안쪽)"""
+    codes = cell_codes(game)
+    cols = game.cols
+    return mark_safe('\n'.join([
+        cached_row(r, codes[r * cols:(r + 1) * cols]) for r in range(game.rows)
+    ]))
+
+
+def clear_cache():
+    global _row_cache_chars
+    with _row_cache_lock:
+        _row_cache.clear()
+        _row_cache_chars = 0
@@ -0,0 +1,88 @@
+"""
+시드 + 이동 기록으로 게임 다시 만들기 (리플레이/검증/일일 도전)
+
+게임은 (설정, 시드, 첫 클릭 칸)으로 첫 수 전 상태를 만들고 이동 기록을 차례로
+적용하면 어느 시점이든 다시 만들 수 있다. 긴 게임에서 뒤쪽 시점을 볼 때마다
+처음부터 재생하지 않도록 SNAPSHOT_INTERVAL 수마다 직렬화한 스냅샷을 두고, 가장
+가까운 스냅샷에서부터만 재생한다. 끝난 게임의 기록은 바뀌지 않으므로 스냅샷은
+game_id별로 프로세스 내 LRU에 보관한다.
+"""
+import threading
+from collections import OrderedDict
+from datetime import date
+
+from django.utils.crypto import salted_hmac
+
+from .engine import Game
+
+# 스냅샷 간격 (한 시점을 만들 때 재생하는 수의 상한)
+SNAPSHOT_INTERVAL = 64
+# 스냅샷을 보관할 게임 수
+MAX_CACHED_REPLAYS = 64
+
+
+class Replay:
+    """끝난 게임 하나의 재생기. 스냅샷은 처음 한 번 전체를 재생하며 만든다"""
+
+    def __init__(self, game):
+        self.moves = game.logged_moves()
+        self.snapshots = []
+        position = game.initial_position()
+        for step, (kind, index) in enumerate(self.moves):
+            if step % SNAPSHOT_INTERVAL == 0:
+                self.snapshots.append(position.serialize())
+            position.replay_move(kind, index)
+        self.final = position
+
+    def __len__(self):
+        return len(self.moves)
+
+    def at(self, step):
+        """step개의 수를 적용한 시점의 게임 (0 = 첫 수 전, len(self) = 마지막)"""
+        step = min(max(step, 0), len(self.moves))
+        if step == len(self.moves):
+            return Game.deserialize(self.final.serialize())
+        base = step // SNAPSHOT_INTERVAL
+        position = Game.deserialize(self.snapshots[base])
+        for kind, index in self.moves[base * SNAPSHOT_INTERVAL:step]:
+            position.replay_move(kind, index)
+        return position
+
+    def matches(self, won, revealed_count):
+        """기록된 결과와 재생한 결과가 같은지 (검증)"""
+        return self.final.won == won and self.final.revealed_count == revealed_count
+
+
+_replays = OrderedDict()   # game_id -> Replay, 오래 안 쓴 순
+_replays_lock = threading.Lock()
+
+
+def get_replay(game):
+    """끝난 게임의 Replay (캐시에 있으면 재사용)"""
+    with _replays_lock:
+        replay = _replays.get(game.game_id)
+        if replay is not None:
+            _replays.move_to_end(game.game_id)
+            return replay
+
+    replay = Replay(game)
+    with _replays_lock:
+        _replays[game.game_id] = replay
+        while len(_replays) > MAX_CACHED_REPLAYS:
+            _replays.popitem(last=False)
+    return replay
+
+
+def clear_cache():
+    with _replays_lock:
+        _replays.clear()
+
+
+def daily_seed(difficulty, day=None):
+    """
+    날짜와 난이도로 정해지는 일일 도전 시드. 같은 날에는 모든 플레이어가 같은 보드를 받는다.
+    SECRET_KEY로 서명한 값이라 날짜만 알아서는 보드를 미리 계산할 수 없다
+    """
+    day = day or date.today()
+    digest = salted_hmac('minesweeper.daily', f'{day.isoformat()}:{difficulty}').digest()
+    return int.from_bytes(digest[:8], 'big') >> 1
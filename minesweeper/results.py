@@ -0,0 +1,165 @@
+"""
+게임 결과 기록과 난이도별 통계/리더보드
+
+게임이 끝나면 GameResult 한 줄을 쓰고 같은 트랜잭션에서 DifficultyStats를 증분
+갱신한다. 통계 조회는 집계 한 줄만 읽고, 리더보드는 (난이도, 노게스, 승리, 시간)
+인덱스 앞부분만 읽으므로 기록이 수백만 건이어도 비용이 일정하다.
+DB가 없는 배포(서버리스 + 쿠키 세션)에서는 기록을 건너뛴다.
+"""
+import logging
+from bisect import bisect_left
+from datetime import datetime, timezone
+
+from django.db import DatabaseError, IntegrityError, transaction
+
+from .engine import Game
+from .models import DifficultyStats, GameResult
+
+logger = logging.getLogger(__name__)
+
+# 승리 시간 히스토그램 구간 상한(초): 1분까지 1초, 10분까지 10초, 1시간까지 1분 단위, 그 뒤는 마지막 칸
+HISTOGRAM_BOUNDS = (
+    list(range(1, 61))
+    + list(range(70, 601, 10))
+    + list(range(660, 3601, 60))
+)
+PERCENTILES = (50, 90, 99)
+
+
+def category_of(difficulty, no_guess):
+    return f'{difficulty}:no-guess' if no_guess else difficulty
+
+
+def bucket_of(duration):
+    """duration(초)이 들어갈 히스토그램 칸 번호 (마지막 칸은 1시간 초과)"""
+    return bisect_left(HISTOGRAM_BOUNDS, duration)
+
+
+def percentile(histogram, wins, p):
+    """히스토그램에서 p 백분위 승리 시간을 구간 상한으로 근사"""
+    if not wins:
+        return None
+    target = wins * p / 100
+    seen = 0
+    for bucket, count in enumerate(histogram):
+        seen += count
+        if seen >= target:
+            return HISTOGRAM_BOUNDS[bucket] if bucket < len(HISTOGRAM_BOUNDS) else None
+    return None
+
+
+def record_result(game, player_id):
+    """끝난 게임을 기록하고 집계를 갱신. 이미 기록된 게임이나 DB 오류는 건너뛴다"""
+    if not game.finished or game.start_time is None:
+        return None
+    duration = (game.end_time or game.start_time) - game.start_time
+    try:
+        with transaction.atomic():
+            result = GameResult.objects.create(
+                game_id=game.game_id,
+                player_id=player_id or '',
+                difficulty=game.difficulty,
+                no_guess=game.no_guess,
+                rows=game.rows,
+                cols=game.cols,
+                mines=game.mines,
+                won=game.won,
+                duration=duration,
+                revealed_count=game.revealed_count,
+                finished_at=datetime.fromtimestamp(game.end_time or game.start_time, timezone.utc),
+                seed=game.seed,
+                first_click=game.first_click,
+                move_log=bytes(game.move_log),
+            )
+            update_stats(category_of(game.difficulty, game.no_guess), game.won, duration)
+    except IntegrityError:
+        # 같은 게임을 두 번 기록하려는 경우 (중복 저장)
+        return None
+    except DatabaseError:
+        logger.warning('게임 결과를 기록하지 못했습니다: %s', game.game_id, exc_info=True)
+        return None
+    return result
+
+
+def update_stats(category, won, duration):
+    """집계 한 줄을 잠그고 증분 갱신 (transaction.atomic 안에서 호출)"""
+    stats = DifficultyStats.objects.select_for_update().filter(category=category).first()
+    if stats is None:
+        try:
+            # 처음 기록되는 난이도: 세이브포인트 안에서 만들어, 다른 요청이 먼저 만들었어도
+            # 바깥 트랜잭션(GameResult)은 그대로 두고 그 줄을 잠가서 쓴다
+            with transaction.atomic():
+                stats = DifficultyStats.objects.create(category=category)
+        except IntegrityError:
+            stats = DifficultyStats.objects.select_for_update().get(category=category)
+    stats.games += 1
+    if won:
+        stats.wins += 1
+        stats.total_win_time += duration
+        if stats.best_time is None or duration < stats.best_time:
+            stats.best_time = duration
+        histogram = stats.histogram or [0] * (len(HISTOGRAM_BOUNDS) + 1)
+        histogram[bucket_of(duration)] += 1
+        stats.histogram = histogram
+    stats.save()
+
+
+def stats_summary(difficulty, no_guess=False):
+    """난이도별 집계 (판 수, 승률, 최고/평균/백분위 승리 시간)"""
+    category = category_of(difficulty, no_guess)
+    stats = DifficultyStats.objects.filter(category=category).first()
+    if stats is None:
+        stats = DifficultyStats(category=category)
+    summary = {
+        'difficulty': difficulty,
+        'no_guess': no_guess,
+        'games': stats.games,
+        'wins': stats.wins,
+        'win_rate': stats.wins / stats.games if stats.games else None,
+        'best_time': stats.best_time,
+        'average_time': stats.total_win_time / stats.wins if stats.wins else None,
+    }
+    for p in PERCENTILES:
+        summary[f'p{p}_time'] = percentile(stats.histogram, stats.wins, p)
+    return summary
+
+
+def leaderboard(difficulty, no_guess=False, limit=20, seed=None):
+    """
+    가장 빠른 승리 기록 (result_leaderboard_idx 인덱스 순서대로 limit개).
+    seed가 있으면 그 보드(일일 도전)의 기록만 (result_seed_idx)
+    """
+    if seed is not None:
+        results = GameResult.objects.filter(seed=seed, difficulty=difficulty, won=True)
+    else:
+        results = GameResult.objects.filter(difficulty=difficulty, no_guess=no_guess, won=True)
+    return list(
+        results
+        .order_by('duration')
+        .values('player_id', 'duration', 'finished_at', 'rows', 'cols', 'mines')[:limit]
+    )
+
+
+def recent_results(player_id, limit=10):
+    """플레이어의 최근 기록 (result_player_idx)"""
+    return list(
+        GameResult.objects
+        .filter(player_id=player_id)
+        .order_by('-finished_at')
+        .values('difficulty', 'no_guess', 'won', 'duration', 'finished_at')[:limit]
+    )
+
+
+def result_game(game_id):
+    """기록된 게임을 리플레이용 Game으로 (설정/시드/첫 클릭/이동 기록만 채움). 없으면 None"""
+    result = GameResult.objects.filter(game_id=game_id).first()
+    if result is None:
+        return None
+    game = Game(result.rows, result.cols, result.mines, result.difficulty, result.game_id,
+                result.no_guess, result.seed)
+    game.first_click = result.first_click
+    game.move_log = bytearray(result.move_log)
+    game.won = result.won
+    game.game_over = not result.won
+    game.revealed_count = result.revealed_count
+    return game
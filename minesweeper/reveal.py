@@ -0,0 +1,144 @@
+"""
+빈 칸(0) 영역 인덱스 기반 공개 엔진
+
+보드가 정해지면 값이 0인 칸들의 연결 영역을 행 단위 구간(run)으로 한 번만
+라벨링해 둔다. 0인 칸을 열면 해당 영역의 구간 목록을 찾아 구간과 그 테두리를
+그대로 공개하므로 재귀나 칸 단위 탐색이 필요 없다.
+"""
+import re
+from bisect import bisect_right
+from collections import deque
+
+from .codec import MINE
+
+_ZERO_RUN = re.compile(rb'\x00+')
+
+
+class ZeroRegions:
+    """0인 칸의 8방향 연결 영역을 행 구간 단위로 저장한 인덱스"""
+
+    __slots__ = ('rows', 'cols', 'row_starts', 'row_ends', 'row_ids', 'regions')
+
+    def __init__(self, board, rows, cols):
+        self.rows = rows
+        self.cols = cols
+        self.row_starts = []
+        self.row_ends = []
+        self.row_ids = []
+
+        # 1) 행마다 0 구간을 찾고, 윗행 구간과 8방향으로 맞닿으면 합친다
+        parent = []
+
+        def find(x):
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+
+        runs = []
+        prev_starts, prev_ends, prev_ids = [], [], []
+        for r in range(rows):
+            starts, ends, ids = [], [], []
+            j = 0
+            for match in _ZERO_RUN.finditer(board, r * cols, (r + 1) * cols):
+                a = match.start() - r * cols
+                b = match.end() - 1 - r * cols
+                run_id = len(runs)
+                runs.append((r, a, b))
+                parent.append(run_id)
+                starts.append(a)
+                ends.append(b)
+                ids.append(run_id)
+
+                # 윗행에서 [a-1, b+1]과 겹치는 구간 연결
+                while j < len(prev_ends) and prev_ends[j] < a - 1:
+                    j += 1
+                k = j
+                while k < len(prev_starts) and prev_starts[k] <= b + 1:
+                    root_a, root_b = find(prev_ids[k]), find(run_id)
+                    if root_a != root_b:
+                        parent[root_b] = root_a
+                    k += 1
+            self.row_starts.append(starts)
+            self.row_ends.append(ends)
+            self.row_ids.append(ids)
+            prev_starts, prev_ends, prev_ids = starts, ends, ids
+
+        # 2) 대표 구간 기준으로 영역 번호를 다시 매기고 구간 목록을 모은다
+        region_of_root = {}
+        self.regions = []
+        for run_id, run in enumerate(runs):
+            root = find(run_id)
+            region_id = region_of_root.get(root)
+            if region_id is None:
+                region_id = region_of_root[root] = len(self.regions)
+                self.regions.append([])
+            self.regions[region_id].append(run)
+        for ids in self.row_ids:
+            for k, run_id in enumerate(ids):
+                ids[k] = region_of_root[find(run_id)]
+
+    def region_at(self, row, col):
+        """(row, col)이 속한 0 영역 번호 (0인 칸이 아니면 None)"""
+        starts = self.row_starts[row]
+        k = bisect_right(starts, col) - 1
+        if k >= 0 and col <= self.row_ends[row][k]:
+            return self.row_ids[row][k]
+        return None
+
+    def reveal(self, board, revealed, flagged, row, col):
+        """(row, col)을 열고 새로 공개된 칸 인덱스 목록을 반환"""
+        cols = self.cols
+        index = row * cols + col
+        if revealed[index] or flagged[index]:
+            return []
+        if board[index] != 0:
+            revealed[index] = 1
+            return [index]
+
+        runs = self.regions[self.region_at(row, col)]
+        if flagged.find(1) != -1:
+            for r, a, b in runs:
+                # 영역 안쪽 0 칸에 깃발이 있으면 확산이 막히므로 정확한 탐색으로 처리
+                if flagged.find(1, r * cols + a, r * cols + b + 1) != -1:
+                    return flood_fill(board, revealed, flagged, row, col, self.rows, cols)
+
+        changed = []
+        last_row = self.rows - 1
+        last_col = cols - 1
+        for r, a, b in runs:
+            lo = a - 1 if a > 0 else 0
+            hi = b + 1 if b < last_col else last_col
+            for rr in range(r - 1 if r > 0 else 0, (r + 1 if r < last_row else last_row) + 1):
+                start = rr * cols + lo
+                end = rr * cols + hi + 1
+                if revealed.find(0, start, end) == -1:
+                    continue
+                for i in range(start, end):
+                    if not revealed[i] and not flagged[i]:
+                        revealed[i] = 1
+                        changed.append(i)
+        return changed
+
+
+def flood_fill(board, revealed, flagged, row, col, rows, cols):
+    """깃발에서 확산을 멈추는 반복 BFS 공개 (인덱스를 쓸 수 없을 때의 예비 경로)"""
+    start = row * cols + col
+    if revealed[start] or flagged[start]:
+        return []
+    revealed[start] = 1
+    changed = [start]
+    queue = deque([start])
+    while queue:
+        index = queue.popleft()
+        if board[index] != 0:
+            continue
+        r, c = divmod(index, cols)
+        for nr in range(r - 1 if r > 0 else 0, min(r + 2, rows)):
+            for nc in range(c - 1 if c > 0 else 0, min(c + 2, cols)):
+                i = nr * cols + nc
+                if not revealed[i] and not flagged[i] and board[i] != MINE:
+                    revealed[i] = 1
+                    changed.append(i)
+                    queue.append(i)
+    return changed
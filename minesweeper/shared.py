@@ -0,0 +1,132 @@
+"""
+여러 클라이언트가 game_id로 함께 두거나 지켜보는 공유 게임
+
+공유 게임은 세션이 아니라 프로세스 내 저장소(MemoryGameStore)에 SharedGame으로
+보관되고, 플레이어와 관전자는 /ws/shared/<game_id>/로 접속한다 (realtime.py).
+플레이 키(?key=)를 가진 연결만 수를 둘 수 있고 나머지는 관전만 한다.
+
+동시에 들어온 수는 게임별 잠금 안에서 하나씩 적용하고, 낙관적 버전 검사로 합친다.
+클라이언트는 마지막으로 본 게임 버전(version)을 함께 보내고, 그 수가 읽는 칸
+(대상 칸, chord면 주변 칸 포함)이 그 뒤에 다른 수로 바뀌었으면 그 수만 거절한다.
+칸별 버전은 공유 게임에서만 필요하므로 엔진이 아니라 SharedGame이 들고 있다.
+
+바뀐 칸은 갱신마다 한 번만 직렬화해 그룹 전체에 같은 문자열로 보내고, 접속 직후
+보내는 전체 상태도 버전마다 한 번만 만든다. 그래서 관전자 수가 늘어도 수 하나의
+비용은 직렬화 한 번 + 수신함마다 문자열 하나 넣기다. 워커 하나로 실행해야 한다.
+"""
+import json
+import threading
+from array import array
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.crypto import constant_time_compare, salted_hmac
+
+from .engine import Game
+from .generation import neighbor_indices
+from .protocol import apply_moves, compact_state, delta_payload, parse_moves
+from .store import DEFAULT_OPTIONS, MemoryGameStore
+
+# 동시에 보관하는 공유 게임 수 (초과하면 오래 접근하지 않은 게임부터 제거)
+MAX_SHARED_GAMES = 1000
+
+
+class SharedGame:
+    """공유 게임 하나. 게임 상태는 잠금(lock) 안에서만 읽고 바꾼다"""
+
+    __slots__ = ('game', 'game_id', 'cell_versions', 'lock', '_snapshot')
+
+    def __init__(self, game):
+        self.game = game
+        self.game_id = game.game_id
+        # 칸마다 마지막으로 바뀐 때의 게임 버전
+        self.cell_versions = array('I', bytes(4 * game.size))
+        self.lock = threading.Lock()
+        self._snapshot = (None, None)   # (버전, 직렬화한 전체 상태)
+
+    @property
+    def play_key(self):
+        """수를 둘 수 있는 키. game_id만 알아서는 만들 수 없다 (SECRET_KEY로 서명)"""
+        return salted_hmac('minesweeper.shared', self.game_id).hexdigest()[:32]
+
+    def can_play(self, key):
+        return bool(key) and constant_time_compare(key, self.play_key)
+
+    def snapshot(self):
+        """접속 직후 보낼 전체 상태 (압축 형식). 같은 버전이면 직렬화한 문자열을 재사용"""
+        with self.lock:
+            version, text = self._snapshot
+            if version != self.game.version:
+                text = json.dumps({'type': 'state', 'game_id': self.game_id, **compact_state(self.game)})
+                self._snapshot = (self.game.version, text)
+            return text
+
+    def _stale(self, move, index, base):
+        cell_versions = self.cell_versions
+        if cell_versions[index] > base:
+            return True
+        if move is Game.chord:
+            game = self.game
+            return any(cell_versions[i] > base for i in neighbor_indices(index, game.rows, game.cols))
+        return False
+
+    def apply(self, moves, base=None):
+        """
+        수 목록을 적용하고 (그룹에 보낼 delta 문자열 또는 None, 보낸 쪽에만 보낼 dict 또는 None)을 반환.
+        base(보낸 쪽이 본 버전)가 있으면 그 뒤에 바뀐 칸을 읽는 수는 적용하지 않고 conflict로 돌려준다.
+        잘못된 수가 있으면 ValueError (아무 수도 적용하지 않음)
+        """
+        with self.lock:
+            game = self.game
+            parsed = parse_moves(game, moves)
+            conflicts = []
+            if base is not None:
+                accepted = []
+                for move in parsed:
+                    (conflicts if self._stale(move[0], move[3], base) else accepted).append(move)
+                parsed = accepted
+
+            changed, touched, dirty = apply_moves(game, parsed)
+            version = game.version
+            cell_versions = self.cell_versions
+            for i in changed:
+                cell_versions[i] = version
+
+            reply = None
+            if conflicts:
+                # 거절한 칸의 현재 상태를 보내 보낸 쪽이 화면을 맞추게 한다
+                reply = delta_payload(game, [move[3] for move in conflicts], type='conflict', base=base)
+            if not dirty:
+                # 바뀐 것이 없으면 관전자에게는 보내지 않는다
+                if reply is None:
+                    reply = delta_payload(game, touched, type='delta', applied=len(touched))
+                return None, reply
+            payload = delta_payload(game, changed + touched, type='delta', applied=len(touched))
+            return json.dumps(payload), reply
+
+
+_shared_games = None
+
+
+def get_shared_games():
+    """공유 게임 저장소 (프로세스당 하나, game_id -> SharedGame)"""
+    global _shared_games
+    if _shared_games is None:
+        options = {**DEFAULT_OPTIONS, **settings.MINESWEEPER_GAME_STORE_OPTIONS}
+        _shared_games = MemoryGameStore(ttl=options['ttl'], max_entries=MAX_SHARED_GAMES)
+    return _shared_games
+
+
+@receiver(setting_changed)
+def _reset_shared_games(setting, **kwargs):
+    global _shared_games
+    if setting == 'MINESWEEPER_GAME_STORE_OPTIONS':
+        _shared_games = None
+
+
+def create_shared_game(rows, cols, mines, difficulty='custom'):
+    """새 공유 게임을 만들어 저장소에 넣는다. 보드는 첫 클릭 때 시드로 생성"""
+    shared = SharedGame(Game(rows, cols, mines, difficulty))
+    get_shared_games().set(shared)
+    return shared
@@ -0,0 +1,139 @@
+"""
+보이는 숫자만으로 안전한 칸을 찾는 힌트 솔버
+
+열린 숫자 칸마다 "아직 열리지 않은 주변 칸 중 지뢰가 N개"라는 제약을 두고,
+1) 단일 칸 규칙: N == 0이면 모두 안전, N == 칸 수이면 모두 지뢰
+2) 쌍 규칙: 겹치는 두 제약에서 교집합의 지뢰 수 범위를 구해 나머지 칸을 결정
+   (한쪽이 다른 쪽의 부분집합인 경우 포함)
+을 반복한다. 숨겨진 보드는 제약을 만들 때 "열린 칸의 숫자"로만 읽는다.
+깃발은 플레이어의 추측이라 증명에 쓰지 않는다.
+
+제약 집합(프런티어)은 Game에 캐시되고 공개될 때마다 바뀐 칸 주변만 갱신하므로
+힌트 한 번의 비용은 보드 크기가 아니라 새로 열린 영역에 비례한다.
+"""
+from itertools import compress
+
+from .codec import MINE
+from .generation import neighbor_indices
+
+
+class FrontierSolver:
+    __slots__ = ('rows', 'cols', 'constraints', 'watchers', 'mines', 'safe', 'dirty')
+
+    def __init__(self, board, revealed, rows, cols):
+        self.rows = rows
+        self.cols = cols
+        self.constraints = {}   # 숫자 칸 -> [열리지 않은 주변 칸 집합, 그 안의 지뢰 수]
+        self.watchers = {}      # 열리지 않은 칸 -> 그 칸을 포함한 제약(숫자 칸) 집합
+        self.mines = set()      # 증명된 지뢰
+        self.safe = set()       # 증명된 안전 칸 (아직 열리지 않음)
+        self.dirty = set()      # 다시 검사할 제약
+        for i in compress(range(rows * cols), revealed):
+            self._add(board, revealed, i)
+
+    def _add(self, board, revealed, index):
+        value = board[index]
+        if not 0 < value < MINE:
+            return
+        cells = set()
+        for n in neighbor_indices(index, self.rows, self.cols):
+            if not revealed[n]:
+                cells.add(n)
+        known = cells & self.mines
+        cells -= known
+        cells -= self.safe
+        if not cells:
+            return
+        self.constraints[index] = [cells, value - len(known)]
+        for n in cells:
+            self.watchers.setdefault(n, set()).add(index)
+        self.dirty.add(index)
+
+    def update(self, board, revealed, changed):
+        """새로 열린 칸 반영: 기존 제약에서 빼고, 새 숫자 칸의 제약을 추가"""
+        for i in changed:
+            self.safe.discard(i)
+            for key in self.watchers.pop(i, ()):
+                entry = self.constraints.get(key)
+                if entry is not None:
+                    entry[0].discard(i)
+                    self.dirty.add(key)
+        for i in changed:
+            self._add(board, revealed, i)
+
+    def _resolve(self, cell, is_mine):
+        if is_mine:
+            self.mines.add(cell)
+        else:
+            self.safe.add(cell)
+        for key in self.watchers.pop(cell, ()):
+            entry = self.constraints.get(key)
+            if entry is not None:
+                entry[0].discard(cell)
+                if is_mine:
+                    entry[1] -= 1
+                self.dirty.add(key)
+
+    def _resolve_all(self, cells, count):
+        """cells 안의 지뢰 수가 count로 정해졌을 때 모두 안전/모두 지뢰면 확정. 진전 여부 반환"""
+        if count == 0:
+            is_mine = False
+        elif count == len(cells):
+            is_mine = True
+        else:
+            return False
+        for cell in cells:
+            self._resolve(cell, is_mine)
+        return True
+
+    def _pair(self, key, cells, count):
+        """key 제약과 칸을 공유하는 제약들에 쌍 규칙 적용"""
+        others = set()
+        for cell in cells:
+            others |= self.watchers.get(cell, ())
+        others.discard(key)
+        for other in others:
+            entry = self.constraints.get(other)
+            if entry is None:
+                continue
+            other_cells, other_count = entry
+            shared = cells & other_cells
+            only_self = cells - shared
+            only_other = other_cells - shared
+            # 교집합 지뢰 수의 범위
+            lo = max(0, count - len(only_self), other_count - len(only_other))
+            hi = min(count, other_count, len(shared))
+            for rest, total in ((only_self, count), (only_other, other_count)):
+                if not rest:
+                    continue
+                if total - lo == 0:
+                    self._resolve_all(set(rest), 0)
+                    return True
+                if total - hi == len(rest):
+                    self._resolve_all(set(rest), len(rest))
+                    return True
+        return False
+
+    def solve(self, flagged):
+        """
+        깃발이 없는 증명된 안전 칸을 찾을 때까지 제약을 처리하고 그 칸 목록을 반환.
+        남은 제약은 dirty에 남겨 다음 호출에서 이어서 처리한다.
+        """
+        while True:
+            found = [cell for cell in self.safe if not flagged[cell]]
+            if found or not self.dirty:
+                return found
+            key = self.dirty.pop()
+            entry = self.constraints.get(key)
+            if entry is None:
+                continue
+            cells, count = entry
+            if not cells:
+                del self.constraints[key]
+                continue
+            if count == 0 or count == len(cells):
+                del self.constraints[key]
+                self._resolve_all(list(cells), count)
+            elif self._pair(key, cells, count):
+                # 이 제약도 줄어들었을 수 있으니 다시 검사
+                self.dirty.add(key)
@@ -0,0 +1,446 @@
+(function() {
+    const LONG_PRESS_MS = 500;
+
+    function applyCells(cells) {
+        // 서버가 알려준 바뀐 칸만 갱신
+        cells.forEach(cellData => {
+            const cell = document.querySelector(`[data-row="${cellData.row}"][data-col="${cellData.col}"]`);
+            if (!cell) return;
+
+            if (cellData.is_revealed) {
+                if (cell.classList.contains('revealed')) return;
+                // 공개 상태로 변경
+                const newCell = document.createElement('div');
+                newCell.className = `cell revealed ${cellData.is_mine ? 'mine' : ''} ${cellData.value ? `color-${cellData.value}` : ''}`;
+                newCell.dataset.row = cellData.row;
+                newCell.dataset.col = cellData.col;
+                newCell.textContent = cellData.is_mine ? '💣' : cellData.value;
+                cell.replaceWith(newCell);
+            } else if (cellData.is_flagged) {
+                cell.classList.add('flagged');
+                cell.textContent = '🚩';
+            } else {
+                cell.classList.remove('flagged');
+                cell.textContent = '';
+            }
+        });
+    }
+
+    function applyGameDelta(state) {
+        applyCells(state.cells || []);
+        if (state.resync) {
+            // 바뀐 칸이 너무 많아 목록이 생략된 경우: 보드를 다시 받는다
+            if (typeof window.refreshTiles === 'function') {
+                window.refreshTiles();
+            } else {
+                syncGameState();
+            }
+        }
+
+        // 상태 바 업데이트
+        const statusBar = document.getElementById('status-bar');
+        if (statusBar) {
+            statusBar.dataset.won = state.won.toString();
+            statusBar.dataset.gameOver = state.game_over.toString();
+            if (typeof state.start_time !== 'undefined') {
+                statusBar.dataset.startTs = state.start_time || '';
+            }
+            if (typeof state.end_time !== 'undefined') {
+                statusBar.dataset.endTs = state.end_time || '';
+            }
+            const span = statusBar.querySelector('span');
+            if (state.game_over) {
+                span.textContent = '💥 게임 오버';
+            } else if (state.won) {
+                span.textContent = '🎉 승리';
+            } else {
+                span.textContent = `🚩 x ${state.remaining_flags}`;
+            }
+            if (typeof initTimer === 'function') {
+                initTimer();
+            }
+            // 승리 상태 확인 및 꽃가루 애니메이션 트리거
+            if (typeof checkWinState === 'function') {
+                checkWinState();
+            }
+        }
+    }
+
+    window.applyGameDelta = applyGameDelta;
+
+    // 네트워크 지연 중 입력한 수는 모아 두었다가 /api/moves/ 한 번으로 보낸다
+    const pendingMoves = [];
+    let movesInFlight = false;
+
+    function getCsrfToken() {
+        const input = document.querySelector('[name=csrfmiddlewaretoken]');
+        if (input) {
+            return input.value;
+        }
+        try {
+            return JSON.parse(document.body.getAttribute('hx-headers') || '{}')['X-CSRFToken'] || '';
+        } catch (e) {
+            return '';
+        }
+    }
+
+    // 실시간 모드: 게임당 WebSocket 하나로 수를 보내고 서버 푸시로 갱신한다.
+    // 연결할 수 없으면 /api/moves/ (HTTP)로 돌아간다.
+    function compactCells(data) {
+        // 압축 형식(칸당 한 글자)을 applyCells가 받는 칸 목록으로
+        const cells = [];
+        for (let i = 0; i < data.cells.length; i++) {
+            const code = data.cells[i];
+            const revealed = code !== '?' && code !== 'F';
+            cells.push({
+                row: Math.floor(i / data.cols),
+                col: i % data.cols,
+                is_revealed: revealed,
+                is_flagged: code === 'F',
+                is_mine: code === '*',
+                value: revealed && code !== '*' && code !== '0' ? Number(code) : ''
+            });
+        }
+        return cells;
+    }
+
+    function syncGameState() {
+        fetch('/api/game-state/?format=compact').then(r => r.ok ? r.json() : null).then(data => {
+            if (data) {
+                applyGameDelta(Object.assign(data, { cells: compactCells(data) }));
+            }
+        }).catch(e => console.error('Sync error:', e));
+    }
+
+    function openGameSocket() {
+        const statusBar = document.getElementById('status-bar');
+        const gameId = statusBar ? statusBar.dataset.gameId : '';
+        const current = window.__gameSocket;
+        if (current && current.gameId === gameId) {
+            return current;
+        }
+        if (current) {
+            current.close();
+            window.__gameSocket = null;
+        }
+        if (!gameId || statusBar.dataset.realtime !== 'true' || !('WebSocket' in window)
+            || window.__gameSocketDisabled === gameId) {
+            return null;
+        }
+
+        const scheme = location.protocol === 'https:' ? 'wss' : 'ws';
+        const socket = new WebSocket(`${scheme}://${location.host}/ws/game/${gameId}/`);
+        socket.gameId = gameId;
+        socket.addEventListener('open', () => {
+            socket.opened = true;
+            flushMoves();
+        });
+        socket.addEventListener('message', event => {
+            const data = JSON.parse(event.data);
+            if (data.type === 'delta' || data.type === 'status') {
+                window.applyGameDelta(data);
+            } else if (data.type === 'resync') {
+                syncGameState();
+            } else if (data.type === 'error') {
+                console.error('Move error:', data);
+            }
+        });
+        socket.addEventListener('close', () => {
+            if (!socket.opened) {
+                // 한 번도 열리지 않았으면 이 게임에서는 HTTP만 쓴다
+                window.__gameSocketDisabled = gameId;
+            }
+            if (window.__gameSocket === socket) {
+                window.__gameSocket = null;
+                flushMoves();
+            }
+        });
+        window.__gameSocket = socket;
+        return socket;
+    }
+
+    function flushMoves() {
+        if (movesInFlight || pendingMoves.length === 0) {
+            return;
+        }
+        const socket = openGameSocket();
+        if (socket && socket.readyState === WebSocket.CONNECTING) {
+            // 연결되면 open 핸들러가 다시 보낸다
+            return;
+        }
+        if (socket && socket.readyState === WebSocket.OPEN) {
+            socket.send(JSON.stringify({ moves: pendingMoves.splice(0, pendingMoves.length) }));
+            return;
+        }
+        const moves = pendingMoves.splice(0, pendingMoves.length);
+        movesInFlight = true;
+        fetch('/api/moves/', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+                'X-CSRFToken': getCsrfToken()
+            },
+            body: JSON.stringify({ moves: moves })
+        }).then(r => {
+            // 응답에는 바뀐 칸(과 요청한 칸)과 상태 필드만 담겨 있다
+            if (r.ok) {
+                return r.json();
+            }
+        }).then(data => {
+            if (data) {
+                applyGameDelta(data);
+            }
+        }).catch(e => console.error('Move error:', e)).finally(() => {
+            movesInFlight = false;
+            flushMoves();
+        });
+    }
+
+    function queueMove(action, cell) {
+        if (window.__pauseState?.isPaused && typeof window.togglePause === 'function') {
+            window.togglePause();
+        }
+        const row = parseInt(cell.dataset.row, 10);
+        const col = parseInt(cell.dataset.col, 10);
+        if (Number.isNaN(row) || Number.isNaN(col)) {
+            return;
+        }
+        pendingMoves.push({ action: action, row: row, col: col });
+        flushMoves();
+    }
+
+    function flagCell(cell) {
+        // 깃발은 먼저 그려 두고, 서버 응답으로 최종 상태를 맞춘다
+        const flagged = cell.classList.toggle('flagged');
+        cell.textContent = flagged ? '🚩' : '';
+        queueMove(flagged ? 'flag' : 'unflag', cell);
+    }
+
+    function clickCell(cell) {
+        queueMove('reveal', cell);
+    }
+
+    function chordCell(cell) {
+        // 주변 깃발 수가 숫자와 맞는지는 서버가 판단한다 (맞지 않으면 바뀐 칸 없음)
+        queueMove('chord', cell);
+    }
+
+    function bindCellEvents(root) {
+        const cells = root.querySelectorAll('.cell:not(.revealed)');
+
+        cells.forEach(cell => {
+            if (cell.dataset.longPressBound === '1') {
+                return;
+            }
+            cell.dataset.longPressBound = '1';
+
+            let pressTimer;
+            let isLongPress = false;
+
+            cell.addEventListener('touchstart', function(e) {
+                isLongPress = false;
+                pressTimer = setTimeout(() => {
+                    isLongPress = true;
+                    cell.dataset.suppressClick = '1';
+                    flagCell(cell);
+                }, LONG_PRESS_MS);
+            }, { passive: true });
+
+            cell.addEventListener('touchmove', function() {
+                clearTimeout(pressTimer);
+                isLongPress = false;
+            }, { passive: true });
+
+            cell.addEventListener('touchend', function(e) {
+                clearTimeout(pressTimer);
+                if (isLongPress) {
+                    e.preventDefault();
+                    e.stopPropagation();
+                }
+            }, { passive: false });
+
+            cell.addEventListener('click', function(e) {
+                if (cell.dataset.suppressClick === '1') {
+                    e.preventDefault();
+                    e.stopImmediatePropagation();
+                    delete cell.dataset.suppressClick;
+                } else {
+                    clickCell(cell);
+                }
+            });
+
+            cell.addEventListener('contextmenu', function(e) {
+                e.preventDefault();
+                flagCell(cell);
+            });
+        });
+    }
+
+    // 타일 모드: 화면에 보이는 타일만 /api/tiles/로 받아 그린다.
+    // 가진 타일은 버전을 함께 보내 바뀐 타일만 다시 받는다.
+    const CELL_HTML = { '?': ['cell', ''], 'F': ['cell flagged', '🚩'], '*': ['cell revealed mine', '💣'], '0': ['cell revealed', ''] };
+    for (let n = 1; n <= 8; n++) {
+        CELL_HTML[n] = [`cell revealed color-${n}`, String(n)];
+    }
+
+    function tileHtml(tile) {
+        const parts = [];
+        for (let i = 0; i < tile.cells.length; i++) {
+            const [className, text] = CELL_HTML[tile.cells[i]];
+            const row = tile.row + Math.floor(i / tile.cols);
+            const col = tile.col + i % tile.cols;
+            parts.push(`<div class="${className}" data-row="${row}" data-col="${col}">${text}</div>`);
+        }
+        return parts.join('');
+    }
+
+    function initTiledBoard(board) {
+        const canvas = board.querySelector('.tiled-canvas');
+        const rows = parseInt(board.dataset.rows, 10);
+        const cols = parseInt(board.dataset.cols, 10);
+        const tileSize = parseInt(board.dataset.tileSize, 10);
+        const tileRows = Math.ceil(rows / tileSize);
+        const tileCols = Math.ceil(cols / tileSize);
+        const tiles = new Map();   // 타일 번호 -> { version, el }
+        let pitch = 0;
+        let inFlight = false;
+        let again = false;
+
+        function measure() {
+            // 칸 크기 + grid gap(4px)
+            pitch = (parseFloat(getComputedStyle(board).getPropertyValue('--cell-size')) || 40) + 4;
+            canvas.style.width = `${cols * pitch}px`;
+            canvas.style.height = `${rows * pitch}px`;
+        }
+
+        function visibleTiles() {
+            const span = pitch * tileSize;
+            const r0 = Math.floor(board.scrollTop / span);
+            const r1 = Math.min(tileRows - 1, Math.floor((board.scrollTop + board.clientHeight) / span));
+            const c0 = Math.floor(board.scrollLeft / span);
+            const c1 = Math.min(tileCols - 1, Math.floor((board.scrollLeft + board.clientWidth) / span));
+            const ids = [];
+            for (let r = r0; r <= r1; r++) {
+                for (let c = c0; c <= c1; c++) {
+                    ids.push(r * tileCols + c);
+                }
+            }
+            return ids;
+        }
+
+        function renderTile(tile) {
+            const el = document.createElement('div');
+            el.className = 'tile';
+            el.style.left = `${tile.col * pitch}px`;
+            el.style.top = `${tile.row * pitch}px`;
+            el.style.gridTemplateColumns = `repeat(${tile.cols}, var(--cell-size))`;
+            el.innerHTML = tileHtml(tile);
+            const current = tiles.get(tile.id);
+            if (current) {
+                current.el.replaceWith(el);
+            } else {
+                canvas.appendChild(el);
+            }
+            tiles.set(tile.id, { version: tile.version, el: el });
+            bindCellEvents(el);
+        }
+
+        function refresh() {
+            if (!board.isConnected) {
+                return;
+            }
+            if (inFlight) {
+                again = true;
+                return;
+            }
+            const ids = visibleTiles();
+            // 화면 밖 타일은 DOM에서 뺀다 (다시 보이면 새로 받음)
+            tiles.forEach((entry, id) => {
+                if (!ids.includes(id)) {
+                    entry.el.remove();
+                    tiles.delete(id);
+                }
+            });
+            const query = ids.map(id => tiles.has(id) ? `${id}:${tiles.get(id).version}` : `${id}`).join(',');
+            inFlight = true;
+            fetch(`/api/tiles/?tiles=${query}`).then(r => r.ok ? r.json() : null).then(data => {
+                if (data) {
+                    data.tiles.forEach(renderTile);
+                }
+            }).catch(e => console.error('Tile error:', e)).finally(() => {
+                inFlight = false;
+                if (again) {
+                    again = false;
+                    refresh();
+                }
+            });
+        }
+
+        let scheduled = false;
+        board.addEventListener('scroll', () => {
+            if (!scheduled) {
+                scheduled = true;
+                requestAnimationFrame(() => {
+                    scheduled = false;
+                    refresh();
+                });
+            }
+        });
+        resizeTiles = () => {
+            measure();
+            tiles.forEach(entry => entry.el.remove());
+            tiles.clear();
+            refresh();
+        };
+        window.refreshTiles = refresh;
+        measure();
+        refresh();
+    }
+
+    // 이 파일은 페이지당 한 번만 실행된다. HTMX가 보드를 새로 끼우면 initBoard를 다시 부른다
+    let resizeTiles = null;
+    window.addEventListener('resize', () => {
+        if (resizeTiles) {
+            resizeTiles();
+        }
+    });
+
+    function initBoard() {
+        const gameBoard = document.getElementById('game-board');
+        if (gameBoard && gameBoard.dataset.boardBound !== '1') {
+            gameBoard.dataset.boardBound = '1';
+            // 새 보드(새 게임)에는 이전 보드에서 보내지 못한 수를 넘기지 않는다
+            pendingMoves.length = 0;
+            window.refreshTiles = null;
+            resizeTiles = null;
+            if (gameBoard.classList.contains('tiled')) {
+                initTiledBoard(gameBoard);
+            }
+
+            // chord: 열린 숫자 칸을 누르면 나머지 주변 칸을 한 번에 연다.
+            // 칸은 공개되며 상태가 바뀌므로 보드 하나에 위임 리스너 하나만 둔다
+            gameBoard.addEventListener('click', e => {
+                const cell = e.target.closest('.cell.revealed');
+                if (cell && /\bcolor-[1-8]\b/.test(cell.className)) {
+                    chordCell(cell);
+                }
+            });
+        }
+
+        bindCellEvents(document);
+        openGameSocket();
+    }
+
+    if (window.htmx) {
+        // 처음 로드(body)와 스왑된 내용마다 호출된다
+        htmx.onLoad(function(content) {
+            if (content.id === 'game-board' || (content.querySelector && content.querySelector('#game-board'))) {
+                initBoard();
+            } else if (content.querySelectorAll) {
+                bindCellEvents(content);
+            }
+        });
+    } else {
+        document.addEventListener('DOMContentLoaded', initBoard);
+    }
+})();
@@ -0,0 +1,884 @@
+// 힌트 함수들 (early definition)
+function getHintCount(difficulty) {
+    const key = `minesweeper_hints_${difficulty}`;
+    const value = localStorage.getItem(key);
+    return parseInt(value || '0', 10);
+}
+
+function setHintCount(difficulty, count) {
+    const key = `minesweeper_hints_${difficulty}`;
+    localStorage.setItem(key, String(Math.max(0, count)));
+    updateHintButton();
+}
+
+function initHints() {
+    const statusBar = document.getElementById('status-bar');
+    if (!statusBar) return;
+    
+    const difficulty = statusBar.dataset.difficulty;
+    const gameId = statusBar.dataset.gameId || difficulty + '_' + Date.now();
+    const lastGameId = localStorage.getItem('minesweeper_last_game_id');
+    
+    // 새 게임일 때만 힌트 초기화
+    if (gameId !== lastGameId) {
+        const key = `minesweeper_hints_${difficulty}`;
+        let defaultHints = 0;
+        if (difficulty === 'easy') {
+            defaultHints = 5;
+        } else if (difficulty === 'medium') {
+            defaultHints = 3;
+        } else if (difficulty === 'hard') {
+            defaultHints = 1;
+        }
+        localStorage.setItem(key, String(defaultHints));
+        localStorage.setItem('minesweeper_last_game_id', gameId);
+    }
+    
+    updateHintButton();
+}
+
+function updateHintButton() {
+    const statusBar = document.getElementById('status-bar');
+    if (!statusBar) return;
+    
+    const difficulty = statusBar.dataset.difficulty;
+    const hints = getHintCount(difficulty);
+    
+    const hintCount = document.getElementById('hint-count');
+    const hintBtn = document.getElementById('hint-btn');
+    
+    if (hintCount) hintCount.textContent = hints;
+    if (hintBtn) {
+        const isGameOver = statusBar.dataset.gameOver === 'true';
+        const isWon = statusBar.dataset.won === 'true';
+        hintBtn.disabled = hints <= 0 || isGameOver || isWon;
+    }
+}
+
+function useHint() {
+    const statusBar = document.getElementById('status-bar');
+    if (!statusBar) return;
+    
+    const difficulty = statusBar.dataset.difficulty;
+    const hints = getHintCount(difficulty);
+    
+    if (hints <= 0) {
+        alert('더 이상 힌트가 없습니다!');
+        return;
+    }
+    
+    // 버튼 비활성화 (중복 클릭 방지)
+    const hintBtn = document.getElementById('hint-btn');
+    if (hintBtn) hintBtn.disabled = true;
+    
+    // 서버에 힌트 요청
+    fetch('/hint/', {
+        headers: {
+            'X-CSRFToken': document.querySelector('[name=csrfmiddlewaretoken]')?.value || ''
+        }
+    })
+    .then(r => r.json())
+    .then(data => {
+        if (!data.success) {
+            if (hintBtn) hintBtn.disabled = false;
+            return;
+        }
+        
+        // 힌트로 공개된 칸(빈 칸이면 주변 영역 포함)과 상태 바 갱신
+        if (typeof window.applyGameDelta === 'function') {
+            window.applyGameDelta(data);
+        }
+
+        // 힌트 개수 감소 (서버 요청 성공 후)
+        setHintCount(difficulty, hints - 1);
+
+        // 버튼 다시 활성화 (승리 시에는 비활성 유지)
+        if (hintBtn) setTimeout(() => updateHintButton(), 100);
+    })
+    .catch(e => {
+        console.error('Hint error:', e);
+        if (hintBtn) hintBtn.disabled = false;
+    });
+}
+
+// 모바일 환경 감지
+function isMobile() {
+    return /Android|webOS|iPhone|iPad|iPod|BlackBerry|IEMobile|Opera Mini/i.test(navigator.userAgent);
+}
+
+// Tip 메시지 업데이트
+if (isMobile()) {
+    document.getElementById('tip-text').textContent = 'Tip: 셀을 꾹 눌러서 🚩를 꽂으세요!';
+}
+
+// 초기화 (롱프레스는 board.js에서 처리)
+document.addEventListener('DOMContentLoaded', function() {
+    initHints();
+
+    const modal = document.getElementById('game-end-modal');
+    if (modal) {
+        modal.addEventListener('click', function(e) {
+            if (e.target === modal) {
+                hideEndModal();
+            }
+        });
+    }
+});
+
+function updateThemeToggleState(isDarkMode) {
+    const button = document.getElementById('theme-toggle');
+    const icon = document.getElementById('theme-icon');
+    const text = document.getElementById('theme-text');
+    if (!button || !icon || !text) {
+        return;
+    }
+    button.setAttribute('aria-pressed', String(isDarkMode));
+    icon.textContent = isDarkMode ? '☀️' : '🌙';
+    text.textContent = isDarkMode ? '라이트 모드 전환' : '다크 모드 전환';
+}
+
+function checkWinState() {
+    const statusBar = document.getElementById('status-bar');
+    if (!statusBar) {
+        updateEndModal();
+        return;
+    }
+    const won = statusBar.dataset.won === 'true';
+    const gameOver = statusBar.dataset.gameOver === 'true';
+    
+    // 승리 또는 패배 시 통계 업데이트 (한 번만)
+    if ((won || gameOver) && !window.__minesweeperStatsSaved) {
+        window.__minesweeperStatsSaved = true;
+        checkAndSaveBestTime();
+        
+        // 승리 시 꽃가루 효과
+        if (won) {
+            launchConfetti();
+        }
+    }
+    
+    // 새 게임 시작 시 플래그 리셋
+    if (!won && !gameOver) {
+        window.__minesweeperStatsSaved = false;
+    }
+    
+    updateEndModal();
+}
+
+function showEndModal() {
+    const modal = document.getElementById('game-end-modal');
+    if (!modal) {
+        return;
+    }
+    modal.classList.add('is-visible');
+    modal.setAttribute('aria-hidden', 'false');
+}
+
+function hideEndModal() {
+    const modal = document.getElementById('game-end-modal');
+    if (!modal) {
+        return;
+    }
+    modal.classList.remove('is-visible');
+    modal.setAttribute('aria-hidden', 'true');
+}
+
+function updateEndModal() {
+    const statusBar = document.getElementById('status-bar');
+    const modal = document.getElementById('game-end-modal');
+    if (!modal) {
+        return;
+    }
+    if (!statusBar) {
+        hideEndModal();
+        return;
+    }
+
+    const won = statusBar.dataset.won === 'true';
+    const gameOver = statusBar.dataset.gameOver === 'true';
+
+    if (!won && !gameOver) {
+        hideEndModal();
+        return;
+    }
+
+    const title = document.getElementById('game-end-title');
+    const message = document.getElementById('game-end-message');
+    const timeValue = document.getElementById('game-end-time');
+    const restartLink = document.getElementById('modal-restart');
+
+    if (title) {
+        title.textContent = won ? '🎉 승리' : '💥 게임 오버';
+    }
+    if (message) {
+        message.textContent = won ? '멋진 승리입니다!' : '다시 도전해볼까요?';
+    }
+
+    const data = readTimerData();
+    if (data && data.startTs) {
+        const now = Date.now() / 1000;
+        const endTime = data.endTs || now;
+        let elapsed = endTime - data.startTs - pauseAccum;
+        if (isPaused && pauseStartTime) {
+            elapsed -= Math.max(0, endTime - pauseStartTime);
+        }
+        if (timeValue) {
+            timeValue.textContent = formatElapsed(elapsed);
+        }
+    }
+
+    if (restartLink) {
+        const newGameLink = statusBar.querySelector('.status-actions a');
+        if (newGameLink) {
+            restartLink.href = newGameLink.href;
+        }
+    }
+
+    showEndModal();
+}
+
+function getBestTime(difficulty) {
+    const key = `minesweeper_best_${difficulty}`;
+    const saved = localStorage.getItem(key);
+    return saved ? parseInt(saved, 10) : null;
+}
+
+function setBestTime(difficulty, seconds) {
+    const key = `minesweeper_best_${difficulty}`;
+    localStorage.setItem(key, String(seconds));
+}
+
+function getStats() {
+    const total = parseInt(localStorage.getItem('minesweeper_total_games') || '0', 10);
+    const wins = parseInt(localStorage.getItem('minesweeper_total_wins') || '0', 10);
+    const currentStreak = parseInt(localStorage.getItem('minesweeper_current_streak') || '0', 10);
+    const bestStreak = parseInt(localStorage.getItem('minesweeper_best_streak') || '0', 10);
+    return { total, wins, currentStreak, bestStreak };
+}
+
+function incrementStat(key) {
+    const current = parseInt(localStorage.getItem(key) || '0', 10);
+    localStorage.setItem(key, String(current + 1));
+}
+
+function getAverageTime(difficulty) {
+    const key = `minesweeper_times_${difficulty}`;
+    const timesStr = localStorage.getItem(key);
+    if (!timesStr) return null;
+    
+    const times = JSON.parse(timesStr);
+    if (times.length === 0) return null;
+    
+    const sum = times.reduce((a, b) => a + b, 0);
+    return Math.floor(sum / times.length);
+}
+
+function addTimeRecord(difficulty, seconds) {
+    const key = `minesweeper_times_${difficulty}`;
+    const timesStr = localStorage.getItem(key);
+    let times = timesStr ? JSON.parse(timesStr) : [];
+    
+    times.push(seconds);
+    // 최근 20개만 유지
+    if (times.length > 20) {
+        times = times.slice(-20);
+    }
+    
+    localStorage.setItem(key, JSON.stringify(times));
+}
+
+function addRecentGame(difficulty, won, seconds) {
+    console.log('addRecentGame 실행:', { difficulty, won, seconds });
+    const key = 'minesweeper_recent_games';
+    const gamesStr = localStorage.getItem(key);
+    let games = gamesStr ? JSON.parse(gamesStr) : [];
+    
+    games.unshift({
+        difficulty,
+        won,
+        seconds,
+        timestamp: Date.now()
+    });
+    
+    // 최근 10개만 유지
+    if (games.length > 10) {
+        games = games.slice(0, 10);
+    }
+    
+    localStorage.setItem(key, JSON.stringify(games));
+    console.log('localStorage 저장 완료, 총', games.length, '개');
+    
+    // 즉시 UI 업데이트
+    updateRecentGames();
+}
+
+function updateRecentGames() {
+    const container = document.getElementById('recent-games');
+    if (!container) {
+        return;
+    }
+    
+    const key = 'minesweeper_recent_games';
+    const gamesStr = localStorage.getItem(key);
+    const games = gamesStr ? JSON.parse(gamesStr) : [];
+    
+    if (games.length === 0) {
+        container.innerHTML = '<p style="text-align: center; color: var(--tip-color); font-size: 0.9rem;">기록 없음</p>';
+        return;
+    }
+    
+    const diffIcons = {
+        'easy': '🟢',
+        'medium': '🟡',
+        'hard': '🔴',
+        'custom': '⚙️'
+    };
+    
+    container.innerHTML = games.map(game => {
+        const icon = diffIcons[game.difficulty] || '⚪';
+        const result = game.won ? '✓' : '✗';
+        const diffName = game.difficulty.charAt(0).toUpperCase() + game.difficulty.slice(1);
+        const time = formatElapsed(game.seconds);
+        
+        return `
+            <div class="recent-game-item ${game.won ? 'win' : 'loss'}">
+                <div class="recent-game-info">
+                    <span>${result}</span>
+                    <span class="recent-game-difficulty">${icon} ${diffName}</span>
+                </div>
+                <span class="recent-game-time">${time}</span>
+            </div>
+        `;
+    }).join('');
+}
+
+function updateStreak(won) {
+    const currentStreak = parseInt(localStorage.getItem('minesweeper_current_streak') || '0', 10);
+    const bestStreak = parseInt(localStorage.getItem('minesweeper_best_streak') || '0', 10);
+    
+    if (won) {
+        const newStreak = currentStreak + 1;
+        localStorage.setItem('minesweeper_current_streak', String(newStreak));
+        
+        if (newStreak > bestStreak) {
+            localStorage.setItem('minesweeper_best_streak', String(newStreak));
+        }
+    } else {
+        localStorage.setItem('minesweeper_current_streak', '0');
+    }
+}
+
+function updateRecordsPanel() {
+    // 베스트 타임 업데이트
+    const difficulties = ['easy', 'medium', 'hard'];
+    difficulties.forEach(diff => {
+        const bestSeconds = getBestTime(diff);
+        const elem = document.getElementById(`best-${diff}`);
+        if (elem) {
+            if (bestSeconds !== null) {
+                elem.textContent = formatElapsed(bestSeconds);
+                elem.classList.remove('no-record');
+            } else {
+                elem.textContent = '--:--';
+                elem.classList.add('no-record');
+            }
+        }
+    });
+
+    // 통계 업데이트
+    const stats = getStats();
+    const totalElem = document.getElementById('stat-total');
+    const winsElem = document.getElementById('stat-wins');
+    const winrateElem = document.getElementById('stat-winrate');
+    const streakElem = document.getElementById('stat-streak');
+    const bestStreakElem = document.getElementById('stat-best-streak');
+
+    if (totalElem) totalElem.textContent = stats.total;
+    if (winsElem) winsElem.textContent = stats.wins;
+    if (winrateElem) {
+        const winrate = stats.total > 0 ? Math.round((stats.wins / stats.total) * 100) : 0;
+        winrateElem.textContent = `${winrate}%`;
+    }
+    if (streakElem) streakElem.textContent = stats.currentStreak;
+    if (bestStreakElem) bestStreakElem.textContent = stats.bestStreak;
+    
+    // 최근 게임 업데이트
+    updateRecentGames();
+}
+
+function checkAndSaveBestTime() {
+    const statusBar = document.getElementById('status-bar');
+    if (!statusBar) {
+        return;
+    }
+    
+    const difficulty = statusBar.dataset.difficulty;
+    const won = statusBar.dataset.won === 'true';
+    const gameOver = statusBar.dataset.gameOver === 'true';
+    
+    console.log('checkAndSaveBestTime 호출:', { difficulty, won, gameOver });
+    
+    // 게임이 끝났을 때만 통계 업데이트
+    if (!won && !gameOver) {
+        return;
+    }
+    
+    // 통계 업데이트
+    incrementStat('minesweeper_total_games');
+    if (won) {
+        incrementStat('minesweeper_total_wins');
+    }
+    
+    // 연속 승리 업데이트
+    updateStreak(won);
+    
+    const data = readTimerData();
+    let currentSeconds = 0;
+    
+    if (data && data.startTs && data.endTs) {
+        currentSeconds = Math.floor(data.endTs - data.startTs - pauseAccum);
+    }
+    
+    console.log('난이도 체크:', { difficulty, isCustom: difficulty === 'custom', currentSeconds });
+    
+    // 최근 게임 기록 추가 (모든 난이도 포함)
+    console.log('addRecentGame 호출 시도');
+    addRecentGame(difficulty, won, currentSeconds);
+    
+    // 커스텀 난이도는 베스트 타임 제외
+    if (difficulty === 'custom' || !won) {
+        updateRecordsPanel();
+        return;
+    }
+    
+    const bestSeconds = getBestTime(difficulty);
+    
+    if (bestSeconds === null || currentSeconds < bestSeconds) {
+        setBestTime(difficulty, currentSeconds);
+        
+        // 신기록 뱃지 표시
+        const bestElem = document.getElementById(`best-${difficulty}`);
+        if (bestElem && !bestElem.querySelector('.new-record-badge')) {
+            const badge = document.createElement('span');
+            badge.className = 'new-record-badge';
+            badge.textContent = 'NEW!';
+            bestElem.parentElement.appendChild(badge);
+            
+            setTimeout(() => {
+                badge.remove();
+            }, 5000);
+        }
+        
+        // 신기록 메시지
+        const statusText = statusBar.querySelector('span:first-child');
+        if (statusText) {
+            const originalText = statusText.textContent;
+            statusText.textContent = '🎉 신기록!';
+            setTimeout(() => {
+                statusText.textContent = originalText;
+            }, 3000);
+        }
+    }
+    
+    updateRecordsPanel();
+}
+
+let timerIntervalId = null;
+let isPaused = false;
+let pauseStartTime = null;
+let pauseAccum = 0;
+let lastStartTs = null;
+
+function savePauseState() {
+    window.__pauseState = {
+        isPaused,
+        pauseStartTime,
+        pauseAccum,
+        lastStartTs,
+    };
+}
+
+function loadPauseState() {
+    if (!window.__pauseState) {
+        return;
+    }
+    isPaused = !!window.__pauseState.isPaused;
+    pauseStartTime = window.__pauseState.pauseStartTime || null;
+    pauseAccum = window.__pauseState.pauseAccum || 0;
+    lastStartTs = window.__pauseState.lastStartTs || lastStartTs;
+}
+
+function resetPauseState() {
+    isPaused = false;
+    pauseStartTime = null;
+    pauseAccum = 0;
+    savePauseState();
+}
+
+function applyPauseButtonState() {
+    const pauseBtn = document.getElementById('pause-btn');
+    if (!pauseBtn) {
+        return;
+    }
+    const pauseIcon = pauseBtn.querySelector('.pause-icon');
+    const playIcon = pauseBtn.querySelector('.play-icon');
+
+    if (isPaused) {
+        pauseBtn.classList.add('paused');
+        if (pauseIcon) {
+            pauseIcon.style.display = 'none';
+        }
+        if (playIcon) {
+            playIcon.style.display = '';
+        }
+    } else {
+        pauseBtn.classList.remove('paused');
+        if (pauseIcon) {
+            pauseIcon.style.display = '';
+        }
+        if (playIcon) {
+            playIcon.style.display = 'none';
+        }
+    }
+}
+
+function formatElapsed(seconds) {
+    const safeSeconds = Math.max(0, Math.floor(seconds || 0));
+    const mins = Math.floor(safeSeconds / 60);
+    const secs = safeSeconds % 60;
+    return `${String(mins).padStart(2, '0')}:${String(secs).padStart(2, '0')}`;
+}
+
+function readTimerData() {
+    const statusBar = document.getElementById('status-bar');
+    if (!statusBar) {
+        return null;
+    }
+    const startTs = parseFloat(statusBar.dataset.startTs || '');
+    const endTs = parseFloat(statusBar.dataset.endTs || '');
+    return {
+        statusBar,
+        startTs: Number.isFinite(startTs) ? startTs : null,
+        endTs: Number.isFinite(endTs) ? endTs : null,
+    };
+}
+
+function updateTimerDisplay() {
+    const data = readTimerData();
+    if (!data) {
+        return;
+    }
+    const { statusBar, startTs, endTs } = data;
+    const timerValue = statusBar.querySelector('#timer-value');
+    if (!timerValue || !startTs) {
+        return;
+    }
+
+    const now = Date.now() / 1000;
+    let elapsed = now - startTs - pauseAccum;
+
+    if (isPaused && pauseStartTime) {
+        elapsed -= (now - pauseStartTime);
+    }
+
+    if (endTs) {
+        elapsed = endTs - startTs - pauseAccum;
+        if (isPaused && pauseStartTime) {
+            elapsed -= Math.max(0, endTs - pauseStartTime);
+        }
+    }
+
+    timerValue.textContent = formatElapsed(elapsed);
+}
+
+function initTimer() {
+    if (timerIntervalId) {
+        clearInterval(timerIntervalId);
+        timerIntervalId = null;
+    }
+
+    const data = readTimerData();
+    if (!data || !data.startTs) {
+        return;
+    }
+
+    if (lastStartTs !== data.startTs) {
+        lastStartTs = data.startTs;
+        resetPauseState();
+    } else {
+        loadPauseState();
+    }
+
+    applyPauseButtonState();
+    updateTimerDisplay();
+
+    if (!data.endTs && !isPaused) {
+        timerIntervalId = setInterval(() => {
+            updateTimerDisplay();
+            const latest = readTimerData();
+            if (latest && latest.endTs) {
+                updateTimerDisplay();
+                clearInterval(timerIntervalId);
+                timerIntervalId = null;
+            }
+        }, 1000);
+    }
+}
+
+window.initTimer = initTimer;
+
+function togglePause() {
+    const data = readTimerData();
+    if (!data || !data.startTs || data.endTs) {
+        return;
+    }
+
+    const now = Date.now() / 1000;
+
+    if (!isPaused) {
+        isPaused = true;
+        pauseStartTime = now;
+
+        if (timerIntervalId) {
+            clearInterval(timerIntervalId);
+            timerIntervalId = null;
+        }
+    } else {
+        if (pauseStartTime) {
+            pauseAccum += (now - pauseStartTime);
+        }
+        pauseStartTime = null;
+        isPaused = false;
+
+        timerIntervalId = setInterval(() => {
+            updateTimerDisplay();
+            const latest = readTimerData();
+            if (latest && latest.endTs) {
+                updateTimerDisplay();
+                clearInterval(timerIntervalId);
+                timerIntervalId = null;
+            }
+        }, 1000);
+    }
+
+    savePauseState();
+    applyPauseButtonState();
+    updateTimerDisplay();
+}
+
+window.togglePause = togglePause;
+
+function clearAllRecords() {
+    if (!confirm('모든 기록을 삭제하시겠습니까?\n\n이 작업은 취소할 수 없습니다.')) {
+        return;
+    }
+
+    // 모든 localStorage 데이터 삭제
+    localStorage.removeItem('minesweeper_best_easy');
+    localStorage.removeItem('minesweeper_best_medium');
+    localStorage.removeItem('minesweeper_best_hard');
+    localStorage.removeItem('minesweeper_total_games');
+    localStorage.removeItem('minesweeper_total_wins');
+    localStorage.removeItem('minesweeper_current_streak');
+    localStorage.removeItem('minesweeper_best_streak');
+    localStorage.removeItem('minesweeper_times_easy');
+    localStorage.removeItem('minesweeper_times_medium');
+    localStorage.removeItem('minesweeper_times_hard');
+    localStorage.removeItem('minesweeper_recent_games');
+
+    // UI 업데이트
+    updateRecordsPanel();
+
+    // 피드백
+    alert('모든 기록이 초기화되었습니다.');
+}
+
+function toggleRecordsPanel() {
+    const recordsPanel = document.getElementById('records-panel');
+    const overlay = document.getElementById('records-overlay');
+    
+    if (!recordsPanel) {
+        return;
+    }
+
+    const isOpen = recordsPanel.classList.contains('is-open');
+    
+    if (isOpen) {
+        recordsPanel.classList.remove('is-open');
+        if (overlay) {
+            overlay.classList.remove('is-visible');
+        }
+    } else {
+        recordsPanel.classList.add('is-open');
+        if (overlay) {
+            overlay.classList.add('is-visible');
+        }
+        updateRecordsPanel();
+    }
+}
+
+function toggleHelpPanel() {
+    const helpPanel = document.getElementById('help-panel');
+    const overlay = document.getElementById('records-overlay');
+    
+    if (!helpPanel) {
+        return;
+    }
+
+    const isOpen = helpPanel.classList.contains('is-open');
+    
+    if (isOpen) {
+        helpPanel.classList.remove('is-open');
+        if (overlay) {
+            overlay.classList.remove('is-visible');
+        }
+    } else {
+        // 기록 패널이 열려있으면 닫기
+        const recordsPanel = document.getElementById('records-panel');
+        if (recordsPanel && recordsPanel.classList.contains('is-open')) {
+            recordsPanel.classList.remove('is-open');
+        }
+        
+        helpPanel.classList.add('is-open');
+        if (overlay) {
+            overlay.classList.add('is-visible');
+        }
+    }
+}
+
+function closeAllPanels() {
+    const recordsPanel = document.getElementById('records-panel');
+    const helpPanel = document.getElementById('help-panel');
+    const overlay = document.getElementById('records-overlay');
+    
+    if (recordsPanel) {
+        recordsPanel.classList.remove('is-open');
+    }
+    if (helpPanel) {
+        helpPanel.classList.remove('is-open');
+    }
+    if (overlay) {
+        overlay.classList.remove('is-visible');
+    }
+}
+
+function launchConfetti() {
+    if (window.matchMedia('(prefers-reduced-motion: reduce)').matches) {
+        return;
+    }
+    const container = document.createElement('div');
+    container.className = 'confetti-container';
+    const colors = ['#ff6b6b', '#feca57', '#48dbfb', '#1dd1a1', '#5f27cd'];
+    const total = 40;
+    for (let i = 0; i < total; i++) {
+        const piece = document.createElement('div');
+        piece.className = 'confetti-piece';
+        piece.style.left = `${Math.random() * 100}%`;
+        piece.style.backgroundColor = colors[i % colors.length];
+        piece.style.animationDuration = `${1.2 + Math.random()}s`;
+        piece.style.animationDelay = `${Math.random() * 0.2}s`;
+        piece.style.transform = `translateY(-10vh) rotate(${Math.random() * 360}deg)`;
+        container.appendChild(piece);
+    }
+    document.body.appendChild(container);
+    setTimeout(() => container.remove(), 2000);
+}
+
+// 다크모드 초기화
+function initDarkMode() {
+    const isDarkMode = localStorage.getItem('darkMode') === 'true';
+    if (isDarkMode) {
+        document.body.classList.add('dark-mode');
+        document.documentElement.classList.add('dark-mode');
+    }
+    updateThemeToggleState(isDarkMode);
+}
+
+// 다크모드 토글
+function toggleDarkMode() {
+    const body = document.body;
+    const isDarkMode = !body.classList.contains('dark-mode');
+    
+    // 성능 향상을 위해 리플로우 최소화
+    requestAnimationFrame(() => {
+        // 클래스 변경 한 번에 처리
+        if (isDarkMode) {
+            body.classList.add('dark-mode');
+            document.documentElement.classList.add('dark-mode');
+        } else {
+            body.classList.remove('dark-mode');
+            document.documentElement.classList.remove('dark-mode');
+        }
+        
+        localStorage.setItem('darkMode', isDarkMode);
+        updateThemeToggleState(isDarkMode);
+    });
+}
+
+if (window.htmx) {
+    htmx.on('htmx:afterSwap', function() {
+        checkWinState();
+        initTimer();
+        updateRecordsPanel();
+        initHints();
+        
+        // 일시 정지 버튼 이벤트 재연결
+        const pauseBtn = document.getElementById('pause-btn');
+        if (pauseBtn) {
+            pauseBtn.removeEventListener('click', togglePause);
+            pauseBtn.addEventListener('click', togglePause);
+        }
+    });
+    htmx.on('htmx:oobAfterSwap', function() {
+        checkWinState();
+        initTimer();
+        updateRecordsPanel();
+        initHints();
+        
+        // 일시 정지 버튼 이벤트 재연결
+        const pauseBtn = document.getElementById('pause-btn');
+        if (pauseBtn) {
+            pauseBtn.removeEventListener('click', togglePause);
+            pauseBtn.addEventListener('click', togglePause);
+        }
+    });
+}
+
+// 커스텀 난이도 입력 검증 (칸 수는 저장소가 담을 수 있는 크기까지, 지뢰 수는 칸 수 - 1까지)
+function validateCustomDifficulty() {
+    const rows = parseInt(document.getElementById('rows').value, 10) || 5;
+    const cols = parseInt(document.getElementById('cols').value, 10) || 5;
+    const mines = parseInt(document.getElementById('mines').value, 10) || 1;
+    const maxCells = parseInt(document.querySelector('.difficulty-form').dataset.maxCells, 10) || Infinity;
+    const maxMines = rows * cols - 1;
+
+    const minesInput = document.getElementById('mines');
+    const startBtn = document.getElementById('start-btn');
+
+    minesInput.max = maxMines;
+
+    const isInvalid = mines > maxMines || rows * cols > maxCells;
+    startBtn.disabled = isInvalid;
+    startBtn.style.opacity = isInvalid ? '0.5' : '1';
+    startBtn.style.cursor = isInvalid ? 'not-allowed' : 'pointer';
+}
+
+// 페이지 로드 시 다크모드 설정 적용
+initDarkMode();
+checkWinState();
+initTimer();
+updateRecordsPanel();
+initHints();
+
+// 일시 정지 버튼 이벤트 연결
+const pauseBtn = document.getElementById('pause-btn');
+if (pauseBtn) {
+    pauseBtn.addEventListener('click', togglePause);
+}
+
+// 커스텀 난이도 입력 검증 연결
+const difficultyForm = document.querySelector('.difficulty-form');
+if (difficultyForm) {
+    difficultyForm.addEventListener('input', validateCustomDifficulty);
+    validateCustomDifficulty();
+}
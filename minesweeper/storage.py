@@ -0,0 +1,19 @@
+"""
+정적 파일 저장소
+
+collectstatic을 실행한 환경에서는 WhiteNoise의 CompressedManifestStaticFilesStorage와
+같다 (내용 해시 이름 + .gz/.br). manifest가 없거나 항목이 빠진 환경(collectstatic
+결과가 함께 배포되지 않은 서버리스 함수 등)에서는 예외 대신 해시 없는 이름을 쓴다.
+"""
+from whitenoise.storage import CompressedManifestStaticFilesStorage
+
+
+class FallbackManifestStaticFilesStorage(CompressedManifestStaticFilesStorage):
+    manifest_strict = False
+
+    def hashed_name(self, name, content=None, filename=None):
+        try:
+            return super().hashed_name(name, content, filename)
+        except ValueError:
+            # STATIC_ROOT에 파일이 없어 해시를 계산할 수 없음: 원래 이름으로 링크
+            return name
@@ -0,0 +1,283 @@
+"""
+게임 상태 저장소
+
+settings.MINESWEEPER_GAME_STORE로 백엔드를 고른다.
+- 'cookie'   : 서명 쿠키 세션에 상태 전체를 저장 (서버리스 배포용 기본값)
+- 'memory'   : 프로세스 내 LRU + TTL. Game 객체를 그대로 보관해 직렬화가 없다
+- 'database' : DATABASES의 기본 DB에 저장 (SQLite 등)
+- 'cache'    : Django 캐시 프레임워크 (FileBasedCache/Redis 등 공유 캐시 대용)
+쿠키 이외의 백엔드에서는 세션(쿠키)에 game_id만 남는다.
+"""
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from contextlib import nullcontext
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .engine import MAX_CELLS, Game
+
+# cookie 백엔드: 압축된 상태 전체 / 나머지: game_id만
+GAME_SESSION_KEY = 'game'
+GAME_ID_SESSION_KEY = 'game_id'
+# 모든 백엔드: 게임 결과 기록용 익명 플레이어 id
+PLAYER_SESSION_KEY = 'player_id'
+
+DEFAULT_OPTIONS = {
+    'ttl': 60 * 60 * 24,      # 마지막 접근 후 이 시간(초)이 지나면 버려진 게임으로 보고 제거
+    'max_entries': 10000,     # memory: LRU 최대 게임 수
+    'purge_interval': 200,    # database: 저장 N번마다 만료 게임 일괄 삭제
+    'cache_alias': 'default', # cache: 사용할 CACHES 별칭
+}
+
+# cookie 백엔드로 만들 수 있는 보드의 최대 칸 수. 30x30에서 모든 칸을 하나씩 열고 지뢰마다
+# 깃발을 꽂아도 압축한 상태가 약 3KB라, 서명을 붙여도 쿠키 한 개(4KB)에 들어간다
+COOKIE_MAX_CELLS = 30 * 30
+
+
+class CookieGameStore:
+    """세션에 압축 상태 전체를 저장 (기존 방식)"""
+
+    max_cells = COOKIE_MAX_CELLS
+
+    def __init__(self, **options):
+        pass
+
+    def check_size(self, game):
+        """쿠키에 담을 수 없는 크기의 보드이면 ValueError"""
+        if game.size > self.max_cells:
+            raise ValueError(
+                f'쿠키 저장소에서는 보드를 최대 {self.max_cells}칸까지 만들 수 있습니다. '
+                '더 큰 보드는 서버 측 저장소(MINESWEEPER_GAME_STORE=memory/database/cache)가 필요합니다.'
+            )
+
+    def load(self, request):
+        token = request.session.get(GAME_SESSION_KEY)
+        if not token:
+            return None
+        try:
+            return Game.deserialize(token)
+        except ValueError:
+            # 이전 형식이거나 손상된 상태는 새 게임으로 취급
+            del request.session[GAME_SESSION_KEY]
+            return None
+
+    def save(self, request, game):
+        request.session[GAME_SESSION_KEY] = game.serialize()
+
+    def discard(self, request):
+        request.session.pop(GAME_SESSION_KEY, None)
+
+    def lock(self, game_id):
+        # 요청마다 쿠키에서 새 Game을 만들므로 공유되는 객체가 없다
+        return nullcontext()
+
+
+class ServerGameStore:
+    """세션에는 game_id만 두고 상태는 get/set/delete로 서버 측에 저장하는 백엔드의 기반"""
+
+    max_cells = MAX_CELLS
+
+    def __init__(self, ttl=DEFAULT_OPTIONS['ttl'], **options):
+        self.ttl = ttl
+
+    def check_size(self, game):
+        # 크기 제한은 Game.__init__의 MAX_SIDE/MAX_CELLS뿐
+        pass
+
+    def load(self, request):
+        game_id = request.session.get(GAME_ID_SESSION_KEY)
+        if not game_id:
+            return None
+        return self.get(game_id)
+
+    def save(self, request, game):
+        self.set(game)
+        # 같은 게임이면 세션을 다시 쓰지 않는다 (쿠키 재발급 방지)
+        if request.session.get(GAME_ID_SESSION_KEY) != game.game_id:
+            request.session[GAME_ID_SESSION_KEY] = game.game_id
+
+    def discard(self, request):
+        game_id = request.session.pop(GAME_ID_SESSION_KEY, None)
+        if game_id:
+            self.delete(game_id)
+
+    def get(self, game_id):
+        raise NotImplementedError
+
+    def set(self, game):
+        raise NotImplementedError
+
+    def delete(self, game_id):
+        raise NotImplementedError
+
+    def lock(self, game_id):
+        """같은 게임을 읽고-바꾸고-저장하는 동안 잡는 잠금 (get이 복사본을 주는 백엔드는 필요 없음)"""
+        return nullcontext()
+
+
+class MemoryGameStore(ServerGameStore):
+    """프로세스 내 LRU + TTL 저장소. 워커 하나(또는 공유 프로세스)에서만 유효"""
+
+    def __init__(self, max_entries=DEFAULT_OPTIONS['max_entries'], **options):
+        super().__init__(**options)
+        self.max_entries = max_entries
+        self._games = OrderedDict()   # game_id -> (만료 시각, Game), 오래 안 쓴 순
+        self._lock = threading.Lock()
+        # get이 보관 중인 Game 객체 자체를 돌려주므로, 바꾸는 요청은 게임별 잠금 안에서만
+        self._game_locks = weakref.WeakValueDictionary()
+
+    def get(self, game_id):
+        with self._lock:
+            entry = self._games.get(game_id)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self._games[game_id]
+                return None
+            self._games.move_to_end(game_id)
+            return entry[1]
+
+    def set(self, game):
+        now = time.monotonic()
+        with self._lock:
+            self._games[game.game_id] = (now + self.ttl, game)
+            self._games.move_to_end(game.game_id)
+            # 앞쪽이 가장 오래 접근하지 않은 게임: 만료분과 초과분을 앞에서부터 제거
+            while self._games:
+                expires_at, _ = next(iter(self._games.values()))
+                if expires_at >= now and len(self._games) <= self.max_entries:
+                    break
+                self._games.popitem(last=False)
+
+    def delete(self, game_id):
+        with self._lock:
+            self._games.pop(game_id, None)
+
+    def lock(self, game_id):
+        if not game_id:
+            return nullcontext()
+        with self._lock:
+            lock = self._game_locks.get(game_id)
+            if lock is None:
+                lock = self._game_locks[game_id] = threading.Lock()
+            return lock
+
+    def __len__(self):
+        return len(self._games)
+
+
+class DatabaseGameStore(ServerGameStore):
+    """DATABASES 기본 DB의 GameState 테이블에 저장"""
+
+    def __init__(self, purge_interval=DEFAULT_OPTIONS['purge_interval'], **options):
+        super().__init__(**options)
+        self.purge_interval = purge_interval
+        self._saves = 0
+
+    def _cutoff(self):
+        return timezone.now() - timedelta(seconds=self.ttl)
+
+    def get(self, game_id):
+        from .models import GameState
+
+        data = (
+            GameState.objects
+            .filter(game_id=game_id, updated_at__gte=self._cutoff())
+            .values_list('data', flat=True)
+            .first()
+        )
+        if data is None:
+            return None
+        try:
+            return Game.deserialize(data)
+        except ValueError:
+            return None
+
+    def set(self, game):
+        from .models import GameState
+
+        GameState.objects.update_or_create(
+            game_id=game.game_id,
+            defaults={'data': game.serialize()},
+        )
+        self._saves += 1
+        if self._saves % self.purge_interval == 0:
+            self.purge_expired()
+
+    def delete(self, game_id):
+        from .models import GameState
+
+        GameState.objects.filter(game_id=game_id).delete()
+
+    def purge_expired(self):
+        """TTL이 지난(버려진) 게임을 일괄 삭제. updated_at 인덱스를 사용"""
+        from .models import GameState
+
+        return GameState.objects.filter(updated_at__lt=self._cutoff()).delete()[0]
+
+
+class CacheGameStore(ServerGameStore):
+    """Django 캐시에 저장. 만료/용량 초과 정리는 캐시 백엔드가 맡는다"""
+
+    key_prefix = 'minesweeper:game:'
+
+    def __init__(self, cache_alias=DEFAULT_OPTIONS['cache_alias'], **options):
+        super().__init__(**options)
+        self.cache_alias = cache_alias
+
+    @property
+    def cache(self):
+        return caches[self.cache_alias]
+
+    def get(self, game_id):
+        data = self.cache.get(self.key_prefix + game_id)
+        if data is None:
+            return None
+        try:
+            return Game.deserialize(data)
+        except ValueError:
+            return None
+
+    def set(self, game):
+        # 접근할 때마다 다시 저장하므로 TTL은 마지막 접근 기준
+        self.cache.set(self.key_prefix + game.game_id, game.serialize(), self.ttl)
+
+    def delete(self, game_id):
+        self.cache.delete(self.key_prefix + game_id)
+
+
+STORE_BACKENDS = {
+    'cookie': CookieGameStore,
+    'memory': MemoryGameStore,
+    'database': DatabaseGameStore,
+    'cache': CacheGameStore,
+}
+
+_store = None
+
+
+def get_store():
+    """설정된 게임 상태 저장소 (프로세스당 하나)"""
+    global _store
+    if _store is None:
+        backend = settings.MINESWEEPER_GAME_STORE
+        backend_class = STORE_BACKENDS.get(backend) or import_string(backend)
+        options = {**DEFAULT_OPTIONS, **settings.MINESWEEPER_GAME_STORE_OPTIONS}
+        _store = backend_class(**options)
+    return _store
+
+
+@receiver(setting_changed)
+def _reset_store(setting, **kwargs):
+    # 테스트에서 override_settings로 백엔드를 바꿀 수 있게 한다
+    global _store
+    if setting in ('MINESWEEPER_GAME_STORE', 'MINESWEEPER_GAME_STORE_OPTIONS'):
+        _store = None
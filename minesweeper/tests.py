@@ -1,3 +1,852 @@
-from django.test import TestCase
+import asyncio
+import json
+import random
+import threading
+import time
+from concurrent.futures import Future
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.test import TestCase, override_settings
+
+from .codec import MINE
+from .engine import MAX_SIDE, TILE_SIZE, Game
+from .factory import BoardFactory, get_factory, start_index
+from .models import DifficultyStats, GameResult
+from .generation import neighbor_indices
+from .protocol import MAX_BATCH_MOVES, MAX_TILES, cell_data, parse_tiles
+from .realtime import handle_text, websocket_application
+from .replay import get_replay
+from .results import record_result
+from .reveal import ZeroRegions, flood_fill
+from .shared import create_shared_game
+from .store import GAME_ID_SESSION_KEY, GAME_SESSION_KEY, PLAYER_SESSION_KEY, get_store
+from .views import DIFFICULTY_SETTINGS
+
+
+def play(game, rng, flags=0):
+    """안전한 칸을 임의 순서로 열어 끝까지 둔다. 처음 flags개의 지뢰에는 깃발을 꽂는다"""
+    game.reveal(game.rows // 2, game.cols // 2)
+    for i in [i for i in range(game.size) if game.board[i] == MINE][:flags]:
+        game.set_flag(*divmod(i, game.cols))
+    cells = list(range(game.size))
+    rng.shuffle(cells)
+    for i in cells:
+        if game.finished:
+            break
+        game.reveal(*divmod(i, game.cols))
+        game.check_counters()
+
+
+class CellDataTests(TestCase):
+    def test_hidden_cells_do_not_leak_board(self):
+        game = Game(9, 9, 10, seed=1)
+        game.reveal(4, 4)
+        game.set_flag(0, 0, True)
+        for index in range(game.size):
+            data = cell_data(game, index)
+            if game.revealed[index]:
+                self.assertEqual(data['is_mine'], game.value(index) == 9)
+            else:
+                self.assertEqual((data['is_mine'], data['value']), (False, ''))
+
+    def test_flag_response_does_not_leak_board(self):
+        self.client.get('/new_game/easy/')
+        self.client.get('/click/4/4/')
+        state = self.client.get('/api/game-state/').json()
+        hidden = [
+            cell for row in state['board_data'] for cell in row if not cell['is_revealed']
+        ]
+        self.assertTrue(hidden)
+        self.assertTrue(all(not cell['is_mine'] and cell['value'] == '' for cell in hidden))
+
+        cell = hidden[0]
+        data = self.client.get(f"/flag/{cell['row']}/{cell['col']}/").json()
+        self.assertEqual(
+            data['cells'],
+            [{'row': cell['row'], 'col': cell['col'], 'is_revealed': False, 'is_flagged': True,
+              'is_mine': False, 'value': ''}],
+        )
+
+
+class ResultTests(TestCase):
+    def finished_game(self, seed):
+        game = Game(8, 8, 10, 'easy', seed=seed)
+        play(game, random.Random(seed))
+        return game
+
+    def test_result_is_recorded_once(self):
+        game = self.finished_game(1)
+        self.assertIsNotNone(record_result(game, 'player'))
+        self.assertIsNone(record_result(game, 'player'))
+        self.assertEqual(GameResult.objects.count(), 1)
+        self.assertEqual(DifficultyStats.objects.get(category='easy').games, 1)
+
+    def test_stats_row_created_by_another_request(self):
+        # 집계 줄이 없다고 본 직후 다른 요청이 같은 줄을 만든 경우
+        DifficultyStats.objects.create(category='easy')
+        select_for_update = DifficultyStats.objects.select_for_update
+        calls = []
+
+        def racing():
+            calls.append(1)
+            return select_for_update().none() if len(calls) == 1 else select_for_update()
+
+        game = self.finished_game(2)
+        with mock.patch.object(DifficultyStats.objects, 'select_for_update', side_effect=racing):
+            self.assertIsNotNone(record_result(game, 'player'))
+        self.assertTrue(GameResult.objects.filter(game_id=game.game_id).exists())
+        self.assertEqual(DifficultyStats.objects.get(category='easy').games, 1)
+
+class IndexTests(TestCase):
+    def test_index_renders_without_manifest(self):
+        # collectstatic 결과가 없어도 (해시 없는 이름으로) 페이지를 그린다
+        response = self.client.get('/')
+        self.assertEqual(response.status_code, 200)
+        html = response.content.decode()
+        self.assertIn('minesweeper/js/main.js', html)
+        # 페이지의 JS는 모두 정적 파일로 받는다 (인라인 스크립트/핸들러 없음)
+        self.assertNotIn('<script>', html)
+        self.assertNotIn('oninput=', html)
+
+class ResetTests(TestCase):
+    def test_reset_keeps_player_id(self):
+        # 끝난 게임을 저장할 때 플레이어 id가 발급된다
+        self.client.get('/new_game/easy/')
+        for index in range(64):
+            if self.client.get(f'/click/{index // 8}/{index % 8}/').json()['game_over']:
+                break
+        player = self.client.session[PLAYER_SESSION_KEY]
+        self.client.get('/reset/')
+        self.assertEqual(self.client.session[PLAYER_SESSION_KEY], player)
+        self.assertNotIn(GAME_SESSION_KEY, self.client.session)
+
+
+class BoardSizeTests(TestCase):
+    def test_oversized_board_is_rejected(self):
+        for rows, cols in ((70000, 1), (2001, 10), (1001, 1000)):
+            with self.subTest(rows=rows, cols=cols):
+                with self.assertRaises(ValueError):
+                    Game(rows, cols, 1)
+                response = self.client.post('/new_game/', {'rows': rows, 'cols': cols, 'mines': 1})
+                self.assertEqual(response.status_code, 400)
+
+    def test_cookie_store_rejects_boards_it_cannot_hold(self):
+        response = self.client.post('/new_game/', {'rows': 31, 'cols': 30, 'mines': 10})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('서버 측 저장소', response.content.decode())
+        self.assertNotIn(GAME_SESSION_KEY, self.client.session)
+
+        # 가장 큰 보드를 끝까지 두어도 상태가 쿠키 한 개에 들어간다
+        self.client.post('/new_game/', {'rows': 30, 'cols': 30, 'mines': 270})
+        game = Game.deserialize(self.client.session[GAME_SESSION_KEY])
+        game.reveal(15, 15)
+        for i in range(game.size):
+            if game.board[i] == MINE:
+                game.set_flag(*divmod(i, game.cols))
+            else:
+                game.reveal(*divmod(i, game.cols))
+        self.assertLess(len(game.serialize()), 3500)
+
+    @override_settings(MINESWEEPER_GAME_STORE='memory')
+    def test_server_store_accepts_large_boards(self):
+        response = self.client.post('/new_game/', {'rows': 300, 'cols': 300, 'mines': 10})
+        self.assertEqual(response.status_code, 302)
+
+    def test_largest_board_round_trips(self):
+        game = Game(2000, 500, 10, seed=1)
+        game.reveal(0, 0)
+        self.assertEqual(Game.deserialize(game.serialize()).revealed, game.revealed)
+
+
+@override_settings(MINESWEEPER_GAME_STORE='memory', MINESWEEPER_CHECK_COUNTERS=True)
+class MemoryStoreLockTests(TestCase):
+    def test_moves_wait_for_game_lock(self):
+        self.client.post('/new_game/', {'rows': 20, 'cols': 20, 'mines': 200})
+        game_id = self.client.session[GAME_ID_SESSION_KEY]
+        store = get_store()
+        self.assertIs(store.lock(game_id), store.lock(game_id))
+        responses = []
+
+        def flag():
+            moves = [{'action': 'flag', 'row': 0, 'col': 0}]
+            responses.append(self.client.post('/api/moves/', {'moves': moves}, content_type='application/json'))
+
+        with store.lock(game_id):
+            thread = threading.Thread(target=flag)
+            thread.start()
+            thread.join(0.2)
+            # 잠금을 잡고 있는 동안에는 게임을 바꾸지 못한다
+            self.assertTrue(thread.is_alive())
+            self.assertEqual(store.get(game_id).flag_count, 0)
+        thread.join()
+
+        self.assertEqual(responses[0].status_code, 200)
+        game = store.get(game_id)
+        game.check_counters()
+        self.assertEqual(game.flag_count, 1)
+
+    def test_socket_moves_do_not_block_event_loop(self):
+        store = get_store()
+        game = Game(9, 9, 10)
+        store.set(game)
+        held = threading.Event()
+
+        def hold():
+            # HTTP 요청 스레드가 게임 잠금을 잡고 오래 걸리는 수를 처리하는 중
+            with store.lock(game.game_id):
+                held.set()
+                time.sleep(0.3)
+
+        async def scenario():
+            ticks = 0
+            move = json.dumps({'action': 'flag', 'row': 0, 'col': 0})
+            task = asyncio.create_task(handle_text(store, game.game_id, move))
+            while not task.done():
+                await asyncio.sleep(0.01)
+                ticks += 1
+            return ticks, task.result()
+
+        thread = threading.Thread(target=hold)
+        thread.start()
+        held.wait()
+        ticks, error = asyncio.run(scenario())
+        thread.join()
+        # 잠금을 기다리는 동안에도 이벤트 루프는 다른 코루틴을 돌린다
+        self.assertGreater(ticks, 10)
+        self.assertIsNone(error)
+        self.assertEqual(store.get(game.game_id).flag_count, 1)
+
+
+@override_settings(MINESWEEPER_METRICS=True)
+class MetricsTests(TestCase):
+    def pool_taken(self):
+        """/metrics에 노출된 hard 프리셋의 적중 + 실패 횟수"""
+        text = self.client.get('/metrics').content.decode()
+        self.assertIn('# TYPE minesweeper_pool_ready gauge', text)
+        return sum(
+            int(line.split()[-1]) for line in text.splitlines()
+            if line.startswith(('minesweeper_pool_hits_total{preset="hard"}',
+                                'minesweeper_pool_misses_total{preset="hard"}'))
+        )
+
+    def test_pool_counters_are_exported(self):
+        before = self.pool_taken()
+        self.client.get('/new_game/hard/')
+        self.assertEqual(self.pool_taken(), before + 1)
+
+
+class CounterTests(TestCase):
+    def test_counters_match_grid_while_playing(self):
+        for seed in range(20):
+            game = Game(16, 16, 40, seed=seed)
+            play(game, random.Random(seed), flags=10)
+            self.assertEqual(game.remaining_flags, game.mines - game.flagged.count(1))
+
+    def test_mixed_moves_keep_counters(self):
+        rng = random.Random(3)
+        for seed in range(10):
+            game = Game(16, 30, 99, seed=seed)
+            game.reveal(8, 15)
+            while not game.finished:
+                row, col = rng.randrange(game.rows), rng.randrange(game.cols)
+                move = rng.choice((game.reveal, game.toggle_flag, game.toggle_flag, game.chord))
+                move(row, col)
+                if rng.random() < 0.05:
+                    game.hint(rng)
+                game.check_counters()
+
+    def test_flagged_cell_opened_by_reveal(self):
+        # 깃발 칸을 열면 깃발 수도 함께 줄어든다
+        game = Game(9, 9, 10, seed=4)
+        game.reveal(4, 4)
+        index = next(i for i in range(game.size) if not game.revealed[i] and game.board[i] != MINE)
+        game.set_flag(*divmod(index, game.cols))
+        game.reveal(*divmod(index, game.cols))
+        game.check_counters()
+        self.assertEqual(game.flag_count, 0)
+
+    def test_drift_is_detected(self):
+        game = Game(9, 9, 10, seed=1)
+        game.reveal(4, 4)
+        game.revealed_count += 1
+        with self.assertRaises(AssertionError):
+            game.check_counters()
+
+    @override_settings(MINESWEEPER_CHECK_COUNTERS=True)
+    def test_views_check_counters(self):
+        self.client.get('/new_game/easy/')
+        self.client.get('/click/4/4/')
+        self.client.get('/flag/0/0/')
+        self.client.get('/chord/4/4/')
+        self.assertEqual(self.client.get('/hint/').status_code, 200)
+
+
+class CodecTests(TestCase):
+    FIELDS = [name for name in Game.__slots__ if not name.startswith('_')]
+
+    def assertSameGame(self, game):
+        restored = Game.deserialize(game.serialize())
+        restored.check_counters()
+        for name in self.FIELDS:
+            with self.subTest(field=name):
+                expected, actual = getattr(game, name), getattr(restored, name)
+                if name in ('start_time', 'end_time') and expected is not None:
+                    self.assertAlmostEqual(actual, expected, places=2)
+                else:
+                    self.assertEqual(actual, expected)
+
+    def test_round_trip(self):
+        rng = random.Random(1)
+        for rows, cols, mines in ((1, 1, 0), (9, 9, 10), (16, 30, 99), (300, 7, 500)):
+            game = Game(rows, cols, mines, 'custom', seed=rng.getrandbits(32))
+            # 보드 생성 전 / 진행 중 / 끝난 게임
+            self.assertSameGame(game)
+            game.reveal(0, 0)
+            game.toggle_flag(rows - 1, cols - 1)
+            self.assertSameGame(game)
+            play(game, rng)
+            self.assertSameGame(game)
+
+    def test_invalid_token(self):
+        for token in ('', 'not-a-game', Game(9, 9, 10).serialize()[:-8]):
+            with self.assertRaises(ValueError):
+                Game.deserialize(token)
+
+
+class ZeroRegionsTests(TestCase):
+    def check(self, game, flagged):
+        """ZeroRegions.reveal과 기준 구현(flood_fill)이 같은 칸을 여는지 (지뢰가 아닌 칸 일부에서 시작)"""
+        regions = ZeroRegions(game.board, game.rows, game.cols)
+        starts = [i for i in range(game.size) if game.board[i] != MINE]
+        for index in random.Random(game.seed).sample(starts, min(len(starts), 60)):
+            row, col = divmod(index, game.cols)
+            expected, actual = bytearray(game.size), bytearray(game.size)
+            self.assertEqual(
+                sorted(regions.reveal(game.board, actual, flagged, row, col)),
+                sorted(flood_fill(game.board, expected, flagged, row, col, game.rows, game.cols)),
+            )
+            self.assertEqual(actual, expected)
+
+    def test_matches_flood_fill(self):
+        for seed, (rows, cols, mines) in enumerate(((9, 9, 10), (16, 30, 60), (40, 3, 12), (1, 50, 5))):
+            game = Game(rows, cols, mines, seed=seed)
+            game.ensure_board(0)
+            with self.subTest(rows=rows, cols=cols):
+                self.check(game, bytearray(game.size))
+
+    def test_flag_inside_zero_run(self):
+        game = Game(30, 30, 40, seed=3)
+        game.ensure_board(0)
+        zeros = [i for i in range(game.size) if game.board[i] == 0]
+        # 0 영역 한가운데 깃발이 있으면 확산이 그 칸에서 막힌다
+        for index in zeros[::max(1, len(zeros) // 8)]:
+            flagged = bytearray(game.size)
+            flagged[index] = 1
+            with self.subTest(flag=index):
+                self.check(game, flagged)
+
+    def test_flag_wall_splits_zero_run(self):
+        # 지뢰가 구석에 하나뿐인 보드: 거의 전체가 한 0 영역이고, 깃발 세로줄이 그 영역을 나눈다
+        game = Game(12, 12, 1, seed=1)
+        game.ensure_board(0)
+        flagged = bytearray(game.size)
+        for row in range(game.rows):
+            if game.board[row * game.cols + 6] == 0:
+                flagged[row * game.cols + 6] = 1
+        self.check(game, flagged)
+        revealed = bytearray(game.size)
+        start = next(i for i in range(game.size) if game.board[i] == 0 and i % game.cols < 6)
+        changed = ZeroRegions(game.board, game.rows, game.cols).reveal(
+            game.board, revealed, flagged, *divmod(start, game.cols))
+        self.assertTrue(all(i % game.cols < 7 for i in changed))
+
+    def test_open_cells_are_not_reopened(self):
+        game = Game(16, 16, 20, seed=5)
+        game.reveal(8, 8)
+        changed = game.reveal(8, 8)
+        self.assertEqual(changed, [])
+        game.check_counters()
+
+
+class SolverTests(TestCase):
+    def test_proven_cells_are_never_mines(self):
+        for seed in range(40):
+            rng = random.Random(seed)
+            game = Game(16, 16, 40, seed=seed)
+            game.reveal(8, 8)
+            # 지뢰가 아닌 칸에 꽂은 틀린 깃발도 증명에 쓰이면 안 된다
+            for i in rng.sample(range(game.size), 10):
+                if game.board[i] != MINE:
+                    game.set_flag(*divmod(i, game.cols))
+            while not game.finished:
+                result = game.hint(rng)
+                if result is None:
+                    break
+                index, changed, proven = result
+                game.check_counters()
+                self.assertNotEqual(game.board[index], MINE)
+                if proven:
+                    self.assertTrue(all(game.board[i] != MINE for i in game._solver.safe))
+                    self.assertTrue(all(game.board[i] == MINE for i in game._solver.mines))
+
+    def test_restored_game_gives_same_hint(self):
+        game = Game(16, 30, 99, seed=7)
+        game.reveal(8, 15)
+        game.hint(random.Random(0))
+        restored = Game.deserialize(game.serialize())
+        self.assertEqual(restored.safe_cell(), game.safe_cell())
+
+
+class StoreTests(TestCase):
+    def play_through_views(self):
+        """세 수를 두고 저장소에서 다시 읽은 게임을 반환"""
+        self.client.post('/new_game/', {'rows': 16, 'cols': 16, 'mines': 40})
+        self.client.get('/click/8/8/')
+        self.client.get('/flag/0/0/')
+        self.client.get('/flag/0/1/')
+        self.client.get('/flag/0/1/')
+        request = self.client.get('/api/game-state/').wsgi_request
+        game = get_store().load(request)
+        game.check_counters()
+        self.assertEqual(game.flag_count, 0 if game.revealed[0] else 1)
+        self.assertGreater(game.revealed_count, 0)
+        return game
+
+    def test_server_backends(self):
+        for backend in ('memory', 'database', 'cache'):
+            with self.subTest(backend=backend), override_settings(
+                MINESWEEPER_GAME_STORE=backend, MINESWEEPER_CHECK_COUNTERS=True,
+            ):
+                store = get_store()
+                game = self.play_through_views()
+                self.assertNotIn(GAME_SESSION_KEY, self.client.session)
+                self.assertEqual(self.client.session[GAME_ID_SESSION_KEY], game.game_id)
+
+                stored = store.get(game.game_id)
+                self.assertEqual((stored.revealed, stored.flagged), (game.revealed, game.flagged))
+                stored.toggle_flag(15, 15)
+                store.set(stored)
+                store.get(game.game_id).check_counters()
+                store.delete(game.game_id)
+                self.assertIsNone(store.get(game.game_id))
+
+                self.client.get('/reset/')
+                self.assertNotIn(GAME_ID_SESSION_KEY, self.client.session)
+
+    @override_settings(MINESWEEPER_GAME_STORE='cookie', MINESWEEPER_CHECK_COUNTERS=True)
+    def test_cookie_backend(self):
+        game = self.play_through_views()
+        self.assertEqual(Game.deserialize(self.client.session[GAME_SESSION_KEY]).version, game.version)
+        self.client.get('/reset/')
+        self.assertNotIn(GAME_SESSION_KEY, self.client.session)
+
+    @override_settings(MINESWEEPER_GAME_STORE='memory', MINESWEEPER_GAME_STORE_OPTIONS={'max_entries': 2})
+    def test_memory_lru(self):
+        store = get_store()
+        games = [Game(9, 9, 10) for _ in range(3)]
+        for game in games:
+            store.set(game)
+        self.assertIsNone(store.get(games[0].game_id))
+        self.assertIs(store.get(games[2].game_id), games[2])
+
+
+@override_settings(MINESWEEPER_CHECK_COUNTERS=True)
+class MovesTests(TestCase):
+    def post_moves(self, moves):
+        return self.client.post('/api/moves/', json.dumps({'moves': moves}), content_type='application/json')
+
+    def test_invalid_batches_change_nothing(self):
+        self.client.get('/new_game/easy/')
+        self.post_moves([{'action': 'reveal', 'row': 4, 'col': 4}])
+        before = self.client.get('/api/game-state/').json()
+        cases = {
+            'bad action': [{'action': 'explode', 'row': 0, 'col': 0}],
+            'string coords': [{'action': 'flag', 'row': '0', 'col': 0}],
+            'float coords': [{'action': 'flag', 'row': 0, 'col': 1.5}],
+            'out of bounds': [{'action': 'flag', 'row': 0, 'col': 99}],
+            # 앞의 수가 올바르더라도 하나라도 잘못되면 아무 수도 적용하지 않는다
+            'partly valid': [{'action': 'flag', 'row': 0, 'col': 0}, {'action': 'flag'}],
+            'empty': [],
+            'too many': [{'action': 'flag', 'row': 0, 'col': 0}] * (MAX_BATCH_MOVES + 1),
+            'not a list': {'action': 'flag', 'row': 0, 'col': 0},
+        }
+        for name, moves in cases.items():
+            with self.subTest(name):
+                response = self.post_moves(moves)
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.json()['error'], 'invalid_moves')
+        self.assertEqual(self.client.get('/api/game-state/').json(), before)
+
+        response = self.client.post('/api/moves/', 'not json', content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_batch_is_applied_in_order(self):
+        self.client.get('/new_game/easy/')
+        response = self.post_moves([
+            {'action': 'reveal', 'row': 4, 'col': 4},
+            {'action': 'flag', 'row': 0, 'col': 0},
+            {'action': 'unflag', 'row': 0, 'col': 0},
+        ])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['applied'], 3)
+        self.assertEqual(self.client.get('/api/game-state/').json()['remaining_flags'], 10)
+
+    def test_no_game(self):
+        self.assertEqual(self.post_moves([{'action': 'flag', 'row': 0, 'col': 0}]).status_code, 400)
+
+
+class ETagTests(TestCase):
+    def test_not_modified_until_state_changes(self):
+        self.client.get('/new_game/easy/')
+        for url in ('/api/game-state/', '/board/'):
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                etag = response['ETag']
+                self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+                self.client.get('/flag/0/0/')
+                self.client.get('/flag/0/0/')
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 200)
+                self.assertNotEqual(response['ETag'], etag)
+
+    def test_not_modified_varies_on_accept(self):
+        self.client.get('/new_game/easy/')
+        response = self.client.get('/api/game-state/')
+        self.assertIn('Accept', response['Vary'])
+        response = self.client.get('/api/game-state/', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+        self.assertIn('Accept', response['Vary'])
+
+    def test_format_is_part_of_etag(self):
+        self.client.get('/new_game/easy/')
+        etag = self.client.get('/api/game-state/')['ETag']
+        response = self.client.get('/api/game-state/?format=compact', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+
+class ReplayTests(TestCase):
+    def test_replay_matches_recorded_result(self):
+        for seed in range(10):
+            rng = random.Random(seed)
+            game = Game(16, 16, 40, seed=seed)
+            play(game, rng, flags=5)
+            if rng.random() < 0.5 and not game.finished:
+                game.chord(8, 8)
+            replay = get_replay(game)
+            self.assertTrue(replay.matches(game.won, game.revealed_count))
+            self.assertFalse(replay.matches(game.won, game.revealed_count + 1))
+
+            final = replay.at(len(replay))
+            final.check_counters()
+            self.assertEqual((final.revealed, final.flagged), (game.revealed, game.flagged))
+            self.assertEqual(replay.at(0).revealed_count, 0)
+            for step in range(0, len(replay) + 1, 7):
+                replay.at(step).check_counters()
+
+    def test_step_is_clamped(self):
+        game = Game(9, 9, 10, seed=1)
+        play(game, random.Random(1))
+        replay = get_replay(game)
+        self.assertEqual(replay.at(-5).revealed, replay.at(0).revealed)
+        self.assertEqual(replay.at(10 ** 6).revealed, game.revealed)
+
+
+class ChordTests(TestCase):
+    def numbered_cell(self, game):
+        """열린 숫자 칸 중 주변에 열 칸이 남은 칸"""
+        for i in range(game.size):
+            if game.revealed[i] and 0 < game.board[i] < MINE and any(
+                not game.revealed[n] and game.board[n] != MINE
+                for n in neighbor_indices(i, game.rows, game.cols)
+            ):
+                return i
+        self.fail('열 칸이 남은 숫자 칸이 없습니다')
+
+    def test_chord_with_correct_flags(self):
+        game = Game(16, 16, 40, seed=2)
+        game.reveal(8, 8)
+        index = self.numbered_cell(game)
+        neighbors = neighbor_indices(index, game.rows, game.cols)
+        for n in neighbors:
+            if game.board[n] == MINE:
+                game.set_flag(*divmod(n, game.cols))
+        changed = game.chord(*divmod(index, game.cols))
+        game.check_counters()
+        self.assertTrue(changed)
+        self.assertFalse(game.game_over)
+        self.assertTrue(all(game.revealed[n] or game.flagged[n] for n in neighbors))
+
+    def test_chord_with_wrong_flag_count_is_noop(self):
+        game = Game(16, 16, 40, seed=2)
+        game.reveal(8, 8)
+        index = self.numbered_cell(game)
+        version = game.version
+        revealed = bytes(game.revealed)
+        # 깃발이 숫자보다 적으면 아무것도 열지 않는다
+        self.assertEqual(game.chord(*divmod(index, game.cols)), [])
+        self.assertEqual((game.version, bytes(game.revealed)), (version, revealed))
+        game.check_counters()
+
+    def test_chord_with_wrong_flag_explodes(self):
+        game = Game(16, 16, 40, seed=2)
+        game.reveal(8, 8)
+        index = self.numbered_cell(game)
+        neighbors = neighbor_indices(index, game.rows, game.cols)
+        wrong = [n for n in neighbors if not game.revealed[n] and game.board[n] != MINE]
+        mines = [n for n in neighbors if game.board[n] == MINE]
+        # 지뢰 하나 대신 안전한 칸에 깃발을 꽂는다
+        for n in mines[1:] + wrong[:1]:
+            game.set_flag(*divmod(n, game.cols))
+        game.chord(*divmod(index, game.cols))
+        game.check_counters()
+        self.assertTrue(game.game_over)
+
+    def test_chord_view(self):
+        with override_settings(MINESWEEPER_CHECK_COUNTERS=True):
+            self.client.get('/new_game/easy/')
+            self.client.get('/click/4/4/')
+            # 닫힌 칸이나 0 칸에 대한 chord는 변화 없음
+            before = self.client.get('/api/game-state/')['ETag']
+            self.assertEqual(self.client.get('/chord/4/4/').status_code, 200)
+            self.assertEqual(self.client.get('/api/game-state/')['ETag'], before)
+
+
+class RecordingExecutor:
+    """작업을 실행하지 않고 기록만 하는 풀 (완료는 테스트가 직접 정한다)"""
+
+    def __init__(self):
+        self.futures = []
+
+    def submit(self, fn, *args):
+        future = Future()
+        self.futures.append((args, future))
+        return future
+
+    def shutdown(self, **kwargs):
+        pass
+
+
+@mock.patch('minesweeper.factory.is_no_guess', side_effect=AssertionError('요청 안에서 검증함'))
+class BoardFactoryTests(TestCase):
+    def factory(self):
+        factory = BoardFactory(DIFFICULTY_SETTINGS, depth=2, spill_dir=None)
+        factory._executor = RecordingExecutor()
+        return factory
+
+    def test_pop_never_verifies_inline(self, is_no_guess):
+        factory = self.factory()
+        for rows, cols, mines in ((16, 16, 40), (50, 50, 300), (50, 50, 300)):
+            self.assertEqual(factory.pop(rows, cols, mines), (None, start_index(rows, cols)))
+        is_no_guess.assert_not_called()
+        # 프리셋은 depth장, 커스텀 크기는 한 장만 워커에 맡긴다 (진행 중이면 다시 넣지 않음)
+        submitted = [args[:3] for args, _ in factory._executor.futures]
+        self.assertEqual(submitted, [(16, 16, 40)] * 2 + [(50, 50, 300)])
+
+    def test_prepared_board_is_served(self, is_no_guess):
+        factory = self.factory()
+        factory.pop(50, 50, 300)
+        factory._executor.futures[0][1].set_result(1234)
+        self.assertEqual(factory.pop(50, 50, 300), (1234, start_index(50, 50)))
+
+    def test_custom_sizes_are_bounded(self, is_no_guess):
+        factory = self.factory()
+        with self.assertRaises(ValueError):
+            factory.pop(101, 100, 10)
+        for cols in range(10, 40):
+            factory.pop(10, cols, 10)
+        self.assertLessEqual(len(factory._custom), 16)
+        # 밀려난 조합의 결과는 보관하지 않는다
+        factory._executor.futures[0][1].set_result(1)
+        self.assertEqual(factory.ready_count(10, 10, 10), 0)
+
+    @override_settings(MINESWEEPER_BOARD_FACTORY={'spill_dir': None}, MINESWEEPER_GAME_STORE='memory')
+    def test_view_answers_503_then_400(self, is_no_guess):
+        get_factory(DIFFICULTY_SETTINGS)._executor = RecordingExecutor()
+        response = self.client.post('/new_game/', {'rows': 20, 'cols': 20, 'mines': 60, 'no_guess': '1'})
+        self.assertEqual(response.status_code, 503)
+        response = self.client.post('/new_game/', {'rows': 200, 'cols': 200, 'mines': 60, 'no_guess': '1'})
+        self.assertEqual(response.status_code, 400)
+        is_no_guess.assert_not_called()
+
+
+class TilesTests(TestCase):
+    def test_parse_tiles(self):
+        game = Game(70, 50, 10)   # 3 x 2 타일, 가장자리 타일은 잘린 크기
+        self.assertEqual(parse_tiles(game, ''), [])
+        self.assertEqual(parse_tiles(game, '3:17,4,5:0'), [(3, 17), (4, -1), (5, 0)])
+        for query in ('6', '-1', 'a', '1:x', '1:2:3', ','.join(['0'] * (MAX_TILES + 1))):
+            with self.subTest(query=query), self.assertRaises(ValueError):
+                parse_tiles(game, query)
+
+    @override_settings(MINESWEEPER_GAME_STORE='memory', MINESWEEPER_TILED_THRESHOLD=1000)
+    def test_only_changed_tiles_are_sent(self):
+        self.client.post('/new_game/', {'rows': 70, 'cols': 50, 'mines': 10})
+        self.assertEqual(self.client.get('/api/tiles/?tiles=6').json()['error'], 'invalid_tiles')
+
+        data = self.client.get('/api/tiles/?tiles=' + ','.join(map(str, range(6)))).json()
+        self.assertEqual((data['rows'], data['cols'], data['tile_size']), (70, 50, TILE_SIZE))
+        tiles = {tile['id']: tile for tile in data['tiles']}
+        self.assertEqual(sorted(tiles), list(range(6)))
+        self.assertEqual((tiles[5]['row'], tiles[5]['col'], tiles[5]['rows'], tiles[5]['cols']), (64, 32, 6, 18))
+        self.assertTrue(all(len(t['cells']) == t['rows'] * t['cols'] and set(t['cells']) == {'?'}
+                            for t in tiles.values()))
+
+        # 깃발 하나는 그 칸의 타일 버전만 올린다
+        self.client.get('/flag/69/49/')
+        query = ','.join(f'{tile}:{tiles[tile]["version"]}' for tile in range(6))
+        changed = self.client.get('/api/tiles/?tiles=' + query).json()['tiles']
+        self.assertEqual([tile['id'] for tile in changed], [5])
+        self.assertGreater(changed[0]['version'], tiles[5]['version'])
+        self.assertEqual(changed[0]['cells'][-1], 'F')
+
+        # 첫 클릭으로 열린 칸은 바뀐 타일에만 있다
+        self.client.get('/click/35/25/')
+        seen = {tile: tiles[tile]['version'] for tile in range(5)}
+        seen[5] = changed[0]['version']
+        opened = self.client.get('/api/tiles/?tiles=' + ','.join(f'{k}:{v}' for k, v in seen.items())).json()['tiles']
+        game = get_store().get(self.client.session[GAME_ID_SESSION_KEY])
+        self.assertEqual(sum(len(tile['cells'].translate({ord('?'): None, ord('F'): None})) for tile in opened),
+                         game.revealed_count)
+        self.assertTrue(all(tile['version'] == game.version for tile in opened))
+
+    def test_form_limits_follow_store(self):
+        html = self.client.get('/').content.decode()
+        self.assertIn('data-max-cells="900"', html)
+        self.assertIn('max="899"', html)
+        with override_settings(MINESWEEPER_GAME_STORE='memory'):
+            html = self.client.get('/').content.decode()
+        self.assertIn(f'max="{MAX_SIDE}"', html)
+        self.assertIn('data-max-cells="1000000"', html)
+
+
+class SocketClient:
+    """websocket_application에 직접 붙는 테스트용 연결 (이벤트 루프 안에서 만든다)"""
+
+    def __init__(self, path, cookie=None, query_string=b''):
+        self.incoming, self.outgoing = asyncio.Queue(), asyncio.Queue()
+        headers = [(b'cookie', cookie.encode())] if cookie else []
+        scope = {'type': 'websocket', 'path': path, 'headers': headers, 'query_string': query_string}
+        self.task = asyncio.create_task(websocket_application(scope, self.incoming.get, self.outgoing.put))
+        self.incoming.put_nowait({'type': 'websocket.connect'})
+
+    async def receive(self):
+        return await asyncio.wait_for(self.outgoing.get(), 5)
+
+    async def receive_json(self):
+        return json.loads((await self.receive())['text'])
+
+    async def send(self, data):
+        text = data if isinstance(data, str) else json.dumps(data)
+        await self.incoming.put({'type': 'websocket.receive', 'text': text})
+
+    async def close(self):
+        await self.incoming.put({'type': 'websocket.disconnect'})
+        await asyncio.wait_for(self.task, 5)
+
+
+@override_settings(MINESWEEPER_GAME_STORE='memory', MINESWEEPER_CHECK_COUNTERS=True)
+class RealtimeTests(TestCase):
+    def start_game(self):
+        self.client.post('/new_game/', {'rows': 16, 'cols': 16, 'mines': 40})
+        cookie = f'{settings.SESSION_COOKIE_NAME}={self.client.cookies[settings.SESSION_COOKIE_NAME].value}'
+        return self.client.session[GAME_ID_SESSION_KEY], cookie
+
+    async def join(self, game_id, cookie):
+        client = SocketClient(f'/ws/game/{game_id}/', cookie)
+        self.assertEqual((await client.receive())['type'], 'websocket.accept')
+        self.assertEqual((await client.receive_json())['type'], 'status')
+        return client
+
+    def test_connection_needs_session_game(self):
+        game_id, cookie = self.start_game()
+
+        async def scenario():
+            other = SocketClient(f'/ws/game/{game_id}/')
+            self.assertEqual(await other.receive(), {'type': 'websocket.close', 'code': 4403})
+
+        asyncio.run(scenario())
+
+    def test_malformed_message_is_answered_to_sender_only(self):
+        game_id, cookie = self.start_game()
+
+        async def scenario():
+            a, b = await self.join(game_id, cookie), await self.join(game_id, cookie)
+            for text in ('not json', '{"action": "nope"}', '{"moves": []}', '{"action": "flag", "row": 99, "col": 0}'):
+                with self.subTest(text=text):
+                    await a.send(text)
+                    self.assertEqual((await a.receive_json())['error'], 'invalid_moves')
+            await asyncio.sleep(0.05)
+            self.assertTrue(b.outgoing.empty())
+            await a.close()
+            await b.close()
+
+        asyncio.run(scenario())
+        self.assertEqual(get_store().get(game_id).version, 0)
+
+    def test_move_round_trip(self):
+        game_id, cookie = self.start_game()
+
+        async def scenario():
+            a, b = await self.join(game_id, cookie), await self.join(game_id, cookie)
+            await a.send({'moves': [{'action': 'reveal', 'row': 8, 'col': 8}, {'action': 'flag', 'row': 0, 'col': 0}]})
+            delta_a, delta_b = await a.receive_json(), await b.receive_json()
+            await a.close()
+            await b.close()
+            return delta_a, delta_b
+
+        delta_a, delta_b = asyncio.run(scenario())
+        self.assertEqual(delta_a, delta_b)
+        self.assertEqual((delta_a['type'], delta_a['applied']), ('delta', 2))
+        game = get_store().get(game_id)
+        game.check_counters()
+        self.assertEqual(delta_a['version'], game.version)
+        self.assertEqual(game.flag_count, 0 if game.revealed[0] else 1)
+        revealed = {(cell['row'], cell['col']) for cell in delta_a['cells'] if cell['is_revealed']}
+        self.assertEqual(len(revealed), game.revealed_count)
+
+    def test_shared_game_conflict(self):
+        shared = create_shared_game(16, 16, 40)
+        path = f'/ws/shared/{shared.game_id}/'
+        key = f'key={shared.play_key}'.encode()
+
+        async def join(query_string):
+            client = SocketClient(path, query_string=query_string)
+            self.assertEqual((await client.receive())['type'], 'websocket.accept')
+            role = (await client.receive_json())['role']
+            self.assertEqual((await client.receive_json())['type'], 'state')
+            return client, role
+
+        async def scenario():
+            (a, role_a), (b, role_b), (spectator, role_s) = await join(key), await join(key), await join(b'key=wrong')
+            self.assertEqual((role_a, role_b, role_s), ('player', 'player', 'spectator'))
+
+            await spectator.send({'action': 'reveal', 'row': 0, 'col': 0})
+            self.assertEqual((await spectator.receive_json())['error'], 'spectator')
+
+            # A가 연 칸을 B가 옛 버전(0)을 보고 건드리면 그 수만 거절된다
+            await a.send({'version': 0, 'moves': [{'action': 'reveal', 'row': 8, 'col': 8}]})
+            delta = await a.receive_json()
+            self.assertEqual(delta, await b.receive_json())
+            self.assertEqual(delta, await spectator.receive_json())
+            cell = next(cell for cell in delta['cells'] if cell['is_revealed'])
+            hidden = next(i for i in range(shared.game.size) if not shared.game.revealed[i])
+            await b.send({'version': 0, 'moves': [
+                {'action': 'flag', 'row': cell['row'], 'col': cell['col']},
+                {'action': 'flag', 'row': hidden // 16, 'col': hidden % 16},
+            ]})
+            replies = [await b.receive_json(), await b.receive_json()]
+            broadcast = await a.receive_json()
+            self.assertEqual(broadcast, await spectator.receive_json())
+            for client in (a, b, spectator):
+                await client.close()
+            return delta, replies, broadcast, hidden
+
+        delta, replies, broadcast, hidden = asyncio.run(scenario())
+        conflict = next(reply for reply in replies if reply['type'] == 'conflict')
+        self.assertEqual((conflict['base'], len(conflict['cells'])), (0, 1))
+        self.assertIn(broadcast, replies)
+        self.assertEqual((broadcast['type'], broadcast['applied']), ('delta', 1))
+        self.assertGreater(broadcast['version'], delta['version'])
+        self.assertEqual(shared.game.flag_count, 1)
+        self.assertTrue(shared.game.flagged[hidden])
@@ -8,7 +8,18 @@ urlpatterns = [
     path('new_game/<int:rows>/<int:cols>/<int:mines>/', views.new_game, name='new_game_custom'),
     path('click/<int:row>/<int:col>/', views.click, name='click'),
     path('flag/<int:row>/<int:col>/', views.flag, name='flag'),
+    path('chord/<int:row>/<int:col>/', views.chord, name='chord'),
+    path('api/moves/', views.moves, name='moves'),
     path('hint/', views.hint, name='hint'),
     path('reset/', views.reset, name='reset'),
     path('api/game-state/', views.game_state, name='game_state'),
+    path('api/tiles/', views.tiles, name='tiles'),
+    path('board/', views.render_game_response, name='board'),
+    path('api/leaderboard/<str:difficulty>/', views.leaderboard, name='leaderboard'),
+    path('api/stats/<str:difficulty>/', views.stats, name='stats'),
+    path('api/replay/<uuid:game_id>/', views.replay, name='replay'),
+    path('api/shared/', views.new_shared_game, name='new_shared_game'),
+    path('api/shared/new/<str:difficulty>/', views.new_shared_game, name='new_shared_game_difficulty'),
+    path('api/shared/<uuid:game_id>/', views.shared_game_state, name='shared_game_state'),
+    path('metrics', views.metrics, name='metrics'),
 ]
\ No newline at end of file
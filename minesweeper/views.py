@@ -1,9 +1,36 @@
 from django.shortcuts import render, redirect
 from django.template.loader import render_to_string
-from django.http import HttpResponse, JsonResponse
+from django.http import Http404, HttpResponse, JsonResponse
 from django.urls import reverse
-import random
-import time
+from django.conf import settings
+from django.db import DatabaseError
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition, require_POST
+from django.views.decorators.vary import vary_on_headers
+import json
+import uuid
+from datetime import date
+from functools import wraps
+
+from .engine import LOG_ACTIONS, MAX_SIDE, TILE_SIZE, Game
+from .factory import get_factory, start_index
+from .metrics import get_registry, render_pool
+from .pool import get_pool
+from .protocol import (
+    apply_moves, cell_codes, compact_state, delta_payload, game_status, parse_moves, parse_tiles,
+    tile_payload, verbose_state,
+)
+from .render import render_board
+from .replay import daily_seed, get_replay
+from .results import leaderboard as top_results, recent_results, record_result, result_game, stats_summary
+from .shared import create_shared_game, get_shared_games
+from .store import GAME_ID_SESSION_KEY, PLAYER_SESSION_KEY, ServerGameStore, get_store
+
+# game-state 압축 형식을 Accept 헤더로 요청할 때의 미디어 타입
+COMPACT_MEDIA_TYPE = 'application/vnd.minesweeper.compact+json'
+
+# 커스텀 보드 입력의 한 변 최소 칸 수
+CUSTOM_MIN_SIDE = 5
 
 # 난이도별 설정
 DIFFICULTY_SETTINGS = {
@@ -12,82 +39,113 @@ DIFFICULTY_SETTINGS = {
     'hard': {'rows': 16, 'cols': 16, 'mines': 40},
 }
 
+def load_game(request):
+    """현재 세션의 게임을 요청당 한 번만 불러와서 반환 (없으면 None)"""
+    if not hasattr(request, '_game'):
+        request._game = get_store().load(request)
+    return request._game
+
+def game_locked(view):
+    """
+    세션의 게임을 불러와 바꾸고 저장하는 동안 게임별 잠금을 잡는다. memory 백엔드는 요청들이
+    같은 Game 객체를 공유하므로, 같은 게임에 대한 요청(과 WebSocket 수)이 겹치지 않게 한다
+    """
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        with get_store().lock(request.session.get(GAME_ID_SESSION_KEY)):
+            return view(request, *args, **kwargs)
+    return wrapper
+
+def player_id(request):
+    """세션마다 발급하는 익명 플레이어 id (결과 기록/최근 기록 조회용)"""
+    if PLAYER_SESSION_KEY not in request.session:
+        request.session[PLAYER_SESSION_KEY] = str(uuid.uuid4())
+    return request.session[PLAYER_SESSION_KEY]
+
+def save_game(request, game):
+    if settings.MINESWEEPER_CHECK_COUNTERS:
+        game.check_counters()
+    request._game = game
+    get_store().save(request, game)
+    if game.finished:
+        # 승패가 난 수를 저장할 때 한 번 기록 (중복 기록은 results에서 무시)
+        record_result(game, player_id(request))
+
+def game_delta_response(game, changed, **extra):
+    """이번 요청에서 바뀐 칸과 상태 필드만 담은 JSON 응답"""
+    return JsonResponse(delta_payload(game, changed, **extra))
+
 def get_game_context(request):
-    if 'board' not in request.session:
+    game = load_game(request)
+    if game is None:
         return None
-        
-    rows = request.session.get('rows', 10)
-    cols = request.session.get('cols', 10)
-    board = request.session['board']
-    revealed = request.session['revealed']
-    flagged = request.session['flagged']
-    mines = request.session.get('mines', 10)
-    start_time = request.session.get('start_time')
-    end_time = request.session.get('end_time')
-
-    if end_time is not None and end_time < start_time:
-        end_time = None
-        request.session['end_time'] = None
-        request.session.modified = True
-
-    now_ts = time.time()
-    elapsed_seconds = 0
-    if start_time is not None:
-        elapsed_seconds = int((end_time or now_ts) - start_time)
-    
-    current_flags = sum(row.count(True) for row in flagged)
-    
-    board_data = []
-    for r in range(rows):
-        row = []
-        for c in range(cols):
-            row.append({
-                'row': r,
-                'col': c,
-                'is_revealed': revealed[r][c],
-                'is_flagged': flagged[r][c],
-                'is_mine': board[r][c] == -1,
-                'value': board[r][c] if board[r][c] > 0 else '',
-            })
-        board_data.append(row)
-        
-    return {
-        'board_data': board_data,
-        'game_over': request.session.get('game_over', False),
-        'won': request.session.get('won', False),
-        'rows': rows,
-        'cols': cols,
-        'mines': mines,
-        'remaining_flags': mines - current_flags,
-        'difficulty': request.session.get('difficulty', 'custom'),
-        'start_time': start_time,
-        'end_time': end_time,
-        'elapsed_seconds': elapsed_seconds,
-        'game_id': request.session.get('game_id', ''),
-    }
 
+    if game.end_time is not None and game.end_time < game.start_time:
+        game.end_time = None
+        game.version += 1
+        save_game(request, game)
+
+    # 큰 보드는 칸을 렌더링하지 않고 클라이언트가 보이는 타일만 /api/tiles/로 받는다
+    tiled = game.size > settings.MINESWEEPER_TILED_THRESHOLD
+    context = game_status(game)
+    context.update({
+        'board_html': '' if tiled else render_board(game),
+        'tiled': tiled,
+        'tile_size': TILE_SIZE,
+        'rows': game.rows,
+        'cols': game.cols,
+        'mines': game.mines,
+        'difficulty': game.difficulty,
+        'game_id': game.game_id,
+        # ASGI로 띄운 경우 WebSocket 채널 사용 (쿠키 저장소는 소켓에서 상태를 되쓸 수 없음)
+        'realtime': settings.MINESWEEPER_REALTIME and isinstance(get_store(), ServerGameStore),
+    })
+    return context
+
+def game_etag(request, *args, **kwargs):
+    """상태 버전 기반 ETag. 게임이 없으면 None (조건부 처리 없이 뷰 실행)"""
+    game = load_game(request)
+    if game is None:
+        return None
+    return f'{game.game_id}.{game.version}'
+
+def game_state_etag(request):
+    # 같은 URL에서 Accept에 따라 형식이 달라지므로 형식도 ETag에 넣는다
+    etag = game_etag(request)
+    if etag is not None and wants_compact(request):
+        etag += '.compact'
+    return etag
+
+@game_locked
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=game_etag)
 def render_game_response(request):
+    """보드 파셜 + OOB 상태바. 버전이 같으면 304"""
     context = get_game_context(request)
     if not context:
         return redirect('new_game')
-        
+
     board_html = render_to_string('minesweeper/partials/board.html', context)
-    
-    # OOB로 상태바 outerHTML 교체
-    status_bar = render_to_string('minesweeper/partials/status-bar.html', context)
-    if '<div' in status_bar:
-        status_bar_oob = status_bar.replace('<div', '<div hx-swap-oob="outerHTML"', 1)
-    else:
-        status_bar_oob = status_bar
+    # 상태바는 OOB로 outerHTML 교체
+    status_bar = render_to_string('minesweeper/partials/status-bar.html', {**context, 'oob': True})
+    return HttpResponse(board_html + status_bar)
 
-    return HttpResponse(board_html + status_bar_oob)
 
+def board_limits():
+    """커스텀 보드 입력 범위. 서버 측 저장소는 엔진 상한까지, 쿠키 저장소는 쿠키에 담기는 크기까지"""
+    max_cells = get_store().max_cells
+    return {
+        'min_side': CUSTOM_MIN_SIDE,
+        'max_side': min(MAX_SIDE, max_cells // CUSTOM_MIN_SIDE),
+        'max_cells': max_cells,
+        'max_mines': max_cells - 1,
+    }
 
 def index(request):
     context = get_game_context(request)
     if not context:
         context = {
-            'board_data': [],
+            'board_html': '',
             'rows': request.session.get('rows', 10),
             'cols': request.session.get('cols', 10),
             'mines': request.session.get('mines', 10),
@@ -95,6 +153,7 @@ def index(request):
             'game_over': False,
             'won': False,
         }
+    context['limits'] = board_limits()
     return render(request, 'minesweeper/index.html', context)
 
 def new_game(request, difficulty=None, rows=10, cols=10, mines=10):
@@ -104,267 +163,349 @@ def new_game(request, difficulty=None, rows=10, cols=10, mines=10):
         cols = settings['cols']
         mines = settings['mines']
     elif request.method == 'POST':
-        rows = int(request.POST.get('rows', 10))
-        cols = int(request.POST.get('cols', 10))
-        mines = int(request.POST.get('mines', 10))
-        max_mines = rows * cols - 1
-        if mines > max_mines:
-            return HttpResponse(
-                f'폭탄 수는 최대 {max_mines}개까지 설정할 수 있습니다.',
-                status=400
-            )
-        mines = min(mines, max_mines)
-
-    board = [[0 for _ in range(cols)] for _ in range(rows)]
-    mine_positions = set()
-    while len(mine_positions) < mines:
-        r, c = random.randint(0, rows-1), random.randint(0, cols-1)
-        mine_positions.add((r, c))
-        
-    for r, c in mine_positions:
-        board[r][c] = -1
-        for dr in [-1, 0, 1]:
-            for dc in [-1, 0, 1]:
-                nr, nc = r + dr, c + dc
-                if 0 <= nr < rows and 0 <= nc < cols and board[nr][nc] != -1:
-                    board[nr][nc] += 1
-                    
-    import uuid
-    game_id = str(uuid.uuid4())
-    
-    request.session['board'] = board
-    request.session['revealed'] = [[False for _ in range(cols)] for _ in range(rows)]
-    request.session['flagged'] = [[False for _ in range(cols)] for _ in range(rows)]
-    request.session['game_over'] = False
-    request.session['won'] = False
+        try:
+            rows = int(request.POST.get('rows', 10))
+            cols = int(request.POST.get('cols', 10))
+            mines = int(request.POST.get('mines', 10))
+        except ValueError:
+            return HttpResponse('보드 설정은 숫자로 입력해야 합니다.', status=400)
+
+    # 일일 도전은 프리셋에서만 (노게스와 함께 쓰지 않음)
+    daily = request.GET.get('daily') == '1' and difficulty in DIFFICULTY_SETTINGS
+    no_guess = not daily and (request.GET.get('no_guess') == '1' or request.POST.get('no_guess') == '1')
+
+    # 보드는 첫 클릭 때 시드로 생성하고 안전 영역을 비운다 (그 전에는 설정값과 시드만 저장)
+    try:
+        game = Game(rows, cols, mines, difficulty or 'custom', no_guess=no_guess)
+        # 저장소가 담을 수 있는 크기인지 (쿠키 저장소는 30x30까지)
+        get_store().check_size(game)
+    except ValueError as e:
+        return HttpResponse(str(e), status=400)
+    if daily:
+        # 일일 도전: 날짜별 시드로 모두 같은 보드를 받도록 시작 칸까지 정해서 열어 둔다
+        game.seed = daily_seed(difficulty)
+        game.open_safe(start_index(rows, cols))
+    elif no_guess:
+        # 노게스: 미리 검증된 보드의 시드를 꺼내 시작 칸을 열어 둔다 (없으면 워커가 만드는 동안 503)
+        try:
+            seed, start = get_factory(DIFFICULTY_SETTINGS).pop(rows, cols, mines)
+        except ValueError as e:
+            return HttpResponse(str(e), status=400)
+        if seed is None:
+            return HttpResponse('노게스 보드를 준비하는 중입니다. 잠시 후 다시 시도해 주세요.', status=503)
+        game.seed = seed
+        game.open_safe(start)
+    elif difficulty in DIFFICULTY_SETTINGS:
+        # 프리셋은 미리 만들어 둔 보드를 꺼내 쓴다 (없으면 기존처럼 첫 클릭 때 생성)
+        entry = get_pool(DIFFICULTY_SETTINGS).take(difficulty)
+        if entry is not None:
+            board, regions, game.seed = entry
+            game.place_board(board, regions=regions)
+    # 이전 게임은 저장소에서 바로 제거 (서버 측 백엔드)
+    get_store().discard(request)
+    save_game(request, game)
     request.session['rows'] = rows
     request.session['cols'] = cols
     request.session['mines'] = mines
-    request.session['difficulty'] = difficulty or 'custom'
-    request.session['start_time'] = None
-    request.session['end_time'] = None
-    request.session['first_click_done'] = False
-    request.session['game_id'] = game_id
-    
+    request.session['difficulty'] = game.difficulty
+    request.session['no_guess'] = no_guess
+
     if request.headers.get('HX-Request'):
         context = get_game_context(request)
         play_html = render_to_string('minesweeper/partials/game-play.html', context)
         return HttpResponse(play_html)
-    
-    return redirect('index')
 
-def click(request, row, col):
-    if request.session.get('game_over', False) or request.session.get('won', False):
-        return HttpResponse(status=204)
-
-    if request.session.get('start_time') is None:
-        request.session['start_time'] = time.time()
-        request.session['end_time'] = None
-
-    board = request.session['board']
-    revealed = request.session['revealed']
-    flagged = request.session['flagged']
-    rows, cols = request.session['rows'], request.session['cols']
-    
-    # 첫 클릭 안전 보장: 클릭 위치 및 주변 3x3 영역 지뢰 재배치
-    if not request.session.get('first_click_done', False):
-        request.session['first_click_done'] = True
-        
-        safe_positions = set()
-        for dr in [-1, 0, 1]:
-            for dc in [-1, 0, 1]:
-                nr, nc = row + dr, col + dc
-                if 0 <= nr < rows and 0 <= nc < cols:
-                    safe_positions.add((nr, nc))
-        
-        mine_positions = set()
-        for r in range(rows):
-            for c in range(cols):
-                if board[r][c] == -1:
-                    mine_positions.add((r, c))
-        
-        mines_to_move = mine_positions & safe_positions
-        if mines_to_move:
-            all_positions = {(r, c) for r in range(rows) for c in range(cols)}
-            available_positions = list(all_positions - mine_positions - safe_positions)
-            
-            for old_pos in mines_to_move:
-                if available_positions:
-                    new_pos = available_positions.pop(0)
-                    mine_positions.remove(old_pos)
-                    mine_positions.add(new_pos)
-            
-            board = [[0 for _ in range(cols)] for _ in range(rows)]
-            for r, c in mine_positions:
-                board[r][c] = -1
-                for dr in [-1, 0, 1]:
-                    for dc in [-1, 0, 1]:
-                        nr, nc = r + dr, c + dc
-                        if 0 <= nr < rows and 0 <= nc < cols and board[nr][nc] != -1:
-                            board[nr][nc] += 1
-            
-            request.session['board'] = board
-
-    if revealed[row][col]:
-        return HttpResponse(status=204)
-    
-    if flagged[row][col]:
-        flagged[row][col] = False
-        request.session['flagged'] = flagged
-
-    if board[row][col] == -1:
-        request.session['game_over'] = True
-        for r in range(rows):
-            for c in range(cols):
-                if board[r][c] == -1:
-                    revealed[r][c] = True
-    else:
-        reveal_logic(board, revealed, flagged, row, col, rows, cols)
-        
-        revealed_count = sum(row.count(True) for row in revealed)
-        if revealed_count == (rows * cols) - request.session['mines']:
-            request.session['won'] = True
-
-    if (request.session.get('game_over') or request.session.get('won')) and not request.session.get('end_time'):
-        request.session['end_time'] = time.time()
-
-    request.session['revealed'] = revealed
-    request.session.modified = True
-    return HttpResponse(status=204)
-
-def flag(request, row, col):
-    if request.session.get('game_over', False) or request.session.get('won', False):
-        return HttpResponse(status=204)
+    return redirect('index')
 
-    if request.session.get('start_time') is None:
-        request.session['start_time'] = time.time()
-        request.session['end_time'] = None
+@game_locked
+def apply_move(request, move, row, col):
+    """click/flag 공통 어댑터: 엔진 조작 후 바뀐 칸이 있을 때만 저장"""
+    game = load_game(request)
+    if game is None:
+        return JsonResponse({'error': 'no_game'}, status=400)
+    if game.finished:
+        return game_delta_response(game, [])
 
-    flagged = request.session['flagged']
-    revealed = request.session['revealed']
-    mines = request.session['mines']
-    current_flags = sum(row.count(True) for row in flagged)
+    started = game.start_time
+    try:
+        changed = move(game, row, col)
+    except ValueError:
+        return JsonResponse({'error': 'out_of_bounds'}, status=400)
 
-    if not revealed[row][col]:
-        if flagged[row][col]:
-            flagged[row][col] = False
-        elif current_flags < mines:
-            flagged[row][col] = True
+    if changed or game.start_time != started:
+        save_game(request, game)
+    return game_delta_response(game, changed)
 
-    request.session['flagged'] = flagged
+def click(request, row, col):
+    """칸 열기. 바뀐 칸 목록과 상태 필드만 응답"""
+    return apply_move(request, Game.reveal, row, col)
 
-    rows = request.session.get('rows')
-    cols = request.session.get('cols')
-    board = request.session.get('board')
-    revealed_count = sum(r.count(True) for r in request.session['revealed'])
-    if revealed_count == (rows * cols) - mines:
-        request.session['won'] = True
+def flag(request, row, col):
+    """깃발 설치/해제. 바뀐 칸 목록과 상태 필드만 응답"""
+    return apply_move(request, Game.toggle_flag, row, col)
+
+def chord(request, row, col):
+    """열린 숫자 칸의 주변 깃발 수가 숫자와 같으면 나머지 주변 칸을 한 번에 공개 (저장/응답 한 번)"""
+    return apply_move(request, Game.chord, row, col)
+
+@game_locked
+@require_POST
+def moves(request):
+    """
+    여러 수(reveal/flag/unflag/chord)를 순서대로 한 번에 적용하고 한 번만 저장.
+    게임이 끝나면 남은 수는 버린다. 응답 cells에는 바뀐 칸과 함께 요청한 칸의
+    현재 상태도 담아, 클라이언트가 먼저 그려 둔 화면을 서버 상태로 맞출 수 있게 한다.
+    """
+    game = load_game(request)
+    if game is None:
+        return JsonResponse({'error': 'no_game'}, status=400)
 
-    if request.session.get('won') and not request.session.get('end_time'):
-        request.session['end_time'] = time.time()
+    try:
+        payload = json.loads(request.body)
+        parsed = parse_moves(game, payload.get('moves'))
+    except (ValueError, AttributeError) as e:
+        return JsonResponse({'error': 'invalid_moves', 'detail': str(e)}, status=400)
 
-    request.session.modified = True
-    return HttpResponse(status=204)
+    changed, touched, dirty = apply_moves(game, parsed)
+    if dirty:
+        save_game(request, game)
+    return game_delta_response(game, changed + touched, applied=len(touched))
 
 def reset(request):
     rows = request.session.get('rows', 10)
     cols = request.session.get('cols', 10)
     mines = request.session.get('mines', 10)
     difficulty = request.session.get('difficulty', 'custom')
+    no_guess = request.session.get('no_guess', False)
+    # 익명 플레이어 id는 유지 (최근 기록/리더보드의 is_you)
+    player = request.session.get(PLAYER_SESSION_KEY)
 
+    get_store().discard(request)
     request.session.flush()
     request.session['rows'] = rows
     request.session['cols'] = cols
     request.session['mines'] = mines
     request.session['difficulty'] = difficulty
+    request.session['no_guess'] = no_guess
+    if player:
+        request.session[PLAYER_SESSION_KEY] = player
     return redirect('index')
 
+def wants_compact(request):
+    """?format=compact|verbose가 우선이고, 없으면 Accept 헤더로 고른다"""
+    fmt = request.GET.get('format')
+    if fmt:
+        return fmt == 'compact'
+    return COMPACT_MEDIA_TYPE in request.headers.get('Accept', '')
+
+@game_locked
+@cache_control(private=True, no_cache=True)
+# Accept에 따라 형식이 달라지므로 304를 포함한 모든 응답에 Vary: Accept
+@vary_on_headers('Accept')
+@condition(etag_func=game_state_etag)
 def game_state(request):
-    """게임 상태를 JSON으로 반환 (204 응답 후 상태 폴링용)"""
-    context = get_game_context(request)
-    if not context:
+    """게임 상태 전체를 JSON으로 반환 (새로고침/동기화용). 압축 형식은 칸당 한 글자"""
+    game = load_game(request)
+    if game is None:
         return JsonResponse({'error': 'no_game'}, status=400)
-    
-    return JsonResponse({
-        'board_data': context['board_data'],
-        'game_over': context['game_over'],
-        'won': context['won'],
-        'remaining_flags': context['remaining_flags'],
-        'start_time': context['start_time'],
-        'end_time': context['end_time'],
-        'elapsed_seconds': context['elapsed_seconds'],
-    })
 
-def reveal_logic(board, revealed, flagged, row, col, rows, cols):
-    if revealed[row][col] or flagged[row][col]:
-        return
-    revealed[row][col] = True
-    if board[row][col] == 0:
-        for dr in [-1, 0, 1]:
-            for dc in [-1, 0, 1]:
-                nr, nc = row + dr, col + dc
-                if 0 <= nr < rows and 0 <= nc < cols:
-                    reveal_logic(board, revealed, flagged, nr, nc, rows, cols)
+    if wants_compact(request):
+        return JsonResponse(compact_state(game))
+    return JsonResponse(verbose_state(game))
+
+@game_locked
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=game_etag)
+def tiles(request):
+    """
+    큰 보드용 타일 상태. ?tiles=3:17,4 처럼 화면에 보이는 타일 번호와 클라이언트가 가진
+    버전을 받아, 처음 받는 타일과 그 버전 이후 바뀐 타일만 칸 코드 문자열로 응답
+    """
+    game = load_game(request)
+    if game is None:
+        return JsonResponse({'error': 'no_game'}, status=400)
+    try:
+        wanted = parse_tiles(game, request.GET.get('tiles', ''))
+    except ValueError as e:
+        return JsonResponse({'error': 'invalid_tiles', 'detail': str(e)}, status=400)
+
+    payload = game_status(game)
+    payload.update({
+        'rows': game.rows,
+        'cols': game.cols,
+        'tile_size': TILE_SIZE,
+        'tiles': [
+            tile_payload(game, tile) for tile, seen in wanted
+            if game.tile_versions[tile] > seen
+        ],
+    })
+    return JsonResponse(payload)
 
+@game_locked
 def hint(request):
-    """힌트 기능: 공개되지 않은 안전한 칸 1개 자동 공개"""
-    from django.http import JsonResponse
-    
-    if request.session.get('game_over', False) or request.session.get('won', False):
+    """힌트 기능: 보이는 숫자로 안전이 증명되는 칸(없으면 임의의 안전한 칸) 1개 자동 공개"""
+    game = load_game(request)
+    if game is None or game.finished:
         return JsonResponse({'success': False}, status=400)
 
-    if request.session.get('start_time') is None:
-        request.session['start_time'] = time.time()
-        request.session['end_time'] = None
-
-    board = request.session.get('board')
-    revealed = request.session.get('revealed')
-    flagged = request.session.get('flagged')
-    rows = request.session.get('rows', 10)
-    cols = request.session.get('cols', 10)
-
-    if not board or not revealed:
+    result = game.hint()
+    if result is None:
         return JsonResponse({'success': False}, status=400)
 
-    safe_cells = []
-    for r in range(rows):
-        for c in range(cols):
-            if not revealed[r][c] and not flagged[r][c] and board[r][c] != -1:
-                safe_cells.append((r, c))
-
-    if not safe_cells:
-        return JsonResponse({'success': False}, status=400)
-
-    import random
-    hint_row, hint_col = random.choice(safe_cells)
-    reveal_logic(board, revealed, flagged, hint_row, hint_col, rows, cols)
-
-    request.session['board'] = board
-    request.session['revealed'] = revealed
-    request.session.modified = True
-
-    revealed_count = sum(r.count(True) for r in revealed)
-    won = False
-    if revealed_count == (rows * cols) - request.session['mines']:
-        request.session['won'] = True
-        won = True
-
-    if request.session.get('won') and not request.session.get('end_time'):
-        request.session['end_time'] = time.time()
-
-    mine_count = 0
-    for dr in [-1, 0, 1]:
-        for dc in [-1, 0, 1]:
-            if dr == 0 and dc == 0:
-                continue
-            nr, nc = hint_row + dr, hint_col + dc
-            if 0 <= nr < rows and 0 <= nc < cols and board[nr][nc] == -1:
-                mine_count += 1
+    index, changed, proven = result
+    save_game(request, game)
+
+    return game_delta_response(
+        game,
+        changed,
+        success=True,
+        row=index // game.cols,
+        col=index % game.cols,
+        value=game.value(index),
+        proven=proven,
+    )
+
+def leaderboard(request, difficulty):
+    """난이도별 가장 빠른 승리 기록 (?no_guess=1, ?daily=YYYY-MM-DD, ?limit=최대 100)"""
+    no_guess = request.GET.get('no_guess') == '1'
+    try:
+        limit = min(max(int(request.GET.get('limit', 20)), 1), 100)
+    except ValueError:
+        return JsonResponse({'error': 'invalid_limit'}, status=400)
+    seed = None
+    if request.GET.get('daily'):
+        # ?daily=YYYY-MM-DD: 그날 일일 도전 보드의 기록만
+        try:
+            seed = daily_seed(difficulty, date.fromisoformat(request.GET['daily']))
+        except ValueError:
+            return JsonResponse({'error': 'invalid_date'}, status=400)
+
+    me = request.session.get(PLAYER_SESSION_KEY)
+    try:
+        rows = top_results(difficulty, no_guess, limit, seed)
+    except DatabaseError:
+        return JsonResponse({'error': 'unavailable'}, status=503)
+    entries = []
+    for rank, row in enumerate(rows, 1):
+        entries.append({
+            'rank': rank,
+            'duration': row['duration'],
+            'finished_at': row['finished_at'],
+            'size': f"{row['rows']}x{row['cols']}/{row['mines']}",
+            'is_you': me is not None and row['player_id'] == me,
+        })
+    return JsonResponse({'difficulty': difficulty, 'no_guess': no_guess, 'entries': entries})
+
+def stats(request, difficulty):
+    """난이도별 누적 통계 + 내 최근 기록"""
+    no_guess = request.GET.get('no_guess') == '1'
+    me = request.session.get(PLAYER_SESSION_KEY)
+    try:
+        payload = stats_summary(difficulty, no_guess)
+        payload['recent'] = recent_results(me) if me else []
+    except DatabaseError:
+        return JsonResponse({'error': 'unavailable'}, status=503)
+    return JsonResponse(payload)
+
+def replay(request, game_id):
+    """
+    끝난 게임을 step번째 수까지 재생한 상태 (?step=N, 없으면 마지막 수까지).
+    현재 세션의 게임이나 기록된 게임만 볼 수 있고, 시드가 보드를 알려 주므로 진행 중인 게임은 거부
+    """
+    game_id = str(game_id)
+    game = load_game(request)
+    if game is None or game.game_id != game_id:
+        try:
+            game = result_game(game_id)
+        except DatabaseError:
+            game = None
+    if game is None:
+        return JsonResponse({'error': 'no_game'}, status=404)
+    if not game.finished:
+        return JsonResponse({'error': 'in_progress'}, status=403)
+    try:
+        step = int(request.GET.get('step', -1))
+    except ValueError:
+        return JsonResponse({'error': 'invalid_step'}, status=400)
+
+    replayed = get_replay(game)
+    step = len(replayed) if step < 0 else min(step, len(replayed))
+    position = replayed.at(step)
+    payload = {
+        'game_id': game_id,
+        'rows': game.rows,
+        'cols': game.cols,
+        'mines': game.mines,
+        'difficulty': game.difficulty,
+        'seed': game.seed,
+        'first_click': game.first_click,
+        'steps': len(replayed),
+        'step': step,
+        'move': None,
+        'cells': cell_codes(position).decode('ascii'),
+        'game_over': position.game_over,
+        'won': position.won,
+        'verified': replayed.matches(game.won, game.revealed_count),
+    }
+    if step:
+        kind, index = replayed.moves[step - 1]
+        row, col = divmod(index, game.cols)
+        payload['move'] = {'action': LOG_ACTIONS[kind], 'row': row, 'col': col}
+    return JsonResponse(payload)
+
+@require_POST
+def new_shared_game(request, difficulty=None):
+    """
+    여러 클라이언트가 game_id로 함께 두거나 지켜보는 공유 게임 (실시간 모드에서만).
+    플레이 키는 응답에만 담기므로 만든 쪽이 플레이어에게만 나눠 준다
+    """
+    if not settings.MINESWEEPER_REALTIME:
+        raise Http404
+    if difficulty in DIFFICULTY_SETTINGS:
+        preset = DIFFICULTY_SETTINGS[difficulty]
+        rows, cols, mines = preset['rows'], preset['cols'], preset['mines']
+    elif difficulty is None:
+        try:
+            rows = int(request.POST.get('rows', 10))
+            cols = int(request.POST.get('cols', 10))
+            mines = int(request.POST.get('mines', 10))
+        except ValueError:
+            return JsonResponse({'error': 'invalid_size'}, status=400)
+    else:
+        return JsonResponse({'error': 'unknown_difficulty'}, status=404)
 
+    try:
+        shared = create_shared_game(rows, cols, mines, difficulty or 'custom')
+    except ValueError as e:
+        return JsonResponse({'error': 'invalid_size', 'detail': str(e)}, status=400)
+    game_id = shared.game_id
     return JsonResponse({
-        'success': True,
-        'row': hint_row,
-        'col': hint_col,
-        'value': mine_count,
-        'won': won
-    })
\ No newline at end of file
+        'game_id': game_id,
+        'play_key': shared.play_key,
+        'play_url': f'/ws/shared/{game_id}/?key={shared.play_key}',
+        'watch_url': f'/ws/shared/{game_id}/',
+        'rows': rows,
+        'cols': cols,
+        'mines': mines,
+    }, status=201)
+
+def shared_game_etag(request, game_id):
+    shared = get_shared_games().get(str(game_id))
+    return None if shared is None else f'shared-{shared.game.version}'
+
+@cache_control(no_cache=True)
+@condition(etag_func=shared_game_etag)
+def shared_game_state(request, game_id):
+    """공유 게임의 전체 상태 (압축 형식). WebSocket 없이 관전할 때 ETag로 바뀐 때만 받는다"""
+    shared = get_shared_games().get(str(game_id))
+    if shared is None:
+        return JsonResponse({'error': 'no_game'}, status=404)
+    return HttpResponse(shared.snapshot(), content_type='application/json')
+
+def metrics(request):
+    """Prometheus 수집 엔드포인트 (MINESWEEPER_METRICS가 꺼져 있으면 404)"""
+    registry = get_registry()
+    if registry is None:
+        raise Http404
+    text = registry.render() + render_pool(get_pool(DIFFICULTY_SETTINGS).stats())
+    return HttpResponse(text, content_type='text/plain; version=0.0.4; charset=utf-8')